@@ -0,0 +1,282 @@
+"""
+Нагрузочный тест REST API: задержка p50/p95/p99 и пропускная способность
+по эндпоинтам goals/urls.py и core/urls.py.
+
+Данные готовит benchmarks/seed_data.py (те же --prefix и --password).
+Клиенты — --concurrency потоков, каждый входит своим пользователем
+(POST /core/login) и --duration секунд выполняет сценарии со случайным
+выбором по весам SCENARIOS. Идентификаторы досок, категорий, целей и
+комментариев для запросов к объектам заранее выбираются из БД.
+
+Без --url скрипт сам запускает manage.py runserver --noreload на свободном
+порту (как CMD в Dockerfile); с --url нагружается уже запущенный сервер
+(gunicorn, uvicorn) с той же БД.
+
+    python benchmarks/api_load.py --concurrency 16 --duration 30 --save baseline.json
+    python benchmarks/api_load.py --url http://127.0.0.1:8000 --compare baseline.json
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@dataclass
+class Ids:
+    """Объекты, доступные пользователю клиента"""
+    board: int
+    category: int
+    goal: int
+    comment: int
+
+
+Scenario = tuple[str, int, Callable[['Client'], requests.Response]]
+
+
+def goal_create(client: 'Client') -> requests.Response:
+    return client.post('/goals/goal/create', {'title': 'load test', 'category': client.ids.category})
+
+
+def comment_create(client: 'Client') -> requests.Response:
+    return client.post('/goals/goal_comment/create', {'text': 'load test', 'goal': client.ids.goal})
+
+
+# имя, вес, запрос; имена совпадают с name маршрутов
+SCENARIOS: list[Scenario] = [
+    ('board-list', 10, lambda client: client.get('/goals/board/list', limit=20)),
+    ('board', 5, lambda client: client.get(f'/goals/board/{client.ids.board}')),
+    ('category-list', 10, lambda client: client.get('/goals/goal_category/list', limit=20)),
+    ('goal-category', 5, lambda client: client.get(f'/goals/goal_category/{client.ids.category}')),
+    ('goal-list', 25, lambda client: client.get('/goals/goal/list', limit=20)),
+    ('goal-list search', 5, lambda client: client.get('/goals/goal/list', limit=20, search='goal')),
+    ('goal', 10, lambda client: client.get(f'/goals/goal/{client.ids.goal}')),
+    ('comment-list', 10, lambda client: client.get('/goals/goal_comment/list', limit=20, goal=client.ids.goal)),
+    ('comment', 5, lambda client: client.get(f'/goals/goal_comment/{client.ids.comment}')),
+    ('profile', 5, lambda client: client.get('/core/profile')),
+    ('create-goal', 5, goal_create),
+    ('comment-create', 5, comment_create),
+]
+
+
+class Client:
+    def __init__(self, base_url: str, username: str, password: str, ids: Ids) -> None:
+        self.base_url = base_url
+        self.session = requests.Session()
+        self.ids = ids
+        response = self.session.post(f'{base_url}/core/login', json={'username': username, 'password': password})
+        response.raise_for_status()
+        self.session.headers['X-CSRFToken'] = self.session.cookies['csrftoken']
+        self.session.headers['Referer'] = base_url
+
+    def get(self, path: str, **params) -> requests.Response:
+        return self.session.get(f'{self.base_url}{path}', params=params)
+
+    def post(self, path: str, data: dict) -> requests.Response:
+        return self.session.post(f'{self.base_url}{path}', json=data)
+
+
+def user_ids(prefix: str, count: int) -> list[tuple[str, Ids]]:
+    """Пользователи-владельцы досок с хотя бы одним комментарием и их объекты"""
+    from django.db.models import F
+
+    from goals.models import BoardParticipant, GoalComment
+
+    users = []
+    for comment in (
+        GoalComment.objects
+        .filter(
+            user__username__startswith=f'{prefix}_', goal__category__is_deleted=False,
+            goal__category__board__participants__user=F('user'),
+            goal__category__board__participants__role=BoardParticipant.Role.owner,
+        )
+        .select_related('user', 'goal__category')
+        .order_by('user_id', 'id')
+        .distinct('user_id')[:count]
+    ):
+        category = comment.goal.category
+        users.append((comment.user.username, Ids(category.board_id, category.id, comment.goal_id, comment.id)))
+    return users
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Значение по методу ближайшего ранга; values отсортированы"""
+    return values[max(round(len(values) * percent / 100 + 0.5) - 1, 0)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(command: list[str], port: int, env: dict[str, str] | None = None) -> subprocess.Popen:
+    """Запуск сервера приложения и ожидание, пока он начнёт отвечать на port"""
+    server = subprocess.Popen(
+        command, cwd=ROOT, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            requests.get(f'http://127.0.0.1:{port}/core/profile', timeout=1)
+            return server
+        except requests.ConnectionError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError(f'{" ".join(command)} did not start')
+
+
+def runserver_command(port: int) -> list[str]:
+    return [sys.executable, str(ROOT / 'manage.py'), 'runserver', '--noreload', f'127.0.0.1:{port}']
+
+
+def run(clients: list[Client], duration: float, warmup: float, seed: int) -> tuple[dict[str, list[float]], dict, float]:
+    """Латентности успешных ответов и ошибки по сценарию; длительность замера"""
+    names, weights, calls = zip(*((name, weight, call) for name, weight, call in SCENARIOS))
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    lock = threading.Lock()
+    started = time.perf_counter()
+    measure_from = started + warmup
+    deadline = measure_from + duration
+
+    def worker(client: Client, rng: random.Random) -> None:
+        own_latencies = defaultdict(list)
+        own_errors = defaultdict(int)
+        while (now := time.perf_counter()) < deadline:
+            index = rng.choices(range(len(names)), weights)[0]
+            try:
+                response = calls[index](client)
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - now
+            if now < measure_from:
+                continue
+            if ok:
+                own_latencies[names[index]].append(elapsed)
+            else:
+                own_errors[names[index]] += 1
+        with lock:
+            for name, values in own_latencies.items():
+                latencies[name].extend(values)
+            for name, count in own_errors.items():
+                errors[name] += count
+
+    threads = [
+        threading.Thread(target=worker, args=(client, random.Random(seed + number)))
+        for number, client in enumerate(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - measure_from
+
+
+def summarize(latencies: dict[str, list[float]], errors: dict[str, int], elapsed: float) -> dict[str, dict]:
+    results = {}
+    for name in [scenario[0] for scenario in SCENARIOS] + ['total']:
+        values = sorted(
+            sum(latencies.values(), []) if name == 'total' else latencies.get(name, [])
+        )
+        failed = sum(errors.values()) if name == 'total' else errors.get(name, 0)
+        if not values:
+            results[name] = {'requests': 0, 'errors': failed}
+            continue
+        results[name] = {
+            'requests': len(values),
+            'errors': failed,
+            'rps': len(values) / elapsed,
+            **{f'p{percent}_ms': percentile(values, percent) * 1000 for percent in (50, 95, 99)},
+        }
+    return results
+
+
+def report(results: dict[str, dict], baseline: dict[str, dict] | None) -> None:
+    columns = ('requests', 'errors', 'rps', 'p50_ms', 'p95_ms', 'p99_ms')
+    print(f'{"endpoint":<18}' + ''.join(f'{column:>11}' for column in columns))
+    for name, result in results.items():
+        print(f'{name:<18}' + ''.join(
+            f'{result[column]:>11.1f}' if isinstance(result.get(column), float) else f'{result.get(column, "-"):>11}'
+            for column in columns
+        ))
+        previous = (baseline or {}).get(name)
+        if previous and 'rps' in previous and 'rps' in result:
+            # отношение к базовому замеру: < 1 для задержек и > 1 для rps — улучшение
+            print(f'{"  vs baseline":<18}{"":>22}' + ''.join(
+                f'{result[column] / previous[column]:>10.2f}x' for column in columns[2:]
+            ))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='running server; by default manage.py runserver is started')
+    parser.add_argument('--prefix', default='load')
+    parser.add_argument('--password', default='load-test-password')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30, help='seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds excluded from results')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', type=Path, help='write results as a baseline JSON file')
+    parser.add_argument('--compare', type=Path, help='baseline JSON file to compare with')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    users = user_ids(args.prefix, args.concurrency)
+    if not users:
+        parser.error(f'no data with prefix {args.prefix!r}, run benchmarks/seed_data.py first')
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else None
+
+    if args.url:
+        server, url = None, args.url.rstrip('/')
+    else:
+        port = free_port()
+        server, url = start_server(runserver_command(port), port), f'http://127.0.0.1:{port}'
+    try:
+        # пользователей меньше, чем потоков, — потоки делят пользователей
+        clients = []
+        for number in range(args.concurrency):
+            username, ids = users[number % len(users)]
+            clients.append(Client(url, username, args.password, ids))
+        latencies, errors, elapsed = run(clients, args.duration, args.warmup, args.seed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    results = summarize(latencies, errors, elapsed)
+    print(f'{url if args.url else "manage.py runserver"}: {args.concurrency} clients, {elapsed:.1f}s')
+    report(results, baseline)
+    if args.save:
+        args.save.parent.mkdir(parents=True, exist_ok=True)
+        args.save.write_text(json.dumps({
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'url': args.url or 'runserver',
+            'concurrency': args.concurrency,
+            'duration': elapsed,
+            'results': results,
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Пропускная способность серверов приложения на одной нагрузке
+benchmarks/api_load.py: manage.py runserver (прежний CMD Dockerfile) против
+gunicorn с todolist/gunicorn_config.py в режимах sync, gthread, gevent и asgi.
+
+Режимы без установленных пакетов (gevent и psycogreen, uvicorn) пропускаются.
+Данные готовит benchmarks/seed_data.py; число воркеров и потоков — из
+переменных окружения GUNICORN_* (по умолчанию по числу CPU).
+
+    python benchmarks/app_servers.py --concurrency 32 --duration 30
+    python benchmarks/app_servers.py --servers runserver gthread --duration 10
+"""
+import argparse
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# режим: (команда по порту, переменные окружения, нужные пакеты)
+SERVERS = {
+    'runserver': (None, {}, ()),
+    'sync': ('gunicorn', {'GUNICORN_WORKER_CLASS': 'sync'}, ()),
+    'gthread': ('gunicorn', {'GUNICORN_WORKER_CLASS': 'gthread'}, ()),
+    'gevent': ('gunicorn', {'GUNICORN_WORKER_CLASS': 'gevent'}, ('gevent', 'psycogreen')),
+    'asgi': ('gunicorn', {'APP_SERVER': 'asgi'}, ('uvicorn',)),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servers', nargs='+', choices=SERVERS, default=list(SERVERS))
+    parser.add_argument('--prefix', default='load')
+    parser.add_argument('--password', default='load-test-password')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=30, help='seconds per server')
+    parser.add_argument('--warmup', type=float, default=3, help='seconds excluded from results')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    from benchmarks.api_load import Client, free_port, run, runserver_command, start_server, summarize, user_ids
+
+    users = user_ids(args.prefix, args.concurrency)
+    if not users:
+        parser.error(f'no data with prefix {args.prefix!r}, run benchmarks/seed_data.py first')
+
+    print(f'{os.cpu_count()} CPU, {args.concurrency} clients, {args.duration:.0f}s per server')
+    print(f'{"server":<12}{"requests":>10}{"errors":>8}{"rps":>9}{"p50_ms":>9}{"p95_ms":>9}{"p99_ms":>9}')
+    for name in args.servers:
+        command, env, packages = SERVERS[name]
+        missing = [package for package in packages if importlib.util.find_spec(package) is None]
+        if missing:
+            print(f'{name:<12}skipped: {", ".join(missing)} not installed')
+            continue
+        port = free_port()
+        if command is None:
+            command = runserver_command(port)
+        else:
+            command = [sys.executable, '-m', 'gunicorn', '--config', 'python:todolist.gunicorn_config']
+            env = {**env, 'GUNICORN_BIND': f'127.0.0.1:{port}'}
+        server = start_server(command, port, env)
+        try:
+            clients = []
+            for number in range(args.concurrency):
+                username, ids = users[number % len(users)]
+                clients.append(Client(f'http://127.0.0.1:{port}', username, args.password, ids))
+            total = summarize(*run(clients, args.duration, args.warmup, args.seed))['total']
+        finally:
+            server.terminate()
+            server.wait()
+        print(f'{name:<12}{total["requests"]:>10}{total["errors"]:>8}' + ''.join(
+            f'{total[column]:>9.1f}' if column in total else f'{"-":>9}'
+            for column in ('rps', 'p50_ms', 'p95_ms', 'p99_ms')
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Пропускная способность бота: синхронный цикл runbot (с прямой отправкой
+и через очередь отправки TgClient) против runbot --async.
+
+Поднимает локальный фейковый Telegram API (getUpdates отдаёт заранее
+сгенерированные обновления, sendMessage отвечает с задержкой --latency)
+и прогоняет через все режимы обработчик, отвечающий одним сообщением
+на каждое обновление. ORM в замер не входит.
+
+    python benchmarks/bot_throughput.py --updates 400 --chats 40 --latency 0.05 --workers 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeTelegramServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, updates: list[dict], latency: float) -> None:
+        super().__init__(('127.0.0.1', 0), FakeTelegramHandler)
+        self.updates = updates
+        self.latency = latency
+        self.sent = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_port}'
+
+
+class FakeTelegramHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Заголовки и тело пишутся отдельно: без TCP_NODELAY keep-alive клиент ждёт delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        method = url.path.rsplit('/', 1)[-1]
+
+        if method == 'getUpdates':
+            offset = int(params.get('offset', 0))
+            result = [update for update in self.server.updates if update['update_id'] >= offset][:100]
+        else:
+            time.sleep(self.server.latency)
+            with self.server.lock:
+                self.server.sent += 1
+            result = {'chat': {'id': int(params['chat_id'])}, 'text': params['text']}
+
+        body = json.dumps({'ok': True, 'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run_sync(total: int) -> float:
+    from bot.tg.client import TgClient
+
+    client = TgClient()
+    started = time.perf_counter()
+    offset = received = 0
+    while received < total:
+        for update in client.get_updates(offset=offset, timeout=0).result:
+            offset = update.update_id + 1
+            received += 1
+            client.send_message(update.message.chat.id, 'ok')
+    return time.perf_counter() - started
+
+
+def run_queued(total: int) -> float:
+    from bot.tg.client import TgClient
+
+    client = TgClient()
+    started = time.perf_counter()
+    offset = received = 0
+    while received < total:
+        for update in client.get_updates(offset=offset, timeout=0).result:
+            offset = update.update_id + 1
+            received += 1
+            client.send_queue.send_message(update.message.chat.id, 'ok')
+    client.close()
+    return time.perf_counter() - started
+
+
+def run_async(total: int, workers: int) -> float:
+    from bot.tg.client import AsyncTgClient
+    from bot.tg.dispatcher import AsyncDispatcher, BlockingTgClient
+
+    async def main() -> float:
+        client = AsyncTgClient(max_connections=workers + 1)
+        blocking = BlockingTgClient(client, asyncio.get_running_loop())
+        dispatcher = AsyncDispatcher(
+            client, lambda message: blocking.send_message(message.chat.id, 'ok'), workers=workers
+        )
+        started = time.perf_counter()
+        await dispatcher.run(max_updates=total, poll_timeout=0)
+        elapsed = time.perf_counter() - started
+        await client.close()
+        return elapsed
+
+    return asyncio.run(main())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=400)
+    parser.add_argument('--chats', type=int, default=40)
+    parser.add_argument('--latency', type=float, default=0.05, help='задержка sendMessage, секунды')
+    parser.add_argument('--workers', type=int, default=16)
+    args = parser.parse_args()
+
+    updates = [
+        {'update_id': number, 'message': {'chat': {'id': number % args.chats}, 'text': str(number)}}
+        for number in range(args.updates)
+    ]
+    server = FakeTelegramServer(updates, args.latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    os.environ['TG_API_URL'] = server.url
+    import django
+    django.setup()
+
+    print(f'{args.updates} updates, {args.chats} chats, sendMessage latency {args.latency * 1000:.0f} ms')
+    # send queue и сервер считают отправленные сообщения: склеенные ответы приходят одним запросом
+    for name, runner in (
+        ('sync runbot', lambda: run_sync(args.updates)),
+        ('sync runbot + send queue', lambda: run_queued(args.updates)),
+        (f'runbot --async ({args.workers} workers)', lambda: run_async(args.updates, args.workers)),
+    ):
+        sent = server.sent
+        elapsed = runner()
+        print(
+            f'{name:<32} {elapsed:7.2f} s  {args.updates / elapsed:8.1f} updates/s  '
+            f'{server.sent - sent:5d} sendMessage'
+        )
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Рендеринг и разбор JSON ответа списка из 1000 целей: JSONRenderer/JSONParser
+против FastJSONRenderer/FastJSONParser (core.renderers, orjson).
+
+Данные страницы строятся как в benchmarks/list_serialization.py и проходят
+через ValuesReader, БД в замер не входит. Перед замером проверяется, что
+оба рендерера выдают одинаковые байты.
+
+    python benchmarks/json_rendering.py --rows 1000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import timeit
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from benchmarks.list_serialization import make_goals, to_row
+    from core.renderers import FastJSONRenderer, orjson
+    from core.parsers import FastJSONParser
+    from goals.readers import get_reader
+    from goals.serializers import GoalSerializer
+
+    if orjson is None:
+        print('orjson не установлен: FastJSONRenderer работает через json')
+
+    reader = get_reader(GoalSerializer)
+    lookups = list(dict.fromkeys(reader.lookups))
+    data = {
+        'count': args.rows,
+        'next': None,
+        'previous': None,
+        'results': reader.represent(to_row(goal, lookups) for goal in make_goals(args.rows)),
+    }
+    body = JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data) == body
+
+    print(f'{args.rows} goals, {len(body) / 1024:.0f} KiB, {args.repeat} repeats')
+    for name, run in (
+        ('render JSONRenderer', lambda: JSONRenderer().render(data)),
+        ('render FastJSONRenderer', lambda: FastJSONRenderer().render(data)),
+        ('parse JSONParser', lambda: JSONParser().parse(BytesIO(body))),
+        ('parse FastJSONParser', lambda: FastJSONParser().parse(BytesIO(body))),
+    ):
+        elapsed = min(timeit.repeat(run, number=args.repeat, repeat=3)) / args.repeat
+        print(f'{name:<26} {elapsed * 1000:8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
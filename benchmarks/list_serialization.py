@@ -0,0 +1,96 @@
+"""
+Сериализация страницы списка: ModelSerializer против ValuesReader (goals.readers).
+
+Строки строятся в памяти, БД в замер не входит: сравнивается только время
+получения данных ответа из моделей (GoalSerializer(many=True).data) и из
+словарей values() (ValuesReader.represent). Перед замером проверяется, что
+JSON обоих путей совпадает побайтно.
+
+    python benchmarks/list_serialization.py --rows 100 --repeat 200
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def make_goals(count: int) -> list:
+    from django.utils import timezone
+
+    from core.models import User
+    from goals.models import Goal
+
+    user = User(id=1, username='bench', first_name='Имя', last_name='Фамилия', email='bench@example.com')
+    now = timezone.now()
+    goals = []
+    for number in range(count):
+        goal = Goal(
+            id=number + 1,
+            title=f'goal {number}',
+            description='описание цели' if number % 2 else None,
+            category_id=number % 10 + 1,
+            due_date=date(2030, 1, 1) + timedelta(days=number) if number % 3 else None,
+            status=number % 3 + 1,
+            priority=number % 4 + 1,
+            created=now - timedelta(minutes=number),
+            updated=now,
+        )
+        goal.user = user
+        goals.append(goal)
+    return goals
+
+
+def to_row(instance, lookups: list[str]) -> dict:
+    """Словарь, который вернул бы queryset.values(*lookups)"""
+    row = {}
+    for lookup in lookups:
+        *path, name = lookup.split('__')
+        value = instance
+        for related in path:
+            value = getattr(value, related)
+        # для связи values() отдаёт id (attname user_id), для остальных полей attname == name
+        row[lookup] = getattr(value, value._meta.get_field(name).attname)
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from goals.readers import get_reader
+    from goals.serializers import GoalSerializer
+
+    goals = make_goals(args.rows)
+    reader = get_reader(GoalSerializer)
+    rows = [to_row(goal, list(dict.fromkeys(reader.lookups))) for goal in goals]
+
+    renderer = JSONRenderer()
+    assert renderer.render(GoalSerializer(goals, many=True).data) == renderer.render(reader.represent(rows))
+
+    print(f'{args.rows} goals, {args.repeat} repeats')
+    results = {}
+    for name, run in (
+        ('GoalSerializer(many=True).data', lambda: GoalSerializer(goals, many=True).data),
+        ('ValuesReader.represent', lambda: reader.represent(rows)),
+    ):
+        elapsed = min(timeit.repeat(run, number=args.repeat, repeat=3)) / args.repeat
+        results[name] = elapsed
+        print(f'{name:<32} {elapsed * 1000:8.3f} ms/page  {args.rows / elapsed:12.0f} rows/s')
+    serializer, values = results.values()
+    print(f'speedup: {serializer / values:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
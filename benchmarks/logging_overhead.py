@@ -0,0 +1,78 @@
+"""
+Накладные расходы логирования на запрос: request_logging.LoggingMiddleware
+против RequestLoggingMiddleware (core.middleware).
+
+Представление подменено готовым JSON-ответом страницы из --rows целей, БД и
+DRF в замер не входят. Оба лога пишут в os.devnull: старый — синхронно в
+потоке запроса (как при включённом DEBUG-уровне django.request), новый —
+через QueuedHandler. Новый замеряется при ставке выборки 0 (обычный успешный
+запрос), 0.01 (значение по умолчанию) и 1 (логируется каждый запрос).
+
+    python benchmarks/logging_overhead.py --rows 100 --repeat 2000
+"""
+import argparse
+import logging
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+    from rest_framework.renderers import JSONRenderer
+
+    from benchmarks.list_serialization import make_goals
+    from core.log_handlers import QueuedHandler
+    from core.middleware import RequestLoggingMiddleware
+    from goals.serializers import GoalSerializer
+
+    content = JSONRenderer().render(GoalSerializer(make_goals(args.rows), many=True).data)
+    request = RequestFactory().get('/goals/goal/list', {'limit': args.rows})
+
+    def view(request):
+        return HttpResponse(content, content_type='application/json')
+
+    devnull = open(os.devnull, 'w')
+    sync_handler = logging.StreamHandler(devnull)
+    queued_handler = QueuedHandler(stream=devnull)
+    for name, handler in (('django.request', sync_handler), ('core.middleware', queued_handler)):
+        logger = logging.getLogger(name)
+        logger.handlers = [handler]
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+
+    middlewares = {'no logging middleware': view}
+    try:
+        from request_logging.middleware import LoggingMiddleware
+    except ImportError as error:
+        print(f'skipping LoggingMiddleware: {error}')
+    else:
+        middlewares['request_logging.LoggingMiddleware'] = LoggingMiddleware(view)
+    for rate in (0, 0.01, 1):
+        with override_settings(REQUEST_LOG_SAMPLE_RATE=rate, REQUEST_LOG_ROUTE_RATES={}):
+            middlewares[f'RequestLoggingMiddleware rate={rate}'] = RequestLoggingMiddleware(view)
+
+    print(f'response {len(content)} bytes ({args.rows} goals), {args.repeat} requests')
+    baseline = None
+    for name, middleware in middlewares.items():
+        elapsed = min(timeit.repeat(lambda: middleware(request), number=args.repeat, repeat=3)) / args.repeat
+        baseline = elapsed if baseline is None else baseline
+        print(f'{name:<40} {elapsed * 1e6:9.1f} us/request  overhead {(elapsed - baseline) * 1e6:9.1f} us')
+    queued_handler.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Наполнение БД данными для нагрузочного теста (benchmarks/api_load.py).
+
+Объекты строятся фабриками tests.factories (build, без сохранения) и пишутся
+bulk_create пачками по --batch-size: 10^6 целей не держатся в памяти целиком.
+У всех пользователей префикс --prefix и пароль --password; --reset сначала
+удаляет данные с этим префиксом. Генератор случайных чисел детерминирован (--seed).
+
+    python benchmarks/seed_data.py --users 1000 --boards 2000 --participants 50 \\
+        --categories 5 --goals 1000000 --comments 2000000
+
+Распределение: у каждой доски владелец (по кругу среди пользователей) и до
+--participants читателей/редакторов; --categories категорий на доску; цели
+равномерно по категориям, автор — владелец доски; комментарии — случайным
+целям текущей пачки. Построение фабрикой стоит ~0.1 мс на объект:
+10^6 целей и 2·10^6 комментариев — порядка 5–10 минут.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+def batched(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def reset(prefix: str) -> None:
+    from core.models import User
+    from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+    users = User.objects.filter(username__startswith=f'{prefix}_')
+    boards = Board.objects.filter(title__startswith=f'{prefix} ')
+    # DELETE одним запросом на таблицу: QuerySet.delete() загрузил бы каждую строку
+    # ради каскада и сигналов post_delete (сброс кэша ответов запущенного сервера не нужен)
+    for queryset in (
+        GoalComment.objects.filter(goal__category__board__in=boards),
+        Goal.objects.filter(category__board__in=boards),
+        GoalCategory.objects.filter(board__in=boards),
+        BoardParticipant.objects.filter(board__in=boards),
+        boards,
+    ):
+        queryset._raw_delete(queryset.db)
+    # пользователей немного, а на них ссылаются и таблицы других приложений: обычный каскад
+    users.delete()
+
+
+def seed(
+    prefix: str, password: str, users: int, boards: int, participants: int,
+    categories: int, goals: int, comments: int, batch_size: int, rng: random.Random,
+) -> dict[str, int]:
+    import factory
+    from django.contrib.auth.hashers import make_password
+    from faker import Faker
+
+    from core.models import User
+    from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+    from tests.factories import (
+        BoardFactory, BoardParticipantFactory, GoalCategoryFactory, GoalCommentFactory, GoalFactory, UserFactory,
+    )
+
+    counts = dict.fromkeys(('users', 'boards', 'participants', 'categories', 'goals', 'comments'), 0)
+
+    def create(model, objects: Iterable, name: str) -> list:
+        created = []
+        for batch in batched(objects, batch_size):
+            created.extend(model.objects.bulk_create(batch, batch_size=batch_size))
+            counts[name] += len(batch)
+        return created
+
+    # хэш пароля один на всех (без хэширования в UserFactory): иначе на 10^3 пользователей уйдут минуты
+    password_hash = factory.Transformer.Force(make_password(password))
+    # Faker на каждый объект удваивает время построения: тексты берутся из готового набора
+    faker = Faker('ru_RU')
+    faker.seed_instance(rng.random())
+    texts = [faker.sentence() for _ in range(1000)]
+
+    user_objects = create(User, (
+        UserFactory.build(username=f'{prefix}_{number}', password=password_hash) for number in range(users)
+    ), 'users')
+    board_objects = create(Board, (
+        BoardFactory.build(title=f'{prefix} {number}') for number in range(boards)
+    ), 'boards')
+
+    owners = [user_objects[number % users] for number in range(boards)]
+    roles = (BoardParticipant.Role.writer, BoardParticipant.Role.reader)
+
+    def board_participants() -> Iterator:
+        for board, owner in zip(board_objects, owners):
+            yield BoardParticipantFactory.build(board=board, user=owner)
+            others = rng.sample(user_objects, min(participants + 1, users))
+            for user in [user for user in others if user is not owner][:participants]:
+                yield BoardParticipantFactory.build(board=board, user=user, role=rng.choice(roles))
+
+    create(BoardParticipant, board_participants(), 'participants')
+    category_objects = create(GoalCategory, (
+        GoalCategoryFactory.build(board=board, user=owner)
+        for board, owner in zip(board_objects, owners) for _ in range(categories)
+    ), 'categories')
+
+    goal_objects = (
+        GoalFactory.build(category=category_objects[number % len(category_objects)], description=rng.choice(texts))
+        for number in range(goals)
+    )
+    for batch in batched(goal_objects, batch_size):
+        batch = Goal.objects.bulk_create(batch)
+        counts['goals'] += len(batch)
+        # комментарии пропорционально созданным целям
+        target = comments * counts['goals'] // goals
+        create(GoalComment, (
+            GoalCommentFactory.build(goal=rng.choice(batch), text=rng.choice(texts))
+            for _ in range(target - counts['comments'])
+        ), 'comments')
+        print(f'goals: {counts["goals"]}/{goals}, comments: {counts["comments"]}/{comments}', flush=True)
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--prefix', default='load')
+    parser.add_argument('--password', default='load-test-password')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--boards', type=int, default=2000)
+    parser.add_argument('--participants', type=int, default=50, help='participants per board besides the owner')
+    parser.add_argument('--categories', type=int, default=5, help='categories per board')
+    parser.add_argument('--goals', type=int, default=100_000)
+    parser.add_argument('--comments', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reset', action='store_true', help='delete data with this prefix first')
+    args = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'todolist.settings')
+    import django
+    django.setup()
+
+    from core.models import User
+
+    if args.reset:
+        reset(args.prefix)
+    elif User.objects.filter(username__startswith=f'{args.prefix}_').exists():
+        parser.error(f'data with prefix {args.prefix!r} already exists, use --reset')
+
+    started = time.perf_counter()
+    counts = seed(
+        args.prefix, args.password, args.users, args.boards, args.participants,
+        args.categories, args.goals, args.comments, args.batch_size, random.Random(args.seed),
+    )
+    print(', '.join(f'{name}: {count}' for name, count in counts.items()))
+    print(f'seeded in {time.perf_counter() - started:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,23 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
 from typing import Any
+from django.conf import settings
 from django.core.management import BaseCommand
+from django.db import close_old_connections
 from django.db.models import QuerySet
-from bot.models import TgUser
-from bot.tg.client import TgClient
-from bot.tg.dc import Message, GetUpdatesResponse, SendMessageResponse
+from bot.models import TgUpdate, TgUser
+from bot.states import BaseStateStore, get_state_store
+from bot.tg.client import AsyncTgClient, TgClient
+from bot.tg.dc import Message, GetUpdatesResponse, UpdateObj
+from bot.tg.dispatcher import AsyncDispatcher, BlockingTgClient
+from bot.webhook import UpdateQueue
 from goals.models import Goal, GoalCategory
 
+logger = logging.getLogger(__name__)
+
 
 class Command(BaseCommand):
     """ Команды телеграмм-бота"""
@@ -13,15 +25,100 @@ class Command(BaseCommand):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.tg_client: TgClient = TgClient()
-        self.states: dict = {}
+        self.state_store: BaseStateStore = get_state_store()
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--async', action='store_true', dest='use_async',
+            help='Асинхронный режим: параллельная обработка чатов',
+        )
+        parser.add_argument(
+            '--webhook', action='store_true',
+            help='Обработка обновлений, принятых вебхуком /bot/webhook, вместо long polling',
+        )
+        parser.add_argument(
+            '--set-webhook', metavar='URL',
+            help='Зарегистрировать вебхук с секретом TG_WEBHOOK_SECRET и выйти',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=8, help='Число обработчиков в асинхронном режиме и режиме вебхука'
+        )
+        parser.add_argument('--queue-size', type=int, default=100, help='Размер очереди каждого обработчика')
 
     def handle(self, *args: Any, **options: Any) -> None:
+        self.state_store.purge()
+        if options['set_webhook']:
+            self.stdout.write(str(self.tg_client.set_webhook(options['set_webhook'], settings.TG_WEBHOOK_SECRET)))
+            return
+        if options['webhook']:
+            self.handle_webhook(workers=options['workers'])
+            return
+        if options['use_async']:
+            asyncio.run(self.handle_async(workers=options['workers'], queue_size=options['queue_size']))
+            return
+
+        # Ответы уходят через очередь отправки, опрос обновлений их не ждёт
+        client: TgClient = self.tg_client
+        self.tg_client = client.send_queue
         offset: int = 0
-        while True:
-            res: GetUpdatesResponse = self.tg_client.get_updates(offset=offset)
-            for item in res.result:
-                offset = item.update_id + 1
-                self.handle_message(item.message)
+        try:
+            while True:
+                res: GetUpdatesResponse = client.get_updates(offset=offset)
+                for item in res.result:
+                    offset = item.update_id + 1
+                    self.handle_message(item.message)
+        finally:
+            client.close()
+
+    async def handle_async(self, workers: int, queue_size: int) -> None:
+        """
+        Приём обновлений в цикле событий, обработка сообщений в пуле потоков
+        """
+        client = AsyncTgClient(max_connections=workers + 1)
+        self.tg_client = BlockingTgClient(client, asyncio.get_running_loop())
+        dispatcher = AsyncDispatcher(client, self.handle_message, workers=workers, queue_size=queue_size)
+        try:
+            await dispatcher.run()
+        finally:
+            await client.close()
+
+    def handle_webhook(self, workers: int, poll_interval: float = 1) -> None:
+        """
+        Обработка очереди обновлений вебхука; процессов runbot --webhook может быть несколько
+        """
+        client: TgClient = self.tg_client
+        self.tg_client = client.send_queue
+        queue = UpdateQueue()
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='runbot') as executor:
+                while True:
+                    if not self.process_updates(queue, executor, batch_size=workers * 10):
+                        time.sleep(poll_interval)
+        finally:
+            client.close()
+
+    def process_updates(self, queue: UpdateQueue, executor: ThreadPoolExecutor, batch_size: int) -> int:
+        """
+        Обработка пачки обновлений: чаты параллельно, сообщения чата по порядку
+        """
+        updates = queue.claim(limit=batch_size)
+        chats = groupby(sorted(updates, key=lambda update: (update.chat_id, update.update_id)), lambda u: u.chat_id)
+        futures = [executor.submit(self._process_chat_updates, queue, list(items)) for _, items in chats]
+        for future in futures:
+            future.result()
+        return len(updates)
+
+    def _process_chat_updates(self, queue: UpdateQueue, updates: list[TgUpdate]) -> None:
+        try:
+            for update in updates:
+                try:
+                    self.handle_message(UpdateObj(**update.payload).message)
+                except Exception:
+                    logger.exception('Ошибка обработки сообщения из чата %s', update.chat_id)
+                queue.ack(update)
+        finally:
+            # Как после HTTP-запроса: соединение потока живёт не дольше CONN_MAX_AGE
+            close_old_connections()
 
     def handle_message(self, message: Message) -> None:
         """
@@ -39,51 +136,54 @@ class Command(BaseCommand):
         Возвращение ответов пользователя
         """
         commands: list[str] = ['/goals', '/create', '/cancel']
+        states: dict = self.state_store.get(message.chat.id)
 
-        if not self.states.get('state') and message.text not in commands:
+        if not states.get('state') and message.text not in commands:
             self.tg_client.send_message(
                 chat_id=message.chat.id, text=f'Unknown command!'
             )
 
         if message.text == '/cancel':
-            self.states = {}
+            states = {}
             self.tg_client.send_message(
                 chat_id=message.chat.id, text='Operation was canceled'
             )
 
-        if not self.states and message.text in commands:
+        if not states and message.text in commands:
             if message.text == '/goals':
                 self._get_goals(message, tg_user)
 
             if message.text == '/create':
-                self.states['state'] = 'creating'
-                self._get_categories(message=message, tg_user=tg_user)
+                states['state'] = 'creating'
+                self._get_categories(message=message, tg_user=tg_user, states=states)
 
         if (
-            self.states.get('state') == 'getting goal title'
+            states.get('state') == 'getting goal title'
             and message.text not in commands
         ):
-            self.states['goal_title'] = message.text
+            states['goal_title'] = message.text
             self._create_goal(
                 chat_id=message.chat.id,
-                title=self.states.get('goal_title'),
+                title=states.get('goal_title'),
                 user_id=tg_user.user.id,
-                category_id=self.states.get('user_category_id'),
+                category_id=states.get('user_category_id'),
             )
-            self.states = {}
+            states = {}
 
-        if self.states.get('state') == 'creating' and message.text not in commands:
-            if message.text in self.states['categories_id']:
+        if states.get('state') == 'creating' and message.text not in commands:
+            if message.text in states['categories_id']:
                 self.tg_client.send_message(
                     chat_id=message.chat.id, text='Input goal title'
                 )
-                self.states['user_category_id'] = int(message.text)
-                self.states['state'] = 'getting goal title'
+                states['user_category_id'] = int(message.text)
+                states['state'] = 'getting goal title'
             else:
                 self.tg_client.send_message(
                     chat_id=message.chat.id, text='Wrong category!'
                 )
 
+        self.state_store.set(message.chat.id, states)
+
     def handler_unauthorized_user(self, tg_user: TgUser, message: Message) -> None:
         """
         Верификация пользователя
@@ -97,7 +197,7 @@ class Command(BaseCommand):
             text=f'Твой верификационный код {tg_user.verification_code}',
         )
 
-    def _get_goals(self, message: Message, tg_user: TgUser) -> SendMessageResponse:
+    def _get_goals(self, message: Message, tg_user: TgUser) -> None:
         """
         Возвращает пользователю информацию о целях
         """
@@ -111,9 +211,9 @@ class Command(BaseCommand):
             text = 'No goals'
         else:
             text = '\n'.join(goals)
-        return self.tg_client.send_message(chat_id=message.chat.id, text=text)
+        self.tg_client.send_message(chat_id=message.chat.id, text=text)
 
-    def _get_categories(self, message: Message, tg_user: TgUser) -> SendMessageResponse:
+    def _get_categories(self, message: Message, tg_user: TgUser, states: dict) -> None:
         """
         Возвращает пользователю информацию о категориях
         """
@@ -123,21 +223,21 @@ class Command(BaseCommand):
         categories: list[str] = [
             f'{category.id} {category.title}' for category in query_set
         ]
-        self.states['categories_id'] = [str(cat.id) for cat in query_set]
+        states['categories_id'] = [str(cat.id) for cat in query_set]
         if not categories:
             text: str = 'No categories'
         else:
             text = '\n'.join(categories)
-        return self.tg_client.send_message(chat_id=message.chat.id, text=text)
+        self.tg_client.send_message(chat_id=message.chat.id, text=text)
 
     def _create_goal(
             self, chat_id: int, title: str | None, user_id: int, category_id: int | None
-    ) -> SendMessageResponse:
+    ) -> None:
         """
         Создание цели
         """
         Goal.objects.create(user_id=user_id, title=title, category_id=category_id)
-        return self.tg_client.send_message(
+        self.tg_client.send_message(
             chat_id=chat_id, text=f'Goal {title} created!'
         )
 
@@ -0,0 +1,22 @@
+# Generated by Django 4.0.1 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgChatState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.BigIntegerField(unique=True)),
+                ('state', models.JSONField(default=dict)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.0.1 on 2026-10-18 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bot', '0002_tgchatstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TgUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('update_id', models.BigIntegerField(unique=True)),
+                ('chat_id', models.BigIntegerField()),
+                ('payload', models.JSONField()),
+                ('locked_until', models.DateTimeField(blank=True, default=None, null=True)),
+            ],
+        ),
+    ]
@@ -15,3 +15,18 @@ class TgUser(models.Model):
         Генерация верификационного кода
         """
         return get_random_string(length=50)
+
+
+class TgChatState(models.Model):
+    """Состояние диалога с ботом (DatabaseStateStore)"""
+    chat_id = models.BigIntegerField(unique=True)
+    state = models.JSONField(default=dict)
+    updated = models.DateTimeField(auto_now=True)
+
+
+class TgUpdate(models.Model):
+    """Обновление, принятое вебхуком и ожидающее обработки"""
+    update_id = models.BigIntegerField(unique=True)
+    chat_id = models.BigIntegerField()
+    payload = models.JSONField()
+    locked_until = models.DateTimeField(null=True, blank=True, default=None)
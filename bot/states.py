@@ -0,0 +1,119 @@
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from bot.models import TgChatState
+
+
+class BaseStateStore:
+    """
+    Хранилище состояния диалога с ботом по chat_id.
+
+    get всегда возвращает новый словарь: изменения попадают в хранилище
+    только через set, поэтому обработчики разных чатов не мешают друг другу.
+    """
+
+    def __init__(self, ttl: int) -> None:
+        self.ttl = ttl
+
+    def get(self, chat_id: int) -> dict:
+        raise NotImplementedError
+
+    def set(self, chat_id: int, state: dict) -> None:
+        raise NotImplementedError
+
+    def clear(self, chat_id: int) -> None:
+        raise NotImplementedError
+
+    def purge(self) -> int:
+        """Удаление брошенных диалогов"""
+        return 0
+
+
+class MemoryStateStore(BaseStateStore):
+    """
+    Состояния в памяти процесса; неактивные дольше ttl секунд удаляются
+    """
+
+    def __init__(self, ttl: int) -> None:
+        super().__init__(ttl)
+        self._states: dict[int, tuple[float, dict]] = {}
+        self._lock = threading.Lock()
+        self._next_purge = time.monotonic() + ttl
+
+    def get(self, chat_id: int) -> dict:
+        with self._lock:
+            expires, state = self._states.get(chat_id, (0, {}))
+            if expires < time.monotonic():
+                self._states.pop(chat_id, None)
+                return {}
+            return dict(state)
+
+    def set(self, chat_id: int, state: dict) -> None:
+        if not state:
+            self.clear(chat_id)
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._states[chat_id] = (now + self.ttl, dict(state))
+            if now >= self._next_purge:
+                self._purge(now)
+
+    def clear(self, chat_id: int) -> None:
+        with self._lock:
+            self._states.pop(chat_id, None)
+
+    def _purge(self, now: float) -> None:
+        # Брошенные диалоги удаляются не чаще раза в ttl, чтобы set оставался O(1)
+        self._states = {chat_id: item for chat_id, item in self._states.items() if item[0] >= now}
+        self._next_purge = now + self.ttl
+
+
+class DatabaseStateStore(BaseStateStore):
+    """
+    Состояния в таблице TgChatState: переживают перезапуск бота
+    и доступны нескольким процессам runbot
+    """
+
+    def _expired(self):
+        return timezone.now() - timedelta(seconds=self.ttl)
+
+    def get(self, chat_id: int) -> dict:
+        state = (
+            TgChatState.objects.filter(chat_id=chat_id, updated__gte=self._expired())
+            .values_list('state', flat=True)
+            .first()
+        )
+        return state or {}
+
+    def set(self, chat_id: int, state: dict) -> None:
+        if not state:
+            self.clear(chat_id)
+            return
+        TgChatState.objects.update_or_create(chat_id=chat_id, defaults={'state': state})
+
+    def clear(self, chat_id: int) -> None:
+        TgChatState.objects.filter(chat_id=chat_id).delete()
+
+    def purge(self) -> int:
+        deleted, _ = TgChatState.objects.filter(updated__lt=self._expired()).delete()
+        return deleted
+
+
+STATE_STORES = {
+    'memory': MemoryStateStore,
+    'database': DatabaseStateStore,
+}
+
+
+def get_state_store() -> BaseStateStore:
+    """
+    Хранилище из настройки BOT_STATE_STORE: memory, database или путь к классу
+    """
+    name = settings.BOT_STATE_STORE
+    store_class = STATE_STORES.get(name) or import_string(name)
+    return store_class(ttl=settings.BOT_STATE_TTL)
@@ -0,0 +1,11 @@
+from bot.tg.client import get_tg_client
+from bot.tg.sender import RetryAfter
+from jobs.queue import Retry, task
+
+
+@task('bot.send_message')
+def send_message(chat_id: int, text: str) -> None:
+    try:
+        get_tg_client().send_message(chat_id=chat_id, text=text)
+    except RetryAfter as error:
+        raise Retry(delay=error.retry_after)
@@ -1,36 +1,119 @@
+from functools import cached_property, lru_cache
+
+import httpx
+import requests
 from django.conf import settings
-from pydantic import ValidationError
+from requests import Response
+from requests.adapters import HTTPAdapter
 
 from bot.tg.dc import GetUpdatesResponse, SendMessageResponse
-from requests import Response
-import requests
+from bot.tg.sender import RetryAfter, SendQueue
 
 
 class TgClient:
     """Класс работы с телеграмм-ботом"""
 
-    def __init__(self, token: str = settings.BOT_TOKEN) -> None:
+    def __init__(
+        self,
+        token: str = settings.BOT_TOKEN,
+        pool_size: int = settings.TG_POOL_SIZE,
+        connect_timeout: float = settings.TG_CONNECT_TIMEOUT,
+        read_timeout: float = settings.TG_READ_TIMEOUT,
+    ) -> None:
         self.token = token
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Keep-alive соединения с api.telegram.org переиспользуются между запросами
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
 
     def get_url(self, method: str) -> str:
         """Получаем urls в зависимости от метода"""
-        return f"https://api.telegram.org/bot{self.token}/{method}"
+        return f"{settings.TG_API_URL}/bot{self.token}/{method}"
 
     def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
         """Запрос обновления телеграмм-бота"""
-        response: Response = requests.get(
-            self.get_url('getUpdates'), params={'offset': offset, 'timeout': timeout}
+        response: Response = self.session.get(
+            self.get_url('getUpdates'),
+            params={'offset': offset, 'timeout': timeout},
+            timeout=(self.connect_timeout, timeout + self.read_timeout),
         )
         data = response.json()
         return GetUpdatesResponse(**data)
 
     def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
         """Отправить сообщение телеграмм-боту"""
-        response: Response = requests.get(
-            self.get_url('sendMessage'), params={'chat_id': chat_id, 'text': text}
+        response: Response = self.session.get(
+            self.get_url('sendMessage'),
+            params={'chat_id': chat_id, 'text': text},
+            timeout=(self.connect_timeout, self.read_timeout),
         )
         data = response.json()
+        if response.status_code == 429:
+            raise RetryAfter(data.get('parameters', {}).get('retry_after', 1))
         return SendMessageResponse(**data)
 
+    def set_webhook(self, url: str, secret_token: str) -> dict:
+        """Регистрация вебхука: Telegram будет присылать обновления на url"""
+        response: Response = self.session.get(
+            self.get_url('setWebhook'),
+            params={'url': url, 'secret_token': secret_token},
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        return response.json()
+
+    @cached_property
+    def send_queue(self) -> SendQueue:
+        """Очередь исходящих сообщений с ограничением частоты отправки"""
+        return SendQueue(
+            self,
+            global_rate=settings.TG_GLOBAL_RATE,
+            chat_rate=settings.TG_CHAT_RATE,
+            chat_burst=settings.TG_CHAT_BURST,
+            senders=settings.TG_POOL_SIZE,
+        )
+
+    def close(self) -> None:
+        if 'send_queue' in self.__dict__:
+            self.send_queue.close()
+        self.session.close()
+
+
+@lru_cache(maxsize=None)
+def get_tg_client() -> TgClient:
+    """Общий TgClient процесса: пул соединений и очередь отправки"""
+    return TgClient()
+
 
+class AsyncTgClient:
+    """Асинхронный клиент телеграмм-бота с пулом keep-alive соединений"""
+
+    def __init__(self, token: str = settings.BOT_TOKEN, max_connections: int = 10) -> None:
+        self.token = token
+        self.session = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(10, read=90),
+        )
+
+    def get_url(self, method: str) -> str:
+        """Получаем urls в зависимости от метода"""
+        return f"{settings.TG_API_URL}/bot{self.token}/{method}"
+
+    async def get_updates(self, offset: int = 0, timeout: int = 60) -> GetUpdatesResponse:
+        """Запрос обновления телеграмм-бота"""
+        response = await self.session.get(
+            self.get_url('getUpdates'), params={'offset': offset, 'timeout': timeout}
+        )
+        return GetUpdatesResponse(**response.json())
+
+    async def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
+        """Отправить сообщение телеграмм-боту"""
+        response = await self.session.get(
+            self.get_url('sendMessage'), params={'chat_id': chat_id, 'text': text}
+        )
+        return SendMessageResponse(**response.json())
 
+    async def close(self) -> None:
+        await self.session.aclose()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.db import close_old_connections
+
+from bot.tg.client import AsyncTgClient
+from bot.tg.dc import Message, SendMessageResponse, UpdateObj
+
+logger = logging.getLogger(__name__)
+
+
+class BlockingTgClient:
+    """
+    Синхронный интерфейс TgClient поверх AsyncTgClient.
+
+    Обработчики сообщений работают в потоках (ORM синхронный), а запросы
+    к Telegram выполняются в цикле событий через общий пул соединений.
+    """
+
+    def __init__(self, client: AsyncTgClient, loop: asyncio.AbstractEventLoop) -> None:
+        self.client = client
+        self.loop = loop
+
+    def send_message(self, chat_id: int, text: str) -> SendMessageResponse:
+        """Отправить сообщение телеграмм-боту"""
+        return asyncio.run_coroutine_threadsafe(self.client.send_message(chat_id, text), self.loop).result()
+
+
+class AsyncDispatcher:
+    """
+    Приём обновлений long polling'ом и параллельная обработка по чатам.
+
+    Сообщения одного чата всегда попадают в одну очередь и обрабатываются
+    по порядку, разные чаты обрабатываются параллельно ``workers`` обработчиками.
+    Очереди ограничены ``queue_size``: при их заполнении приём обновлений ждёт.
+    Потоки обработчиков живут всё время работы бота, поэтому после каждого
+    сообщения, как после HTTP-запроса, вызывается close_old_connections.
+    """
+
+    def __init__(
+        self,
+        client: AsyncTgClient,
+        handler: Callable[[Message], None],
+        workers: int = 8,
+        queue_size: int = 100,
+    ) -> None:
+        self.client = client
+        self.handler = handler
+        self.workers = workers
+        self.queue_size = queue_size
+        self.queues: list[asyncio.Queue] = []
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='runbot')
+
+    async def run(self, offset: int = 0, max_updates: int | None = None, poll_timeout: int = 60) -> int:
+        """Обработка обновлений; max_updates ограничивает их число (для тестов и замеров)"""
+        self.queues = [asyncio.Queue(maxsize=self.queue_size) for _ in range(self.workers)]
+        tasks = [asyncio.create_task(self._worker(queue)) for queue in self.queues]
+        received = 0
+        try:
+            while max_updates is None or received < max_updates:
+                response = await self.client.get_updates(offset=offset, timeout=poll_timeout)
+                for update in response.result:
+                    offset = update.update_id + 1
+                    received += 1
+                    await self.dispatch(update)
+            await asyncio.gather(*(queue.join() for queue in self.queues))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.executor.shutdown(wait=False)
+        return offset
+
+    async def dispatch(self, update: UpdateObj) -> None:
+        queue = self.queues[update.message.chat.id % self.workers]
+        await queue.put(update.message)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await queue.get()
+            try:
+                await loop.run_in_executor(self.executor, self._handle, message)
+            except Exception:
+                logger.exception('Ошибка обработки сообщения из чата %s', message.chat.id)
+            finally:
+                queue.task_done()
+
+    def _handle(self, message: Message) -> None:
+        try:
+            self.handler(message)
+        finally:
+            # разорванное соединение (перезапуск БД, таймаут простоя) не ломает поток навсегда
+            close_old_connections()
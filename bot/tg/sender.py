@@ -0,0 +1,183 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Максимальная длина текста сообщения в Telegram
+MAX_MESSAGE_LENGTH = 4096
+
+
+class RetryAfter(Exception):
+    """Telegram ответил 429: повторить отправку не раньше чем через retry_after секунд"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f'Retry after {retry_after} s')
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket: rate токенов в секунду, не больше capacity подряд
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now: float) -> float:
+        """Сколько секунд ждать до следующего токена"""
+        self._refill(now)
+        return 0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def consume(self, now: float) -> None:
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, now: float, seconds: float) -> None:
+        """Не выдавать токены seconds секунд"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+    def is_full(self, now: float) -> bool:
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class SendQueue:
+    """
+    Очередь исходящих сообщений телеграмм-бота.
+
+    send_message не ждёт ответа Telegram. Сообщения одного чата отправляются
+    по порядку, накопившиеся за время ожидания склеиваются в одно (до 4096
+    символов). Частота отправки ограничена token bucket'ами: общим
+    (global_rate в секунду) и отдельным для каждого чата (chat_rate в секунду,
+    не больше chat_burst подряд). На ответ 429 очередь приостанавливается
+    на retry_after секунд.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        global_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: int = 3,
+        senders: int = 4,
+    ) -> None:
+        self.client = client
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.senders = senders
+        self.global_bucket = TokenBucket(global_rate, global_rate)
+        self.chat_buckets: dict[int, TokenBucket] = {}
+        self.pending: dict[int, deque[str]] = {}
+        self.in_flight: set[int] = set()
+        self.condition = threading.Condition()
+        self.closed = False
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+
+    def send_message(self, chat_id: int, text: str) -> None:
+        """Поставить сообщение в очередь"""
+        with self.condition:
+            if self.closed:
+                raise RuntimeError('SendQueue is closed')
+            self.pending.setdefault(chat_id, deque()).append(text)
+            if self._thread is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.senders, thread_name_prefix='tg-send')
+                self._thread = threading.Thread(target=self._run, name='tg-send-queue', daemon=True)
+                self._thread.start()
+            self.condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Дождаться отправки всех сообщений; False, если не успели за timeout"""
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.in_flight, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Отправить оставшиеся сообщения и остановить очередь"""
+        self.flush(timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._executor.shutdown(wait=True)
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                if self.closed:
+                    return
+                chat_id, text, delay = self._next(time.monotonic())
+                if chat_id is None:
+                    self.condition.wait(delay)
+                    continue
+            self._executor.submit(self._send, chat_id, text)
+
+    def _next(self, now: float) -> tuple[int | None, str | None, float | None]:
+        """Выбор чата, которому можно отправить сообщение сейчас, иначе время ожидания"""
+        if not self.pending:
+            self._prune(now)
+            return None, None, None
+        delay = self.global_bucket.wait_time(now)
+        if delay:
+            return None, None, delay
+
+        for chat_id in self.pending:
+            if chat_id in self.in_flight:
+                continue
+            bucket = self.chat_buckets.setdefault(chat_id, TokenBucket(self.chat_rate, self.chat_burst))
+            wait = bucket.wait_time(now)
+            if wait:
+                delay = wait if delay == 0 else min(delay, wait)
+                continue
+
+            messages = self.pending.pop(chat_id)
+            text = self._coalesce(messages)
+            if messages:
+                # Остаток уходит в конец очереди: чаты обслуживаются по кругу
+                self.pending[chat_id] = messages
+            bucket.consume(now)
+            self.global_bucket.consume(now)
+            self.in_flight.add(chat_id)
+            return chat_id, text, 0
+        # delay == 0: все чаты с сообщениями ждут ответа, разбудит _send
+        return None, None, delay or None
+
+    @staticmethod
+    def _coalesce(messages: deque[str]) -> str:
+        text = messages.popleft()
+        while messages and len(text) + 1 + len(messages[0]) <= MAX_MESSAGE_LENGTH:
+            text = f'{text}\n{messages.popleft()}'
+        return text
+
+    def _prune(self, now: float) -> None:
+        # Корзины простаивающих чатов заполнены и больше ничего не ограничивают
+        for chat_id in [chat_id for chat_id, bucket in self.chat_buckets.items() if bucket.is_full(now)]:
+            if chat_id not in self.in_flight:
+                del self.chat_buckets[chat_id]
+
+    def _send(self, chat_id: int, text: str) -> None:
+        try:
+            self.client.send_message(chat_id=chat_id, text=text)
+        except RetryAfter as error:
+            logger.warning('Telegram ограничил отправку в чат %s на %s с', chat_id, error.retry_after)
+            with self.condition:
+                self.global_bucket.pause(time.monotonic(), error.retry_after)
+                self.pending.setdefault(chat_id, deque()).appendleft(text)
+        except Exception:
+            logger.exception('Ошибка отправки сообщения в чат %s', chat_id)
+        finally:
+            with self.condition:
+                self.in_flight.discard(chat_id)
+                self.condition.notify_all()
@@ -1,8 +1,9 @@
 from django.urls import path
 
-from bot.views import VerifyUserView
+from bot.views import VerifyUserView, WebhookView
 
 urlpatterns = [
     path('verify', VerifyUserView.as_view(), name='verify_bot'),
+    path('webhook', WebhookView.as_view(), name='webhook'),
 ]
 
@@ -1,11 +1,18 @@
+import hmac
 from typing import Any
+from django.conf import settings
+from pydantic import ValidationError
 from rest_framework import generics, permissions
-from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.exceptions import AuthenticationFailed, NotFound, PermissionDenied
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from bot.models import TgUser
 from bot.serializers import TgUserSerializer
-from bot.tg.client import TgClient
+from bot.tasks import send_message
+from bot.tg.client import get_tg_client
+from bot.tg.dc import UpdateObj
+from bot.webhook import UpdateQueue
 
 
 class VerifyUserView(generics.GenericAPIView):
@@ -33,8 +40,42 @@ class VerifyUserView(generics.GenericAPIView):
         tg_user.user = request.user
         tg_user.save()
 
-        TgClient().send_message(chat_id=tg_user.chat_id, text='Bot verificated')
+        if settings.JOBS_ENABLED:
+            send_message.enqueue(chat_id=tg_user.chat_id, text='Bot verificated')
+        else:
+            get_tg_client().send_queue.send_message(chat_id=tg_user.chat_id, text='Bot verificated')
 
         return Response(TgUserSerializer(tg_user).data)
 
 
+class WebhookView(APIView):
+    """
+    Приём обновлений Telegram (setWebhook) вместо long polling.
+
+    Обновление сохраняется в очередь TgUpdate и сразу подтверждается,
+    обрабатывают его runbot --webhook.
+    """
+
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        """
+        Проверка секретного токена и постановка обновления в очередь
+        """
+        if not settings.TG_WEBHOOK_SECRET:
+            raise NotFound
+        secret: str = request.headers.get('X-Telegram-Bot-Api-Secret-Token', '')
+        if not hmac.compare_digest(secret.encode(), settings.TG_WEBHOOK_SECRET.encode()):
+            raise PermissionDenied
+
+        try:
+            update = UpdateObj(**request.data)
+        except (TypeError, ValidationError):
+            # Обновления без сообщения (edited_message и т.п.) бот не обрабатывает:
+            # подтверждаем, чтобы Telegram не присылал их повторно
+            return Response()
+
+        UpdateQueue.put(update, request.data)
+        return Response()
+
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bot.models import TgUpdate
+from bot.tg.dc import UpdateObj
+
+# Ключ pg_advisory_xact_lock, которым сериализуются UpdateQueue.claim
+CLAIM_LOCK_ID = 0x7467_7570  # 'tgup'
+
+
+class UpdateQueue:
+    """
+    Очередь обновлений вебхука в таблице TgUpdate.
+
+    Вебхук только сохраняет обновление, обработчики runbot --webhook
+    забирают их пачками через SELECT ... FOR UPDATE SKIP LOCKED и удаляют
+    после обработки. Забранные строки арендуются на lease секунд: обновления
+    упавшего обработчика по истечении аренды достанутся другому. Чаты,
+    обновления которых сейчас в работе, пропускаются, чтобы сообщения
+    одного чата не обрабатывались параллельно.
+
+    Выдача сериализуется advisory-блокировкой транзакции: аренда, взятая
+    другим обработчиком, видна только после его фиксации, и без блокировки
+    два обработчика могли бы одновременно забрать соседние обновления
+    одного чата. Выдача — один короткий SELECT и UPDATE, очередь не ждёт
+    обработки сообщений. На других БД блокировки нет: SQLite и так
+    допускает одну пишущую транзакцию.
+    """
+
+    def __init__(self, lease: int = settings.TG_WEBHOOK_LEASE) -> None:
+        self.lease = lease
+
+    @staticmethod
+    def put(update: UpdateObj, payload: dict) -> None:
+        """Сохранить обновление; повтор того же update_id от Telegram игнорируется"""
+        TgUpdate.objects.bulk_create(
+            [TgUpdate(update_id=update.update_id, chat_id=update.message.chat.id, payload=payload)],
+            ignore_conflicts=True,
+        )
+
+    def claim(self, limit: int) -> list[TgUpdate]:
+        """Забрать до limit обновлений в порядке update_id"""
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_xact_lock(%s)', [CLAIM_LOCK_ID])
+            # аренды предыдущего claim уже зафиксированы и видны следующему запросу
+            now = timezone.now()
+            busy_chats = TgUpdate.objects.filter(locked_until__gt=now).values('chat_id')
+            updates = list(
+                TgUpdate.objects.select_for_update(skip_locked=True)
+                .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+                .exclude(chat_id__in=busy_chats)
+                .order_by('update_id')[:limit]
+            )
+            TgUpdate.objects.filter(id__in=[update.id for update in updates]).update(
+                locked_until=now + timedelta(seconds=self.lease)
+            )
+        return updates
+
+    @staticmethod
+    def ack(update: TgUpdate) -> None:
+        """Удалить обработанное обновление"""
+        TgUpdate.objects.filter(id=update.id).delete()
@@ -0,0 +1,66 @@
+import logging
+import os
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
+from typing import Any
+from weakref import WeakSet
+
+from django.utils.module_loading import import_string
+
+
+class QueuedHandler(QueueHandler):
+    """
+    Запись логов в фоновом потоке: поток запроса только кладёт запись в очередь.
+
+    Целевой обработчик (target с параметрами target_kwargs) создаётся здесь же,
+    чтобы его можно было описать в LOGGING (dictConfig в Python 3.11 не умеет
+    настраивать QueueHandler). Переполненная очередь не блокирует запрос:
+    запись отбрасывается и учитывается в dropped. Фоновый поток не переживает
+    fork (gunicorn с preload_app): в дочернем процессе он запускается заново.
+    """
+
+    def __init__(self, target: str = 'logging.StreamHandler', maxsize: int = 10000, **target_kwargs: Any) -> None:
+        super().__init__(Queue(maxsize))
+        self.target: logging.Handler = import_string(target)(**target_kwargs)
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+        _handlers.add(self)
+
+    def restart(self) -> None:
+        """Новые очередь и поток записи после fork; записи родителя остаются родителю"""
+        if self.listener._thread is None:
+            return
+        self.queue = Queue(self.queue.maxsize)
+        self.listener = QueueListener(self.queue, self.target)
+        self.listener.start()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Дождаться записи всего, что уже в очереди"""
+        if self.listener._thread is not None:
+            self.queue.join()
+        self.target.flush()
+
+    def close(self) -> None:
+        # logging.shutdown при выходе закрывает обработчик: очередь дописывается до конца
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.target.close()
+        super().close()
+
+
+_handlers: WeakSet[QueuedHandler] = WeakSet()
+
+
+def _restart_after_fork() -> None:
+    for handler in list(_handlers):
+        handler.restart()
+
+
+os.register_at_fork(after_in_child=_restart_after_fork)
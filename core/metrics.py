@@ -0,0 +1,212 @@
+import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import ExitStack
+from threading import Lock
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+    """
+    Процессный реестр метрик запросов по представлению (view_name).
+
+    Отдаётся в текстовом формате Prometheus. Под gunicorn с несколькими
+    воркерами у каждого процесса свои значения: Prometheus собирает их
+    по отдельности, а суммирует запрос к нему.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests: dict[tuple[str, str, str], int] = defaultdict(int)
+            self.totals: dict[str, dict[str, float]] = defaultdict(lambda: defaultdict(float))
+            self.durations: dict[str, Histogram] = {}
+            self.query_counts: dict[str, Histogram] = {}
+
+    def observe(self, view: str, method: str, status: int, timing: 'RequestTiming', size: int | None) -> None:
+        with self._lock:
+            # произвольные методы клиентов не должны плодить серии
+            self.requests[view, method if method in METHODS else 'OTHER', f'{status // 100}xx'] += 1
+            totals = self.totals[view]
+            totals['db_queries'] += timing.queries
+            totals['db_seconds'] += timing.db
+            totals['serialize_seconds'] += timing.serialize
+            totals['render_seconds'] += timing.render
+            totals['slow_queries'] += timing.slow_queries
+            if size is not None:
+                totals['response_bytes'] += size
+            self.durations.setdefault(view, Histogram(DURATION_BUCKETS)).observe(timing.total)
+            self.query_counts.setdefault(view, Histogram(QUERY_COUNT_BUCKETS)).observe(timing.queries)
+
+    def render(self) -> str:
+        lines = []
+
+        def metric(name: str, kind: str, description: str) -> None:
+            lines.extend((f'# HELP todolist_{name} {description}', f'# TYPE todolist_{name} {kind}'))
+
+        def histogram(name: str, histograms: dict[str, Histogram]) -> None:
+            for view, histogram in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip((*histogram.buckets, '+Inf'), histogram.counts):
+                    cumulative += count
+                    lines.append(f'todolist_{name}_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+                lines.append(f'todolist_{name}_sum{{view="{view}"}} {histogram.sum}')
+                lines.append(f'todolist_{name}_count{{view="{view}"}} {cumulative}')
+
+        with self._lock:
+            metric('requests_total', 'counter', 'Requests by view, method and status class')
+            for (view, method, status), count in sorted(self.requests.items()):
+                lines.append(f'todolist_requests_total{{view="{view}",method="{method}",status="{status}"}} {count}')
+            for name, description in (
+                ('db_queries', 'SQL queries'),
+                ('db_seconds', 'Time spent in SQL queries'),
+                ('serialize_seconds', 'Time in the view outside SQL queries (serializers, Python code)'),
+                ('render_seconds', 'Time spent rendering the response'),
+                ('response_bytes', 'Response body size (non-streaming responses)'),
+                ('slow_queries', 'SQL queries slower than METRICS_SLOW_QUERY_MS'),
+            ):
+                metric(f'{name}_total', 'counter', description)
+                for view, totals in sorted(self.totals.items()):
+                    lines.append(f'todolist_{name}_total{{view="{view}"}} {totals[name]}')
+            metric('request_duration_seconds', 'histogram', 'Request duration')
+            histogram('request_duration_seconds', self.durations)
+            metric('request_queries', 'histogram', 'SQL queries per request')
+            histogram('request_queries', self.query_counts)
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+
+
+class RequestTiming:
+    """Время и запросы к БД одного HTTP-запроса; execute_wrapper всех соединений"""
+
+    def __init__(self, slow_query_ms: float) -> None:
+        self.started = time.perf_counter()
+        self.view_started: float | None = None
+        self.view_finished: float | None = None
+        self.db_before_view = 0.0
+        self.view_db = 0.0
+        self.finished = 0.0
+        self.queries = 0
+        self.slow_queries = 0
+        self.db = 0.0
+        self.slow_query = slow_query_ms / 1000
+        self.view_name = '<unresolved>'
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: dict) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db += elapsed
+            if elapsed >= self.slow_query:
+                self.slow_queries += 1
+                logger.warning('Slow query %.1fms in %s: %s', elapsed * 1000, self.view_name, sql[:1000])
+
+    @property
+    def total(self) -> float:
+        return self.finished - self.started
+
+    @property
+    def serialize(self) -> float:
+        if self.view_started is None or self.view_finished is None:
+            return 0.0
+        return max(self.view_finished - self.view_started - self.view_db, 0.0)
+
+    @property
+    def render(self) -> float:
+        if self.view_finished is None:
+            return 0.0
+        return self.finished - self.view_finished
+
+
+class QueryMetricsMiddleware:
+    """
+    Число и время SQL-запросов, время представления и рендеринга, размер ответа.
+
+    Запросы считаются через connection.execute_wrapper. Время представления
+    за вычетом SQL (serialize) — это в основном работа сериализаторов;
+    render — рендеринг DRF Response после выхода из представления. Значения
+    копятся в metrics (/metrics), при METRICS_SERVER_TIMING отдаются в
+    заголовке Server-Timing. Медленные запросы и запросы с числом SQL
+    больше METRICS_QUERY_COUNT_WARNING (N+1) пишутся в лог с именем представления.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timing = RequestTiming(settings.METRICS_SLOW_QUERY_MS)
+        request._timing = timing
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = self.get_response(request)
+        if timing.view_started is not None and timing.view_finished is None:
+            # ответ без отложенного рендеринга (HttpResponse, StreamingHttpResponse)
+            self._view_finished(timing)
+        timing.finished = time.perf_counter()
+
+        size = None if response.streaming else len(response.content)
+        metrics.observe(timing.view_name, request.method, response.status_code, timing, size)
+        if timing.queries > settings.METRICS_QUERY_COUNT_WARNING:
+            logger.warning('%s queries in %s %s (%s)', timing.queries, request.method, request.path, timing.view_name)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = (
+                f'db;dur={timing.db * 1000:.1f};desc="{timing.queries} queries", '
+                f'serialize;dur={timing.serialize * 1000:.1f}, '
+                f'render;dur={timing.render * 1000:.1f}, '
+                f'total;dur={timing.total * 1000:.1f}'
+            )
+        return response
+
+    def process_view(self, request: HttpRequest, view_func: Callable, view_args: tuple, view_kwargs: dict) -> None:
+        timing: RequestTiming = request._timing
+        timing.view_name = request.resolver_match.view_name
+        timing.view_started = time.perf_counter()
+        timing.db_before_view = timing.db
+
+    def process_template_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        # вызывается после представления и до рендеринга DRF Response
+        self._view_finished(request._timing)
+        return response
+
+    @staticmethod
+    def _view_finished(timing: RequestTiming) -> None:
+        timing.view_finished = time.perf_counter()
+        timing.view_db = timing.db - timing.db_before_view
+
+
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """Метрики процесса в текстовом формате Prometheus; только с адресов METRICS_ALLOWED_IPS"""
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    return HttpResponse(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
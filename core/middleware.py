@@ -0,0 +1,128 @@
+import logging
+import random
+import re
+import time
+from inspect import getmembers, isclass
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.http import HttpRequest, HttpResponse
+from rest_framework import serializers
+
+from todolist.fields import PasswordField
+
+logger = logging.getLogger(__name__)
+
+# Типы тел, которые логируются текстом; остальные — только размером
+TEXT_CONTENT_TYPES = ('application/json', 'application/x-www-form-urlencoded', 'text/')
+
+
+def password_fields() -> set[str]:
+    """Имена полей PasswordField сериализаторов core.serializers"""
+    from core import serializers as core_serializers
+
+    names = set()
+    for _, serializer_class in getmembers(core_serializers, isclass):
+        if serializer_class.__module__ == core_serializers.__name__ and \
+                issubclass(serializer_class, serializers.Serializer):
+            names.update(
+                name for name, field in serializer_class().get_fields().items() if isinstance(field, PasswordField)
+            )
+    return names
+
+
+def redaction_pattern(names: set[str]) -> re.Pattern:
+    """Значения полей names в JSON ("name": "...") и в форме (name=...), в том числе обрезанные"""
+    names = '|'.join(sorted(map(re.escape, names)))
+    return re.compile(
+        rf'(?P<json>"(?:{names})"\s*:\s*)"(?:[^"\\]|\\.)*(?:"|$)|(?P<form>(?:^|&)(?:{names})=)[^&]*'
+    )
+
+
+class RequestLoggingMiddleware:
+    """
+    Лог запросов с выборкой, ограничением размера тел и скрытием паролей.
+
+    Ответы 4xx/5xx логируются всегда, успешные — с вероятностью
+    REQUEST_LOG_SAMPLE_RATE или ставкой из REQUEST_LOG_ROUTE_RATES для самого
+    длинного совпавшего префикса пути. Тела запроса и ответа обрезаются до
+    REQUEST_LOG_MAX_BODY байт, значения PasswordField заменяются на ***.
+    Несэмплированный успешный запрос стоит одного random() и поиска префикса.
+    Сама запись идёт через обработчики LOGGING (core.log_handlers.QueuedHandler).
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.sample_rate: float = settings.REQUEST_LOG_SAMPLE_RATE
+        # длинные префиксы проверяются первыми
+        self.route_rates = sorted(settings.REQUEST_LOG_ROUTE_RATES.items(), key=lambda item: -len(item[0]))
+        self.max_body: int = settings.REQUEST_LOG_MAX_BODY
+        self.redact_fields = password_fields() | set(settings.REQUEST_LOG_REDACT_FIELDS)
+        self.redact = redaction_pattern(self.redact_fields)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        sampled = random.random() < self.rate(request.path_info)
+        # тело берётся до представления (потом поток уже прочитан): всегда небольшое, большое — при выборке;
+        # форматируется только при записи в лог
+        body = self.request_body(request) if sampled or self.is_small(request) else None
+
+        response = self.get_response(request)
+
+        if response.status_code >= 400:
+            level = logging.ERROR if response.status_code >= 500 else logging.WARNING
+        elif sampled:
+            level = logging.INFO
+        else:
+            return response
+        if logger.isEnabledFor(level):
+            user = getattr(request, 'user', None)
+            logger.log(
+                level, '%s %s %s %.1fms user=%s request=%s response=%s',
+                request.method, request.get_full_path(), response.status_code,
+                (time.perf_counter() - started) * 1000, user.id if user is not None else None,
+                body and self.format_body(*body), self.response_body(response),
+            )
+        return response
+
+    def rate(self, path: str) -> float:
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.sample_rate
+
+    def is_small(self, request: HttpRequest) -> bool:
+        try:
+            return int(request.META.get('CONTENT_LENGTH') or 0) <= self.max_body
+        except ValueError:
+            return False
+
+    @staticmethod
+    def request_body(request: HttpRequest) -> tuple[bytes, str] | None:
+        if not request.META.get('CONTENT_LENGTH'):
+            return None
+        try:
+            return request.body, request.content_type or ''
+        except RequestDataTooBig:
+            return None
+
+    def response_body(self, response: HttpResponse) -> str | None:
+        if response.streaming or not response.has_header('Content-Type'):
+            return None
+        return self.format_body(response.content, response['Content-Type'])
+
+    def format_body(self, content: bytes, content_type: str) -> str | None:
+        if not content:
+            return None
+        if not content_type.startswith(TEXT_CONTENT_TYPES):
+            return f'<{len(content)} bytes {content_type}>'
+        text = content[:self.max_body].decode(errors='replace')
+        # поиск подстрок в разы быстрее регулярного выражения, а пароли есть в немногих телах
+        if any(name in text for name in self.redact_fields):
+            text = self.redact.sub(
+                lambda match: f'{match["json"]}"***"' if match['json'] else f'{match["form"]}***', text
+            )
+        if len(content) > self.max_body:
+            text += f'... <{len(content)} bytes>'
+        return text
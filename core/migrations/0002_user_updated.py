@@ -0,0 +1,18 @@
+# Generated by Django 4.0.1 on 2026-10-18 05:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, null=True, verbose_name='Дата последнего обновления'),
+        ),
+    ]
@@ -6,6 +6,8 @@ from django.db import models
 class User(AbstractUser):
     """Модель пользователя"""
     age = models.PositiveIntegerField(null=True, blank=True, validators=[MinValueValidator(10), MaxValueValidator(100)])
+    # Профиль вложен в ответы целей и комментариев: входит в их ETag и Last-Modified (goals.conditional)
+    updated = models.DateTimeField(verbose_name='Дата последнего обновления', auto_now=True, null=True)
 
     REQUIRED_FIELDS: list[str] = []
 
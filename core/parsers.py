@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from core.renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser на orjson; без orjson работает как обычный JSONParser.
+
+    orjson, как и строгий JSONParser, не принимает NaN и Infinity.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                data = data.decode(encoding)
+            return orjson.loads(data)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
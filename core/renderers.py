@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer на orjson; без orjson работает как обычный JSONRenderer.
+
+    Вывод совпадает с JSONRenderer побайтно: компактный UTF-8, datetime
+    в ISO 8601 с Z для UTC, IntegerChoices как числа, U+2028/U+2029
+    экранированы. Типы, которых orjson не знает (Decimal, lazy-строки,
+    QuerySet...), преобразуются JSONEncoder'ом DRF. Отступы (indent=...
+    и Browsable API) и ошибки orjson обрабатываются стандартным json.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS if orjson else 0
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
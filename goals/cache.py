@@ -0,0 +1,128 @@
+from hashlib import md5
+from typing import Any, Callable
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, urlencode
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.models import BoardParticipant
+
+
+class ResponseCache:
+    """
+    Кэш отрендеренных ответов по пользователю и строке запроса.
+
+    Ключ ответа содержит версию пользователя. Изменение данных, видимых
+    пользователю, выдаёт ему новую версию (bump), и старые ответы больше
+    не читаются, а со временем вытесняются по TTL и LRU бэкенда.
+    """
+
+    def __init__(self, alias: str = 'responses') -> None:
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_TIMEOUT > 0
+
+    @staticmethod
+    def _version_key(user_id: int) -> str:
+        return f'goals:version:{user_id}'
+
+    def key(self, request: Request) -> str:
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+        digest = md5(f'{request.accepted_media_type}|{url}'.encode()).hexdigest()
+        version = self.cache.get_or_set(self._version_key(request.user.id), uuid4().hex, timeout=None)
+        return f'goals:response:{request.user.id}:{version}:{digest}'
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        return self.cache.get(key)
+
+    def set(self, key: str, content: bytes) -> tuple[bytes, str]:
+        entry = (content, f'"{md5(content).hexdigest()}"')
+        self.cache.set(key, entry, settings.RESPONSE_CACHE_TIMEOUT)
+        return entry
+
+    def bump(self, *user_ids: int) -> None:
+        """Новые версии пользователей после фиксации транзакции"""
+        if not self.enabled or not user_ids:
+            return
+        versions = {self._version_key(user_id): uuid4().hex for user_id in set(user_ids)}
+        # До фиксации параллельный запрос ещё видит старые данные и положил бы их под новую версию
+        transaction.on_commit(lambda: self.cache.set_many(versions, timeout=None))
+
+    def bump_participants(self, **lookup: Any) -> None:
+        """Новые версии участникам досок, выбранных lookup (board_id=..., board__categories=...)"""
+        if not self.enabled:
+            return
+        self.bump(*BoardParticipant.objects.filter(**lookup).values_list('user_id', flat=True))
+
+
+response_cache = ResponseCache()
+
+
+def content_response(request: Request, response: HttpResponse, etag: str) -> HttpResponse:
+    """Ответ с ETag или 304 при совпавшем If-None-Match"""
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class CachedResponseMixin:
+    """
+    Кэш JSON-ответа с ETag: совпавший If-None-Match получает 304
+    """
+
+    def cached_response(self, request: Request, build: Callable[[], Response]) -> HttpResponse:
+        renderer = request.accepted_renderer
+        if not response_cache.enabled or renderer.format != 'json':
+            return build()
+
+        key = response_cache.key(request)
+        entry = response_cache.get(key)
+        if entry is None:
+            response = build()
+            if response.status_code != 200:
+                return response
+            content = renderer.render(response.data, request.accepted_media_type, self.get_renderer_context())
+            entry = response_cache.set(key, content)
+
+        content, etag = entry
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        return content_response(request, HttpResponse(content, content_type=content_type), etag)
+
+
+class CachedListMixin(CachedResponseMixin):
+    """Кэш ответа ListAPIView"""
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        build = super().list
+        return self.cached_response(request, lambda: build(request, *args, **kwargs))
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    """
+    Кэш ответа RetrieveAPIView.
+
+    Ответ берётся из кэша до get_object и проверки прав: запись есть только
+    у пользователя, уже получившего 200, а потеря доступа (удаление участника)
+    меняет его версию.
+    """
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        build = super().retrieve
+        return self.cached_response(request, lambda: build(request, *args, **kwargs))
@@ -0,0 +1,118 @@
+import logging
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from goals.cache import response_cache
+from goals.models import Board, Goal, GoalCategory
+
+logger = logging.getLogger(__name__)
+
+
+def update_in_batches(queryset: QuerySet, batch_size: int, **values: Any) -> Iterator[int]:
+    """
+    UPDATE queryset пачками по batch_size строк, каждая в своей транзакции.
+
+    queryset должен исключать уже обновлённые строки: тогда повтор после
+    сбоя продолжает с места остановки. Пачки идут по возрастанию pk, и строки
+    блокируются только на время своей пачки. Отдаёт число обновлённых строк.
+    """
+    last_pk = 0
+    while True:
+        pks = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return
+        with transaction.atomic():
+            # условия queryset повторяются: строку могли изменить после выборки pk
+            updated = queryset.filter(pk__in=pks).update(**values)
+        last_pk = pks[-1]
+        yield updated
+
+
+def active_goals(**lookup: Any) -> QuerySet:
+    return Goal.objects.filter(**lookup).exclude(status=Goal.Status.archived)
+
+
+def delete_categories(board_id: int, batch_size: int) -> Iterator[int]:
+    return update_in_batches(
+        GoalCategory.objects.filter(board_id=board_id, is_deleted=False),
+        batch_size, is_deleted=True, updated=timezone.now().date(),
+    )
+
+
+def delete_board(board_id: int, batch_size: int | None = None) -> None:
+    """
+    Пометка доски и её категорий удалёнными: цели скрываются из списков сразу,
+    архивирует их archive_board
+    """
+    Board.objects.filter(id=board_id).update(is_deleted=True, updated=timezone.now().date())
+    for _ in delete_categories(board_id, batch_size or settings.CASCADE_BATCH_SIZE):
+        pass
+    # update() не шлёт сигналов: кэш списков участников сбрасывается явно
+    response_cache.bump_participants(board_id=board_id)
+
+
+def delete_category(category: GoalCategory) -> None:
+    """Пометка категории удалённой (сигнал save() сбрасывает кэш); цели архивирует archive_category"""
+    category.is_deleted = True
+    category.save(update_fields=('is_deleted', 'updated'))
+
+
+def archive_board(board_id: int, batch_size: int | None = None) -> Iterator[int]:
+    """
+    Архивирование целей удалённой доски пачками; отдаёт число строк с начала.
+
+    Сначала дописываются категории, оставшиеся после прерванного delete_board.
+    """
+    batch_size = batch_size or settings.CASCADE_BATCH_SIZE
+    total = 0
+    for updated in delete_categories(board_id, batch_size):
+        total += updated
+        yield total
+    for updated in update_in_batches(
+        active_goals(category__board_id=board_id), batch_size, status=Goal.Status.archived, updated=timezone.now()
+    ):
+        total += updated
+        yield total
+    response_cache.bump_participants(board_id=board_id)
+
+
+def archive_category(category: GoalCategory, batch_size: int | None = None) -> Iterator[int]:
+    """Архивирование целей удалённой категории пачками; отдаёт число строк с начала"""
+    total = 0
+    for updated in update_in_batches(
+        active_goals(category_id=category.id), batch_size or settings.CASCADE_BATCH_SIZE,
+        status=Goal.Status.archived, updated=timezone.now(),
+    ):
+        total += updated
+        yield total
+    response_cache.bump_participants(board_id=category.board_id)
+
+
+def run(progress: Iterator[int], label: str) -> int:
+    """Прогон каскада до конца с записью хода в лог"""
+    total = 0
+    for total in progress:
+        logger.debug('%s: %s rows archived', label, total)
+    if total:
+        logger.info('%s: %s rows archived', label, total)
+    return total
+
+
+def pending(batch_size: int | None = None) -> Iterator[tuple[str, Iterator[int]]]:
+    """Каскады удалённых досок и категорий, оставшиеся незавершёнными (отложенные или прерванные)"""
+    boards = list(
+        Board.objects.filter(is_deleted=True, categories__is_deleted=False).distinct().values_list('id', flat=True)
+    )
+    for board_id in boards:
+        yield f'board {board_id}', archive_board(board_id, batch_size)
+    categories = list(GoalCategory.objects.filter(
+        is_deleted=True, id__in=active_goals(category__is_deleted=True).values('category_id')
+    ))
+    for category in categories:
+        yield f'category {category.id}', archive_category(category, batch_size)
@@ -0,0 +1,112 @@
+from datetime import datetime
+from hashlib import md5
+from typing import Any
+
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from goals.cache import content_response, response_cache
+
+
+def set_validators(response: HttpResponse, etag: str, last_modified: datetime) -> HttpResponse:
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def with_profile(request: Request, etag_part: str, last_modified: datetime) -> tuple[str, datetime]:
+    """
+    ETag и Last-Modified с учётом профиля: строки целей и комментариев
+    отбираются по user=request.user и содержат его ProfileSerializer,
+    а изменение профиля не трогает их updated.
+    """
+    profile_updated: datetime | None = request.user.updated
+    if profile_updated is None:
+        return f'W/"{etag_part}"', last_modified
+    return f'W/"{etag_part}-{profile_updated.timestamp()}"', max(last_modified, profile_updated)
+
+
+class LastModifiedMixin:
+    """
+    Conditional GET объекта по полю updated.
+
+    Last-Modified точен до секунды, поэтому ETag строится из updated
+    с микросекундами и проверяется первым. Проверка стоит один запрос
+    values_list вместо загрузки и сериализации объекта. Вложенный профиль
+    пользователя учитывается через User.updated (with_profile).
+    """
+
+    def retrieve(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        last_modified: datetime | None = (
+            self.get_queryset()
+            .filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+            .values_list('updated', flat=True)
+            .first()
+        )
+        if last_modified is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, last_modified = with_profile(request, str(last_modified.timestamp()), last_modified)
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET списка по агрегату MAX(updated) и COUNT(*) отфильтрованного queryset.
+
+    Удаление элемента не меняет MAX(updated), поэтому ответ проверяется
+    только по ETag (If-None-Match), а Last-Modified отдаётся для сведения.
+    При включённом кэше ответов ETag выдаёт CachedListMixin без запросов к БД.
+    Keyset-страницы не проверяются: агрегат по всему списку дороже самой страницы.
+    COUNT агрегата передаётся пагинатору (ListPagination.known_count), поэтому
+    страница limit/offset не считает список второй раз.
+    """
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        use_keyset = getattr(self.paginator, 'use_keyset', None)
+        if response_cache.enabled or (use_keyset is not None and use_keyset(request)):
+            return super().list(request, *args, **kwargs)
+
+        state = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            last_modified=Max('updated'), count=Count('id')
+        )
+        if hasattr(self.paginator, 'known_count'):
+            self.paginator.known_count = state['count']
+        if state['last_modified'] is None:
+            return super().list(request, *args, **kwargs)
+
+        etag, last_modified = with_profile(
+            request, f'{state["count"]}-{state["last_modified"].timestamp()}', state['last_modified']
+        )
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+
+class ContentETagMixin:
+    """
+    ETag объекта по содержимому JSON-ответа (md5), без кэша ответов.
+
+    Для доски: Board.updated и даты участников хранятся с точностью до дня,
+    а ответ содержит имена участников. Совпавший If-None-Match получает 304
+    без тела; чтение и сериализация выполняются как обычно.
+    При включённом кэше ответов ETag выдаёт CachedRetrieveMixin.
+    """
+
+    def finalize_response(self, request: Request, response: HttpResponse, *args: Any, **kwargs: Any) -> HttpResponse:
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response_cache.enabled or request.method != 'GET' or response.status_code != 200 \
+                or not isinstance(response, Response) or request.accepted_renderer.format != 'json':
+            return response
+        # рендеринг здесь, а не в обработчике запроса: тело считается один раз
+        response.render()
+        return content_response(request, response, f'"{md5(response.content).hexdigest()}"')
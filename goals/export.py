@@ -0,0 +1,131 @@
+import csv
+from datetime import date
+from typing import Iterable, Iterator
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+
+from goals.models import Goal, GoalComment
+from goals.readers import datetime_converter
+
+# Формат выгрузки -> тип содержимого и расширение файла
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+}
+
+# Колонки CSV: записи целей и комментариев в одной таблице, тип записи в колонке type
+EXPORT_COLUMNS = (
+    'type', 'id', 'goal', 'category', 'category_title', 'title', 'description',
+    'status', 'priority', 'due_date', 'text', 'user', 'created', 'updated',
+)
+
+GOAL_LOOKUPS = (
+    'id', 'category_id', 'category__title', 'title', 'description',
+    'status', 'priority', 'due_date', 'user__username', 'created', 'updated',
+)
+COMMENT_LOOKUPS = ('id', 'goal_id', 'text', 'user__username', 'created', 'updated')
+
+
+class BoardExport:
+    """
+    Выгрузка целей доски и, по желанию, комментариев к ним.
+
+    Строки читаются через values_list().iterator(chunk_size): в PostgreSQL это
+    серверный курсор, и в памяти держится одна пачка строк, а не вся доска.
+    Сначала идут все цели, затем все комментарии, каждые в порядке id.
+    """
+
+    def __init__(self, board_id: int, comments: bool = False, chunk_size: int | None = None) -> None:
+        self.board_id = board_id
+        self.comments = comments
+        self.chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        self.format_datetime = datetime_converter(serializers.DateTimeField())
+
+    def records(self) -> Iterator[dict]:
+        yield from self.goals()
+        if self.comments:
+            yield from self.goal_comments()
+
+    def goals(self) -> Iterator[dict]:
+        rows = (
+            Goal.objects.filter(category__board_id=self.board_id, category__is_deleted=False)
+            .order_by('id')
+            .values_list(*GOAL_LOOKUPS)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        format_datetime = self.format_datetime
+        for goal_id, category_id, category_title, title, description, status, priority, due_date, \
+                username, created, updated in rows:
+            yield {
+                'type': 'goal',
+                'id': goal_id,
+                'category': category_id,
+                'category_title': category_title,
+                'title': title,
+                'description': description,
+                'status': status,
+                'priority': priority,
+                'due_date': date.isoformat(due_date) if due_date else None,
+                'user': username,
+                'created': format_datetime(created),
+                'updated': format_datetime(updated),
+            }
+
+    def goal_comments(self) -> Iterator[dict]:
+        rows = (
+            GoalComment.objects.filter(goal__category__board_id=self.board_id, goal__category__is_deleted=False)
+            .order_by('id')
+            .values_list(*COMMENT_LOOKUPS)
+            .iterator(chunk_size=self.chunk_size)
+        )
+        format_datetime = self.format_datetime
+        for comment_id, goal_id, text, username, created, updated in rows:
+            yield {
+                'type': 'comment',
+                'id': comment_id,
+                'goal': goal_id,
+                'text': text,
+                'user': username,
+                'created': format_datetime(created),
+                'updated': format_datetime(updated),
+            }
+
+    def stream(self, export_format: str) -> Iterator[bytes]:
+        if export_format == 'csv':
+            return buffered(csv_lines(self.records()))
+        return buffered(ndjson_lines(self.records()))
+
+
+def ndjson_lines(records: Iterable[dict]) -> Iterator[bytes]:
+    render = import_string(settings.JSON_RENDERER_CLASS)().render
+    for record in records:
+        yield render(record) + b'\n'
+
+
+class _Line:
+    """Файловый объект для csv.writer: write возвращает строку вместо записи"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def csv_lines(records: Iterable[dict]) -> Iterator[bytes]:
+    writer = csv.DictWriter(_Line(), fieldnames=EXPORT_COLUMNS)
+    yield writer.writeheader().encode()
+    for record in records:
+        yield writer.writerow(record).encode()
+
+
+def buffered(lines: Iterable[bytes], size: int = 64 * 1024) -> Iterator[bytes]:
+    """Склейка строк в куски около size байт: меньше вызовов write у WSGI-сервера"""
+    chunk, length = [], 0
+    for line in lines:
+        chunk.append(line)
+        length += len(line)
+        if length >= size:
+            yield b''.join(chunk)
+            chunk, length = [], 0
+    if chunk:
+        yield b''.join(chunk)
@@ -1,6 +1,15 @@
+from functools import lru_cache, reduce
+from operator import or_
+
 import django_filters
-from django.db import models
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections, models
+from django.db.models import F, FloatField, QuerySet
+from django.db.models.functions import Cast
 from django_filters import rest_framework
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
 from goals.models import Goal, GoalCategory
 
 
@@ -24,4 +33,69 @@ class CategoryBoardFilter(rest_framework.FilterSet):
         model = GoalCategory
         fields = {
             'board': ('exact',)
-        }
\ No newline at end of file
+        }
+
+
+class GoalSearchFilter(SearchFilter):
+    """
+    Полнотекстовый поиск целей по search_vector (GIN-индекс) с ранжированием.
+
+    На базах, отличных от PostgreSQL, работает как обычный SearchFilter (ILIKE).
+    Должен стоять после OrderingFilter: без явного ordering результаты
+    сортируются по релевантности.
+    """
+    search_configs = ('russian', 'english')
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        terms = ' '.join(self.get_search_terms(request))
+        if not terms or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        query = reduce(or_, (
+            SearchQuery(terms, config=config, search_type='websearch') for config in self.search_configs
+        ))
+        # ts_rank возвращает real: приводим к double, чтобы значение без потерь
+        # проходило через курсор keyset-пагинации
+        queryset = queryset.annotate(
+            search_rank=Cast(SearchRank(F('search_vector'), query), FloatField())
+        ).filter(search_vector=query)
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-search_rank', *queryset.query.order_by)
+        return queryset
+
+
+@lru_cache
+def trigram_available(alias: str) -> bool:
+    """Установлено ли расширение pg_trgm в базе"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+class TrigramSearchFilter(BaseFilterBackend):
+    """
+    Нечёткий поиск по названию через pg_trgm (параметр ``?q=``) с сортировкой по похожести.
+
+    Без pg_trgm ищет подстроку через ILIKE. Должен стоять после OrderingFilter.
+    """
+    search_param = 'q'
+    search_field = 'title'
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        if not trigram_available(queryset.db):
+            return queryset.filter(**{f'{self.search_field}__icontains': term})
+
+        queryset = queryset.annotate(
+            similarity=Cast(TrigramSimilarity(self.search_field, term), FloatField())
+        ).filter(**{f'{self.search_field}__trigram_similar': term})
+
+        if api_settings.ORDERING_PARAM not in request.query_params:
+            queryset = queryset.order_by('-similarity', *queryset.query.order_by)
+        return queryset
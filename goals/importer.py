@@ -0,0 +1,172 @@
+import csv
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+from types import SimpleNamespace
+from typing import IO, Iterable, Iterator
+
+from django.db import transaction
+from rest_framework.exceptions import PermissionDenied
+
+from core.models import User
+from goals.cache import response_cache
+from goals.models import Goal, GoalCategory, GoalImport
+from goals.serializers import GoalBatchItemSerializer
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+# Поля записи, которые передаются в GoalCreateSerializer (категория подставляется по названию)
+GOAL_FIELDS = ('title', 'description', 'status', 'priority', 'due_date')
+
+
+def read_records(stream: IO[str], import_format: str) -> Iterator[dict]:
+    """Записи из CSV (строка заголовка) или NDJSON (объект на строку, пустые строки пропускаются)"""
+    if import_format == 'csv':
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f'Expected a JSON object per line, got: {line.strip()[:80]}')
+            yield record
+
+
+def batched(records: Iterable, size: int) -> Iterator[list]:
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+@dataclass
+class ImportResult:
+    position: int = 0
+    created: int = 0
+    failed: int = 0
+    # ошибки последней пачки: (номер записи, ошибки полей)
+    errors: list[tuple[int, dict]] = field(default_factory=list)
+
+
+class CategoryResolver:
+    """
+    Категории по названию (и названию доски) среди досок пользователя.
+
+    Неизвестные названия пачки загружаются одним запросом и запоминаются,
+    включая отсутствующие, поэтому повторяющиеся категории стоят один запрос
+    на весь импорт.
+    """
+
+    def __init__(self, user: User) -> None:
+        self.user = user
+        self.by_title: dict[str, list[GoalCategory]] = {}
+
+    def load(self, titles: Iterable[str]) -> None:
+        missing = set(titles) - self.by_title.keys()
+        if not missing:
+            return
+        for title in missing:
+            self.by_title[title] = []
+        categories = (
+            GoalCategory.objects.select_related('board')
+            .filter(board__participants__user=self.user, board__is_deleted=False, title__in=missing)
+            .order_by('id')
+        )
+        for category in categories:
+            self.by_title[category.title].append(category)
+
+    def resolve(self, title: str, board: str | None) -> GoalCategory | str:
+        """Категория или текст ошибки"""
+        candidates = [
+            category for category in self.by_title.get(title, ())
+            if not board or category.board.title == board
+        ]
+        active = [category for category in candidates if not category.is_deleted]
+        # удалённая категория отдаётся сериализатору, чтобы ошибка была как у API
+        if len(active) == 1 or len(candidates) == 1:
+            return (active or candidates)[0]
+        if candidates:
+            return 'Several categories with this title, specify the board'
+        return 'Category not found'
+
+
+class GoalImporter:
+    """
+    Импорт целей пачками: чтение -> поиск категорий -> проверка -> bulk_create.
+
+    Каждая пачка записывается в своей транзакции. Если задано имя импорта,
+    в той же транзакции сохраняется число прочитанных записей (GoalImport),
+    и повторный запуск с тем же именем продолжает с первой незаписанной.
+    """
+
+    def __init__(self, user: User, batch_size: int = 1000, name: str | None = None) -> None:
+        self.user = user
+        self.batch_size = batch_size
+        self.name = name
+        self.categories = CategoryResolver(user)
+        # CurrentUserDefault и validate_category читают пользователя из request
+        self.context = {'request': SimpleNamespace(user=user), 'categories': {}}
+
+    def start_position(self) -> int:
+        if self.name is None:
+            return 0
+        checkpoint = GoalImport.objects.filter(name=self.name).first()
+        return checkpoint.position if checkpoint else 0
+
+    def run(self, records: Iterable[dict]) -> Iterator[ImportResult]:
+        """Результат после каждой записанной пачки"""
+        position = self.start_position()
+        result = ImportResult(position=position)
+        for batch in batched(islice(records, position, None), self.batch_size):
+            self.import_batch(batch, result)
+            yield result
+
+    def import_batch(self, batch: list[dict], result: ImportResult) -> None:
+        records = [
+            (number, record) for number, record in enumerate(batch, start=result.position + 1)
+            if record.get('type', 'goal') == 'goal'
+        ]
+        self.categories.load(self.category_title(record) for _, record in records)
+
+        goals, touched_categories = [], set()
+        result.errors = []
+        for number, record in records:
+            goal, errors = self.validate(record)
+            if goal is None:
+                result.errors.append((number, errors))
+            else:
+                goals.append(goal)
+                touched_categories.add(goal.category_id)
+
+        with transaction.atomic():
+            Goal.objects.bulk_create(goals, batch_size=self.batch_size)
+            if self.name is not None:
+                GoalImport.objects.update_or_create(
+                    name=self.name, defaults={'position': result.position + len(batch)}
+                )
+            if touched_categories:
+                response_cache.bump_participants(board__categories__in=touched_categories)
+        result.position += len(batch)
+        result.created += len(goals)
+        result.failed += len(result.errors)
+
+    @staticmethod
+    def category_title(record: dict) -> str:
+        # category_title — колонка выгрузки доски (goals.export), category там — id
+        return str(record.get('category_title') or record.get('category') or '')
+
+    def validate(self, record: dict) -> tuple[Goal | None, dict]:
+        category = self.categories.resolve(self.category_title(record), record.get('board'))
+        if isinstance(category, str):
+            return None, {'category': [category]}
+
+        # пустые ячейки CSV означают значение по умолчанию
+        data = {name: record[name] for name in GOAL_FIELDS if record.get(name) not in (None, '')}
+        data['category'] = category.id
+        self.context['categories'] = {category.id: category}
+        serializer = GoalBatchItemSerializer(data=data, context=self.context)
+        try:
+            if not serializer.is_valid():
+                return None, serializer.errors
+        except PermissionDenied as error:
+            return None, {'category': [error.detail]}
+        return Goal(**serializer.validated_data), {}
@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.core.management import BaseCommand
+
+from goals import cascade
+
+
+class Command(BaseCommand):
+    """Завершение каскадного архивирования удалённых досок и категорий"""
+    help = (
+        'Архивирует цели и категории удалённых досок и цели удалённых категорий пачками. '
+        'Нужна после прерванного удаления или потерянной задачи архивирования; повторный запуск безопасен.'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--batch-size', type=int, help='Строк в одной транзакции (по умолчанию CASCADE_BATCH_SIZE)')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total = 0
+        for label, progress in cascade.pending(options['batch_size']):
+            archived = 0
+            for archived in progress:
+                self.stdout.write(f'{label}: {archived} rows archived')
+            total += archived
+        self.stdout.write(self.style.SUCCESS(f'Done: {total} rows archived'))
@@ -0,0 +1,68 @@
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management import BaseCommand, CommandError
+
+from core.models import User
+from goals.importer import IMPORT_FORMATS, GoalImporter, read_records
+
+
+class Command(BaseCommand):
+    """Импорт целей из CSV или NDJSON"""
+    help = (
+        'Импорт целей из CSV или NDJSON (файл или stdin). Категория ищется по названию '
+        '(колонка category_title или category) и, если указана, по названию доски (board).'
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('path', nargs='?', default='-', help='Файл с целями, "-" — stdin')
+        parser.add_argument('--user', required=True, help='Username автора целей')
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS, dest='import_format',
+            help='Формат записей (по умолчанию по расширению файла, для stdin — ndjson)',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000, help='Записей в одной транзакции')
+        parser.add_argument(
+            '--name', help='Имя импорта: позиция сохраняется после каждой пачки, повторный запуск продолжает с неё',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User {options["user"]} not found')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        path = options['path']
+        import_format = options['import_format']
+        if import_format is None:
+            import_format = 'csv' if Path(path).suffix.lower() == '.csv' else 'ndjson'
+
+        importer = GoalImporter(user, batch_size=options['batch_size'], name=options['name'])
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8-sig')
+        started = time.monotonic()
+        result = None
+        try:
+            for result in importer.run(read_records(stream, import_format)):
+                for number, errors in result.errors:
+                    self.stderr.write(f'record {number}: {errors}')
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f'{result.position} records read, {result.created} goals created, '
+                    f'{result.failed} failed ({result.created / elapsed if elapsed else 0:.0f} goals/s)'
+                )
+        except ValueError as error:
+            # битая строка NDJSON: записанные пачки остаются, --name продолжит с последней
+            position = result.position if result else importer.start_position()
+            raise CommandError(f'Invalid input after record {position}: {error}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        if result is None:
+            self.stdout.write('Nothing to import')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Done: {result.created} goals created, {result.failed} failed'))
@@ -0,0 +1,33 @@
+# Generated by Django 4.0.1 on 2026-10-18 04:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0010_alter_board_title'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['user', 'title', 'id'], name='goal_user_title_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(condition=models.Q(('status', 4), _negated=True), fields=['user', 'created', 'id'], name='goal_user_created_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'title', 'id'], name='category_user_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcategory',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'created', 'id'], name='category_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goalcomment',
+            index=models.Index(fields=['user', '-created', '-id'], name='comment_user_created_idx'),
+        ),
+    ]
@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def check_constraints(schema_editor):
+    # Отложенные проверки FK должны выполниться до удаления таблицы в той же транзакции
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+
+
+def copy_participants(apps, schema_editor):
+    # Участники были наследниками Board (multi-table): у каждой записи есть
+    # «своя» строка в goals_board. Переносим участников в отдельную таблицу,
+    # затем удаляем служебные строки досок, на которые ничего не ссылается.
+    Board = apps.get_model('goals', 'Board')
+    GoalCategory = apps.get_model('goals', 'GoalCategory')
+    OldParticipant = apps.get_model('goals', 'BoardParticipant')
+    NewParticipant = apps.get_model('goals', 'NewBoardParticipant')
+    db_alias = schema_editor.connection.alias
+
+    old_participants = OldParticipant.objects.using(db_alias).values_list(
+        'board_ptr_id', 'board_id', 'user_id', 'role', 'created', 'updated'
+    )
+    ptr_ids = []
+    batch = []
+    for ptr_id, board_id, user_id, role, created, updated in old_participants.iterator(chunk_size=2000):
+        ptr_ids.append(ptr_id)
+        batch.append(NewParticipant(
+            board_id=board_id, user_id=user_id, role=role, created=created, updated=updated
+        ))
+        if len(batch) >= 2000:
+            NewParticipant.objects.using(db_alias).bulk_create(batch)
+            batch = []
+    NewParticipant.objects.using(db_alias).bulk_create(batch)
+
+    schema_editor.execute(f'DELETE FROM {schema_editor.quote_name(OldParticipant._meta.db_table)}')
+
+    orphan_boards = (
+        Board.objects.using(db_alias)
+        .filter(id__in=ptr_ids)
+        .exclude(id__in=GoalCategory.objects.using(db_alias).values('board_id'))
+        .exclude(id__in=NewParticipant.objects.using(db_alias).values('board_id'))
+    )
+    orphan_boards.delete()
+    check_constraints(schema_editor)
+
+
+def restore_participants(apps, schema_editor):
+    OldParticipant = apps.get_model('goals', 'BoardParticipant')
+    NewParticipant = apps.get_model('goals', 'NewBoardParticipant')
+    db_alias = schema_editor.connection.alias
+
+    for participant in NewParticipant.objects.using(db_alias).iterator(chunk_size=2000):
+        OldParticipant.objects.using(db_alias).create(
+            board_id=participant.board_id,
+            user_id=participant.user_id,
+            role=participant.role,
+            created=participant.created,
+            updated=participant.updated,
+        )
+    check_constraints(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('goals', '0011_goal_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewBoardParticipant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateField(blank=True, null=True, verbose_name='Дата создания')),
+                ('updated', models.DateField(blank=True, null=True, verbose_name='Дата последнего обновления')),
+                ('role', models.PositiveSmallIntegerField(choices=[(1, 'Владелец'), (2, 'Редактор'), (3, 'Читатель')], default=1, verbose_name='Роль')),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='goals.board', verbose_name='Доска')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'unique_together': {('board', 'user')},
+            },
+        ),
+        migrations.RunPython(copy_participants, restore_participants),
+        migrations.DeleteModel(
+            name='BoardParticipant',
+        ),
+        migrations.RenameModel(
+            old_name='NewBoardParticipant',
+            new_name='BoardParticipant',
+        ),
+        migrations.AlterModelOptions(
+            name='boardparticipant',
+            options={'verbose_name': 'Участник', 'verbose_name_plural': 'Участники'},
+        ),
+        migrations.AlterField(
+            model_name='boardparticipant',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='participants', to='goals.board', verbose_name='Доска'),
+        ),
+        migrations.AlterField(
+            model_name='boardparticipant',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='participants', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+    ]
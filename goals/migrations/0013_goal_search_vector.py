@@ -0,0 +1,72 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# search_vector поддерживается триггером: title и description индексируются
+# в русской и английской конфигурациях, заголовок весит больше описания.
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('pg_catalog.russian', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('pg_catalog.russian', coalesce({row}description, '')), 'B') ||
+    setweight(to_tsvector('pg_catalog.english', coalesce({row}description, '')), 'B')
+"""
+
+CREATE_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION goals_goal_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {SEARCH_VECTOR_SQL.format(row='NEW.')};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER goals_goal_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, description, search_vector ON goals_goal
+    FOR EACH ROW EXECUTE FUNCTION goals_goal_search_vector_update();
+
+UPDATE goals_goal SET search_vector = {SEARCH_VECTOR_SQL.format(row='')};
+"""
+
+DROP_TRIGGER_SQL = """
+DROP TRIGGER IF EXISTS goals_goal_search_vector_trigger ON goals_goal;
+DROP FUNCTION IF EXISTS goals_goal_search_vector_update();
+"""
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='goal_search_vector_idx')
+
+
+def create_search_index(apps, schema_editor):
+    # Триггер и GIN-индекс есть только в PostgreSQL, на остальных БД поиск работает через ILIKE
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(CREATE_TRIGGER_SQL)
+    schema_editor.add_index(apps.get_model('goals', 'Goal'), SEARCH_INDEX)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.remove_index(apps.get_model('goals', 'Goal'), SEARCH_INDEX)
+    schema_editor.execute(DROP_TRIGGER_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0012_boardparticipant_standalone'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='goal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='goal', index=SEARCH_INDEX),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_index, drop_search_index),
+            ],
+        ),
+    ]
@@ -0,0 +1,51 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+TRIGRAM_INDEXES = {
+    'Board': django.contrib.postgres.indexes.GinIndex(
+        fields=['title'], name='board_title_trgm_idx', opclasses=['gin_trgm_ops']
+    ),
+    'GoalCategory': django.contrib.postgres.indexes.GinIndex(
+        fields=['title'], name='category_title_trgm_idx', opclasses=['gin_trgm_ops']
+    ),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm входит в contrib и может отсутствовать в сборке PostgreSQL:
+    # тогда индексы не создаются, а поиск работает через ILIKE
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for model_name, index in TRIGRAM_INDEXES.items():
+        schema_editor.add_index(apps.get_model('goals', model_name), index)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index in TRIGRAM_INDEXES.values():
+        schema_editor.execute(f'DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0013_goal_search_vector'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name='board', index=TRIGRAM_INDEXES['Board']),
+                migrations.AddIndex(model_name='goalcategory', index=TRIGRAM_INDEXES['GoalCategory']),
+            ],
+            database_operations=[
+                migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+            ],
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.0.1 on 2026-10-18 04:39
+
+from django.db import migrations, models
+
+# created был auto_now, а updated — auto_now_add: в created лежит время последнего
+# изменения, в updated — время создания. Правые части UPDATE берутся из старой
+# строки, поэтому запрос меняет значения местами и сам себе обратный.
+SWAP_SQL = """
+UPDATE goals_goal SET created = updated, updated = created;
+UPDATE goals_goalcomment SET created = updated, updated = created;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0014_trigram_title_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(SWAP_SQL, SWAP_SQL),
+        migrations.AlterField(
+            model_name='goal',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата создания'),
+        ),
+        migrations.AlterField(
+            model_name='goal',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления'),
+        ),
+        migrations.AlterField(
+            model_name='goalcomment',
+            name='created',
+            field=models.DateTimeField(auto_now_add=True, verbose_name='Дата создания'),
+        ),
+        migrations.AlterField(
+            model_name='goalcomment',
+            name='updated',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата последнего обновления'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.0.1 on 2026-10-18 04:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('goals', '0015_fix_created_updated'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GoalImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
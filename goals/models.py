@@ -1,4 +1,7 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
 from core.models import User
 
@@ -33,13 +36,17 @@ class Board(BaseModel):
     class Meta:
         verbose_name = "Доска"
         verbose_name_plural = "Доски"
+        indexes = [
+            # нечёткий поиск по названию (TrigramSearchFilter)
+            GinIndex(fields=['title'], name='board_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         return self.title
 
 
-class BoardParticipant(Board):
-    """Доски для пользователей"""
+class BoardParticipant(BaseModel):
+    """Участник доски"""
     class Meta:
         unique_together = ("board", "user")
         verbose_name = "Участник"
@@ -76,6 +83,21 @@ class GoalCategory(BaseModel):
     class Meta:
         verbose_name = "Категория"
         verbose_name_plural = "Категории"
+        indexes = [
+            # GoalCategoryListView: user + is_deleted=False, сортировка по title/created
+            models.Index(
+                fields=['user', 'title', 'id'],
+                name='category_user_title_idx',
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['user', 'created', 'id'],
+                name='category_user_created_idx',
+                condition=Q(is_deleted=False),
+            ),
+            # нечёткий поиск по названию (TrigramSearchFilter)
+            GinIndex(fields=['title'], name='category_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
 
     board = models.ForeignKey(
         Board, verbose_name="Доска", on_delete=models.PROTECT, related_name="categories"
@@ -92,6 +114,21 @@ class Goal(BaseModel):
     class Meta:
         verbose_name = 'Цель'
         verbose_name_plural = 'Цели'
+        indexes = [
+            # GoalListView/GoalView: user + status != archived (4), сортировка по title/created
+            models.Index(
+                fields=['user', 'title', 'id'],
+                name='goal_user_title_active_idx',
+                condition=~Q(status=4),
+            ),
+            models.Index(
+                fields=['user', 'created', 'id'],
+                name='goal_user_created_active_idx',
+                condition=~Q(status=4),
+            ),
+            # полнотекстовый поиск (GoalSearchFilter), search_vector заполняется триггером
+            GinIndex(fields=['search_vector'], name='goal_search_vector_idx'),
+        ]
 
     class Status(models.IntegerChoices):
         to_do = 1, 'К выполнению'
@@ -118,10 +155,11 @@ class Goal(BaseModel):
     priority = models.PositiveSmallIntegerField(
         choices=Priority.choices, default=Priority.medium
     )
-    created = models.DateTimeField(verbose_name='Дата создания', auto_now=True)
+    created = models.DateTimeField(verbose_name='Дата создания', auto_now_add=True)
     updated = models.DateTimeField(
-        verbose_name='Дата последнего обновления', auto_now_add=True
+        verbose_name='Дата последнего обновления', auto_now=True
     )
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def __str__(self) -> str:
         return self.title
@@ -131,11 +169,25 @@ class GoalComment(models.Model):
     class Meta:
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            # GoalCommentListView: user, сортировка по -created (фильтр по goal покрывает индекс FK)
+            models.Index(fields=['user', '-created', '-id'], name='comment_user_created_idx'),
+        ]
 
     user = models.ForeignKey('core.User', on_delete=models.CASCADE)
-    created = models.DateTimeField(verbose_name='Дата создания', auto_now=True)
+    created = models.DateTimeField(verbose_name='Дата создания', auto_now_add=True)
     updated = models.DateTimeField(
-        verbose_name='Дата последнего обновления', auto_now_add=True
+        verbose_name='Дата последнего обновления', auto_now=True
     )
     text = models.TextField()
     goal = models.ForeignKey('goals.Goal', on_delete=models.CASCADE)
+
+
+class GoalImport(models.Model):
+    """Позиция импорта целей (manage.py import_goals --name) для продолжения после сбоя"""
+    name = models.CharField(max_length=255, unique=True)
+    position = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.name
@@ -0,0 +1,216 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import F, Field, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination, _positive_int
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Постраничный вывод по ключу сортировки (keyset).
+
+    Курсор хранит значения полей сортировки последней записи страницы и id
+    для разрешения совпадений, поэтому следующая страница выбирается условием
+    WHERE по индексу, без COUNT(*) и OFFSET.
+    """
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    default_limit = 100
+    max_limit = 1000
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.query = queryset.query
+
+        position, reverse = self.decode_cursor(request)
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+        queryset = queryset.order_by(*self._order_expressions(ordering))
+
+        rows = list(queryset[:self.limit + 1])
+        has_more = len(rows) > self.limit
+        rows = rows[:self.limit]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self._position(rows[-1])
+            if position is not None and (has_more or not reverse):
+                self.previous_position = self._position(rows[0])
+        return rows
+
+    def get_paginated_response(self, data: list) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True},
+                'previous': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self) -> str | None:
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_limit(self, request: Request) -> int:
+        try:
+            return _positive_int(
+                request.query_params[self.limit_query_param], strict=True, cutoff=self.max_limit
+            )
+        except (KeyError, ValueError):
+            return self.default_limit
+
+    def get_ordering(self, queryset: QuerySet, view) -> tuple[str, ...]:
+        """Сортировка, выставленная OrderingFilter, с id в конце для однозначности"""
+        ordering = tuple(queryset.query.order_by) or tuple(getattr(view, 'ordering', None) or ())
+        fields = [field.lstrip('-') for field in ordering]
+        if self.tie_breaker not in fields and 'pk' not in fields:
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering += (f'-{self.tie_breaker}' if descending else self.tie_breaker,)
+        return ordering
+
+    def decode_cursor(self, request: Request) -> tuple[list | None, bool]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position, reverse, ordering = cursor['p'], bool(cursor['r']), tuple(cursor['o'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if ordering != self.ordering or not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return self._parse_position(position), reverse
+
+    def _parse_position(self, position: list) -> list:
+        """Значения курсора от клиента, приведённые к типам полей сортировки"""
+        parsed = []
+        for field, value in zip(self.ordering, position):
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                parsed.append(self._field(field.lstrip('-')).to_python(value))
+            except (DjangoValidationError, FieldDoesNotExist):
+                raise NotFound(self.invalid_cursor_message)
+        return parsed
+
+    def _field(self, name: str) -> Field:
+        """Поле модели или выходное поле аннотации (rank поиска)"""
+        if name in self.query.annotations:
+            return self.query.annotations[name].output_field
+        return self.query.model._meta.get_field(name)
+
+    def encode_cursor(self, position: list, reverse: bool) -> str:
+        cursor = {'p': position, 'r': int(reverse), 'o': self.ordering}
+        encoded = urlsafe_b64encode(json.dumps(cursor, separators=(',', ':')).encode()).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _position(self, instance) -> list:
+        position = []
+        for field in self.ordering:
+            # строки из values() (ValuesListMixin) приходят словарями
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            if isinstance(value, date):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    @staticmethod
+    def _invert(ordering: tuple[str, ...]) -> tuple[str, ...]:
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def _order_expressions(ordering: tuple[str, ...]) -> list:
+        # NULL считается наименьшим значением в обоих направлениях,
+        # чтобы условие курсора совпадало с порядком выдачи
+        return [
+            F(field[1:]).desc(nulls_last=True) if field.startswith('-')
+            else F(field).asc(nulls_first=True)
+            for field in ordering
+        ]
+
+    @staticmethod
+    def _after(ordering: tuple[str, ...], position: list) -> Q:
+        """Условие «строго после позиции» для составного ключа сортировки"""
+        condition = Q(pk__in=[])
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            if field.startswith('-'):
+                greater = Q(pk__in=[]) if value is None else (
+                    Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+                )
+            else:
+                greater = Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__gt': value})
+            condition |= equal & greater
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return condition
+
+
+class ListPagination(LimitOffsetPagination):
+    """
+    Пагинация списков: limit/offset по умолчанию, keyset по запросу.
+
+    Режим выбирается параметром ``?pagination=keyset`` (или наличием ``cursor``),
+    либо настройкой LIST_PAGINATION_MODE. known_count — уже посчитанное число
+    строк списка (ConditionalListMixin), тогда COUNT(*) не выполняется.
+    """
+    mode_query_param = 'pagination'
+    keyset_class = KeysetPagination
+    known_count: int | None = None
+
+    def get_count(self, queryset: QuerySet) -> int:
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+    def paginate_queryset(self, queryset: QuerySet, request: Request, view=None) -> list | None:
+        self.keyset = self.keyset_class() if self.use_keyset(request) else None
+        if self.keyset is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def use_keyset(self, request: Request) -> bool:
+        if self.keyset_class.cursor_query_param in request.query_params:
+            return True
+        mode = request.query_params.get(self.mode_query_param, settings.LIST_PAGINATION_MODE)
+        return mode == 'keyset'
+
+    def get_paginated_response(self, data: list) -> Response:
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
@@ -1,31 +1,89 @@
-from typing import Any
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
 from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 from rest_framework.request import Request
 from goals.models import GoalCategory, Goal, Board, BoardParticipant
 
 
+class BoardRolesCache:
+    """Процессный LRU-кэш ролей пользователей на досках (user_id -> {board_id: role})"""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data: OrderedDict[int, dict[int, int]] = OrderedDict()
+        self._lock = Lock()
+        self._generation = 0
+
+    def get(self, user_id: int) -> dict[int, int]:
+        if self.maxsize <= 0:
+            return self.load(user_id)
+
+        with self._lock:
+            if user_id in self._data:
+                self._data.move_to_end(user_id)
+                return self._data[user_id]
+            generation = self._generation
+
+        roles = self.load(user_id)
+        with self._lock:
+            # роли, прочитанные до инвалидации, могут быть устаревшими
+            if generation != self._generation:
+                return roles
+            self._data[user_id] = roles
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return roles
+
+    def invalidate(self, *user_ids: int) -> None:
+        with self._lock:
+            self._generation += 1
+            for user_id in user_ids:
+                self._data.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    @staticmethod
+    def load(user_id: int) -> dict[int, int]:
+        return dict(BoardParticipant.objects.filter(user_id=user_id).values_list('board_id', 'role'))
+
+
+board_roles_cache = BoardRolesCache(maxsize=settings.BOARD_ROLES_CACHE_SIZE)
+
+
+def get_board_roles(request: Request) -> dict[int, int]:
+    """Роли пользователя на досках: одним запросом и не чаще раза за HTTP-запрос"""
+    roles = getattr(request, '_board_roles', None)
+    if roles is None:
+        roles = board_roles_cache.get(request.user.id)
+        request._board_roles = roles
+    return roles
+
+
+def has_board_role(request: Request, board_id: int, roles: tuple[int, ...]) -> bool:
+    role = get_board_roles(request).get(board_id)
+    if role is None:
+        return False
+    return request.method in SAFE_METHODS or role in roles
+
+
 class BoardPermissions(IsAuthenticated):
 
     def has_object_permission(self, request: Request, view, obj: Board) -> bool:
-        _filters: dict[str: Any] = {'user_id': request.user.id, 'board_id': obj.id}
-        if request.method not in SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
-
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return has_board_role(request, obj.id, (BoardParticipant.Role.owner,))
 
 
 class GoalCategoryPermissions(IsAuthenticated):
     def has_object_permission(self, request: Request, view, goal_category: GoalCategory) -> bool:
-        _filters: dict[str: Any] = {'user_id': request.user.id, 'board_id': goal_category.board_id}
-        if request.method not in SAFE_METHODS:
-            _filters['role'] = BoardParticipant.Role.owner
-
-        return BoardParticipant.objects.filter(**_filters).exists()
+        return has_board_role(request, goal_category.board_id, (BoardParticipant.Role.owner,))
 
 
 class GoalBoardPermissions(IsAuthenticated):
     def has_object_permission(self, request: Request, view, obj: Goal) -> bool:
-        _filters: dict[str: Any] = {'user': request.user.id, 'board': obj.category.board}
-        if request.method not in SAFE_METHODS:
-            _filters['role__in'] = [BoardParticipant.Role.owner, BoardParticipant.Role.writer]
-        return BoardParticipant.objects.filter(**_filters).exists()
\ No newline at end of file
+        return has_board_role(
+            request, obj.category.board_id, (BoardParticipant.Role.owner, BoardParticipant.Role.writer)
+        )
@@ -0,0 +1,142 @@
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Поля, чьё to_representation возвращает значение из БД без изменений
+IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+)
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def datetime_converter(field: serializers.DateTimeField) -> Callable[[Any], Any]:
+    """DateTimeField.to_representation для ISO 8601 с заранее вычисленной зоной"""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if not timezone.is_aware(value):
+            return field.to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return convert
+
+
+def field_converter(field: serializers.Field) -> Callable[[Any], Any] | None:
+    """Преобразование значения из values() в представление поля; None — значение как есть"""
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    if isinstance(field, IDENTITY_FIELDS):
+        return None
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return date.isoformat
+        return field.to_representation
+    raise UnsupportedField(field)
+
+
+class ValuesReader:
+    """
+    Представление строк queryset.values() в том же виде, что и у сериализатора.
+
+    Поля сериализатора разбираются один раз: для каждого запоминаются ключ,
+    lookup в values() и функция преобразования. Вывод совпадает с
+    Serializer(many=True).data, но без создания моделей и обхода полей DRF.
+    """
+
+    def __init__(self, serializer: serializers.Serializer) -> None:
+        self.lookups: list[str] = []
+        self.accessors = self._compile(serializer, prefix='')
+
+    def _compile(self, serializer: serializers.Serializer, prefix: str) -> list[tuple]:
+        accessors = []
+        for field in serializer._readable_fields:
+            if field.source == '*':
+                raise UnsupportedField(field)
+            lookup = prefix + '__'.join(field.source_attrs)
+            self.lookups.append(lookup)
+            if isinstance(field, serializers.BaseSerializer):
+                if isinstance(field, serializers.ListSerializer):
+                    raise UnsupportedField(field)
+                # значение lookup вложенного сериализатора — id связи, None означает null
+                accessors.append((field.field_name, lookup, None, self._compile(field, prefix=f'{lookup}__')))
+            else:
+                accessors.append((field.field_name, lookup, field_converter(field), None))
+        return accessors
+
+    def values(self, queryset: QuerySet) -> QuerySet:
+        """queryset.values() с полями сериализатора и полями сортировки (нужны keyset-курсору)"""
+        ordering = [name.lstrip('-') for name in queryset.query.order_by if isinstance(name, str)]
+        extra = [name for name in dict.fromkeys([*ordering, 'id']) if name not in self.lookups]
+        return queryset.values(*dict.fromkeys(self.lookups), *extra)
+
+    def represent(self, rows) -> list[dict]:
+        accessors = self.accessors
+        return [self._build(row, accessors) for row in rows]
+
+    def _build(self, row: dict, accessors: list[tuple]) -> dict:
+        result = {}
+        for key, lookup, convert, nested in accessors:
+            value = row[lookup]
+            if value is None:
+                result[key] = None
+            elif nested is not None:
+                result[key] = self._build(row, nested)
+            elif convert is None:
+                result[key] = value
+            else:
+                result[key] = convert(value)
+        return result
+
+
+@lru_cache(maxsize=None)
+def get_reader(serializer_class: type[serializers.Serializer]) -> ValuesReader | None:
+    """ValuesReader сериализатора или None, если у него есть поля, которые так не прочитать"""
+    try:
+        return ValuesReader(serializer_class())
+    except UnsupportedField:
+        return None
+
+
+class ValuesListMixin:
+    """
+    Быстрый путь ListAPIView: строки читаются через values() и ValuesReader.
+
+    Выключается настройкой LIST_VALUES_READER; сериализаторы с
+    неподдерживаемыми полями работают через обычный путь.
+    """
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        reader = get_reader(self.get_serializer_class()) if settings.LIST_VALUES_READER else None
+        if reader is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(reader.represent(page))
+        return Response(reader.represent(queryset))
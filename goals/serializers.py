@@ -3,9 +3,13 @@ from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from core.models import User
 from core.serializers import ProfileSerializer
+from goals.cache import response_cache
+from goals.export import EXPORT_FORMATS
 from goals.models import GoalCategory, Goal, GoalComment, Board, BoardParticipant
+from goals.permissions import board_roles_cache
 
 
 class BoardCreateSerializer(serializers.ModelSerializer):
@@ -16,11 +20,37 @@ class BoardCreateSerializer(serializers.ModelSerializer):
         read_only_fields = ('id', 'created', 'updated', 'is_deleted')
 
 
+class UsernameRelatedField(serializers.SlugRelatedField):
+    """Пользователь по username с поиском в заранее загруженном словаре"""
+    users: dict[str, User] | None = None
+
+    def to_internal_value(self, data):
+        if self.users is None:
+            return super().to_internal_value(data)
+        try:
+            return self.users[data]
+        except (KeyError, TypeError):
+            self.fail('does_not_exist', slug_name=self.slug_field, value=str(data))
+
+
+class BoardParticipantListSerializer(serializers.ListSerializer):
+    """Список участников: все пользователи загружаются одним запросом"""
+
+    def to_internal_value(self, data):
+        if isinstance(data, list):
+            usernames = {
+                item.get("user") for item in data
+                if isinstance(item, dict) and isinstance(item.get("user"), str)
+            }
+            self.child.fields["user"].users = User.objects.in_bulk(list(usernames), field_name="username")
+        return super().to_internal_value(data)
+
+
 class BoardParticipantsSerializer(serializers.ModelSerializer):
     """Доска для пользователей"""
     role = serializers.ChoiceField(required=True, choices=BoardParticipant.editable_roles)
 
-    user = serializers.SlugRelatedField(
+    user = UsernameRelatedField(
         slug_field="username", queryset=User.objects.all()
     )
 
@@ -30,6 +60,7 @@ class BoardParticipantsSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BoardParticipant
+        list_serializer_class = BoardParticipantListSerializer
         fields = "__all__"
         real_only_fields = (
             "id",
@@ -54,35 +85,54 @@ class BoardSerializer(serializers.ModelSerializer):
 
     def update(self, instance: Board, validated_data) -> Board:
         user = self.context.get("request").user
-        new_participants = {
-            participant["user"].id: participant
+        new_roles = {
+            participant["user"].id: participant["role"]
             for participant in validated_data.pop("participants")
             if participant["user"] != user
         }
 
-        old_participants = instance.participants.exclude(user=user)
-
         with transaction.atomic():
-            for old_participant in old_participants:
-                if old_participant.user.id not in new_participants:
-                    old_participant.delete()
-
-                else:
-                    new_role = new_participants[old_participant.user.id]["role"]
-                    if old_participant.role != new_role:
-                        old_participant.role = new_role
-                        old_participant.save()
-                    del new_participants[old_participant.user.id]
-
-            [
-                BoardParticipant.objects.create(board=instance, **data)
-                for data in new_participants.values()
-            ]
+            old_participants = {
+                participant.user_id: participant
+                for participant in instance.participants.exclude(user=user)
+            }
+
+            removed = old_participants.keys() - new_roles.keys()
+            if removed:
+                instance.participants.filter(user_id__in=removed).delete()
+
+            # bulk-операции не вызывают save() и сигналы: даты, кэш ролей и кэш ответов обновляем сами
+            today = timezone.now().date()
+            changed = []
+            for user_id, participant in old_participants.items():
+                if user_id in new_roles and participant.role != new_roles[user_id]:
+                    participant.role = new_roles[user_id]
+                    participant.updated = today
+                    changed.append(participant)
+            if changed:
+                BoardParticipant.objects.bulk_update(changed, ["role", "updated"])
+
+            added = new_roles.keys() - old_participants.keys()
+            if added:
+                BoardParticipant.objects.bulk_create(
+                    BoardParticipant(
+                        board=instance, user_id=user_id, role=new_roles[user_id], created=today, updated=today
+                    )
+                    for user_id in added
+                )
+
+            board_roles_cache.invalidate(*(participant.user_id for participant in changed), *added)
+            response_cache.bump(*added)
+
             instance.title = validated_data.get("title")
             instance.save()
 
         return instance
 
+    def to_representation(self, instance: Board) -> dict:
+        prefetch_related_objects([instance], "participants__user")
+        return super().to_representation(instance)
+
 
 class BoardListSerializer(serializers.ModelSerializer):
     """Отображение всех досок"""
@@ -123,7 +173,7 @@ class GoalCreateSerializer(serializers.ModelSerializer):
             'updated',
             'user',
         )
-        fields = '__all__'
+        exclude = ('search_vector',)
 
     def validate_category(self, value: GoalCategory) -> GoalCategory:
         if value.is_deleted:
@@ -148,6 +198,7 @@ class GoalSerializer(GoalCreateSerializer):
 class GoalCommentCreateSerializer(serializers.ModelSerializer):
     """Создание комментариев"""
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    goal = serializers.PrimaryKeyRelatedField(queryset=Goal.objects.select_related('category'))
 
     class Meta:
         model = GoalComment
@@ -155,7 +206,8 @@ class GoalCommentCreateSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def validate_goal(self, value: Goal) -> Goal:
-        if value.status == Goal.Status.archived:
+        # цели удалённой категории или доски архивируются задачей позже, но скрыты сразу
+        if value.status == Goal.Status.archived or value.category.is_deleted:
             raise ValidationError('Goal not found')
 
         if self.context['request'].user.id != value.user_id:
@@ -169,3 +221,143 @@ class GoalCommentSerializer(GoalCommentCreateSerializer):
     goal = serializers.PrimaryKeyRelatedField(read_only=True)
 
 
+
+
+class CategoryRelatedField(serializers.PrimaryKeyRelatedField):
+    """Категория по id с поиском в заранее загруженном словаре context['categories']"""
+
+    def to_internal_value(self, data):
+        categories = self.context.get('categories')
+        if categories is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return categories[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+
+class GoalBatchItemSerializer(GoalCreateSerializer):
+    """Цель из пакета: проверки как у GoalCreateSerializer, категории без запроса на каждую"""
+    category = CategoryRelatedField(queryset=GoalCategory.objects.all())
+
+
+class GoalBatchSerializer(serializers.Serializer):
+    """
+    Пакет операций над целями: create, update (частичное) и archive.
+
+    Категории и изменяемые цели загружаются одним запросом каждые, запись —
+    bulk_create/bulk_update в одной транзакции. Ошибка в элементе не отменяет
+    остальные: результат возвращается для каждого элемента со статусом
+    как у одиночных запросов (201, 200, 204, 400, 403, 404).
+    """
+    max_items = 1000
+
+    def get_fields(self) -> dict:
+        # Имена create и update заняты методами сериализатора, поэтому поля не объявлены атрибутами
+        return {
+            'create': serializers.ListField(child=serializers.DictField(), required=False, default=list),
+            'update': serializers.ListField(child=serializers.DictField(), required=False, default=list),
+            'archive': serializers.ListField(child=serializers.IntegerField(), required=False, default=list),
+        }
+
+    def validate(self, attrs: dict) -> dict:
+        if sum(len(items) for items in attrs.values()) > self.max_items:
+            raise ValidationError(f'No more than {self.max_items} items per batch')
+        return attrs
+
+    def create(self, validated_data: dict) -> dict:
+        user = self.context['request'].user
+        items = validated_data['create'] + validated_data['update']
+        category_ids = {self._parse_id(item.get('category')) for item in items} - {None}
+        context = {**self.context, 'categories': GoalCategory.objects.in_bulk(category_ids)}
+        update_ids = [self._parse_id(item.get('id')) for item in validated_data['update']]
+        goals = (
+            Goal.objects.filter(user=user, category__is_deleted=False)
+            .exclude(status=Goal.Status.archived)
+            .in_bulk({goal_id for goal_id in update_ids + validated_data['archive'] if goal_id is not None})
+        )
+
+        results = {'create': [], 'update': [], 'archive': []}
+        created, changed, fields, touched_categories = [], {}, {'updated'}, set()
+        now = timezone.now()
+
+        for item in validated_data['create']:
+            result, data = self._validate_item(None, GoalBatchItemSerializer(data=item, context=context))
+            if data is not None:
+                goal = Goal(**data, created=now, updated=now)
+                created.append((goal, result))
+                touched_categories.add(goal.category_id)
+            results['create'].append(result)
+
+        for item, goal_id in zip(validated_data['update'], update_ids):
+            goal = goals.get(goal_id)
+            if goal is None:
+                results['update'].append({'id': item.get('id'), 'status': 404})
+                continue
+            result, data = self._validate_item(
+                goal.id, GoalBatchItemSerializer(goal, data=item, partial=True, context=context)
+            )
+            if data is not None:
+                # при переносе цели кэш сбрасывается и у старой, и у новой доски
+                touched_categories.add(goal.category_id)
+                for field, value in data.items():
+                    setattr(goal, field, value)
+                fields.update(data)
+                changed[goal.id] = goal
+                touched_categories.add(goal.category_id)
+            results['update'].append(result)
+
+        for goal_id in validated_data['archive']:
+            goal = goals.get(goal_id)
+            if goal is None:
+                results['archive'].append({'id': goal_id, 'status': 404})
+                continue
+            goal.status = Goal.Status.archived
+            fields.add('status')
+            changed[goal.id] = goal
+            touched_categories.add(goal.category_id)
+            results['archive'].append({'id': goal_id, 'status': 204})
+
+        with transaction.atomic():
+            # bulk-операции не вызывают save() и сигналы: updated и кэш ответов обновляем сами
+            if created:
+                Goal.objects.bulk_create([goal for goal, _ in created], batch_size=self.max_items)
+                for goal, result in created:
+                    result['id'] = goal.id
+            if changed:
+                for goal in changed.values():
+                    goal.updated = now
+                Goal.objects.bulk_update(changed.values(), sorted(fields), batch_size=self.max_items)
+            if touched_categories:
+                response_cache.bump_participants(board__categories__in=touched_categories)
+
+        return results
+
+    @staticmethod
+    def _parse_id(value) -> int | None:
+        """id из JSON элемента: число или строка из цифр, иначе None"""
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.isascii() and value.isdigit():
+            return int(value)
+        return None
+
+    @staticmethod
+    def _validate_item(goal_id: int | None, serializer: GoalBatchItemSerializer) -> tuple[dict, dict | None]:
+        """Результат элемента и проверенные данные (None при ошибке)"""
+        try:
+            if not serializer.is_valid():
+                return {'id': goal_id, 'status': 400, 'errors': serializer.errors}, None
+        except PermissionDenied as error:
+            return {'id': goal_id, 'status': 403, 'errors': {'detail': error.detail}}, None
+        return {'id': goal_id, 'status': 200 if serializer.instance else 201}, serializer.validated_data
+
+
+class BoardExportSerializer(serializers.Serializer):
+    """Параметры выгрузки доски из строки запроса"""
+    type = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default='ndjson')
+    comments = serializers.BooleanField(default=False)
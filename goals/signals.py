@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from goals.cache import response_cache
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.permissions import board_roles_cache
+
+
+@receiver([post_save, post_delete], sender=BoardParticipant)
+def invalidate_board_roles(sender, instance: BoardParticipant, **kwargs) -> None:
+    """Сброс закэшированных ролей участника при изменении состава доски"""
+    board_roles_cache.invalidate(instance.user_id)
+    response_cache.bump(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=Board)
+def invalidate_board_responses(sender, instance: Board, **kwargs) -> None:
+    """Доска видна в списках всех её участников"""
+    response_cache.bump_participants(board_id=instance.id)
+
+
+@receiver([post_save, post_delete], sender=GoalCategory)
+def invalidate_category_responses(sender, instance: GoalCategory, **kwargs) -> None:
+    """Удаление категории скрывает цели всех участников доски"""
+    response_cache.bump_participants(board_id=instance.board_id)
+
+
+@receiver([post_save, post_delete], sender=Goal)
+def invalidate_goal_responses(sender, instance: Goal, **kwargs) -> None:
+    """Архивная цель скрывает комментарии к ней у всех участников доски"""
+    response_cache.bump_participants(board__categories=instance.category_id)
+
+
+@receiver([post_save, post_delete], sender=GoalComment)
+def invalidate_comment_responses(sender, instance: GoalComment, **kwargs) -> None:
+    response_cache.bump(instance.user_id)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_responses(sender, instance, **kwargs) -> None:
+    """Профиль пользователя вложен в его категории, цели и комментарии"""
+    response_cache.bump(instance.id)
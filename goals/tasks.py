@@ -0,0 +1,15 @@
+from goals import cascade
+from goals.models import GoalCategory
+from jobs.queue import task
+
+
+@task('goals.archive_board')
+def archive_board(board_id: int) -> None:
+    cascade.run(cascade.archive_board(board_id), f'board {board_id}')
+
+
+@task('goals.archive_category')
+def archive_category(category_id: int) -> None:
+    category = GoalCategory.objects.filter(id=category_id).first()
+    if category is not None:
+        cascade.run(cascade.archive_category(category), f'category {category_id}')
@@ -6,6 +6,7 @@ urlpatterns = [
     path('board/create', views.BoardCreatedView.as_view(), name='create-board'),
     path('board/list', views.BoardListView.as_view(), name='board-list'),
     path('board/<int:pk>', views.BoardView.as_view(), name='board'),
+    path('board/<int:pk>/export', views.BoardExportView.as_view(), name='board-export'),
 
     #Категории
     path("goal_category/create", views.GoalCategoryCreateView.as_view(), name='create-category'),
@@ -13,6 +14,7 @@ urlpatterns = [
     path("goal_category/<int:pk>", views.GoalCategoryView.as_view(), name='goal-category'),
     #Цели
     path("goal/create", views.GoalCreateView.as_view(), name='create-goal'),
+    path("goal/batch", views.GoalBatchView.as_view(), name='goal-batch'),
     path("goal/list", views.GoalListView.as_view(), name='goal-list'),
     path("goal/<int:pk>", views.GoalView.as_view(), name='goal'),
     #Комментарии
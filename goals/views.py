@@ -1,15 +1,24 @@
-from django.db import transaction
+from typing import Any
+
 from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, filters
 from rest_framework import permissions
-from rest_framework.pagination import LimitOffsetPagination
-from goals.filters import GoalDateFilter
+from rest_framework.request import Request
+from rest_framework.response import Response
+from goals import cascade, tasks
+from goals.cache import CachedListMixin, CachedRetrieveMixin
+from goals.export import EXPORT_FORMATS, BoardExport
+from goals.conditional import ConditionalListMixin, ContentETagMixin, LastModifiedMixin
+from goals.filters import GoalDateFilter, GoalSearchFilter, TrigramSearchFilter
 from goals.models import GoalCategory, Goal, GoalComment, BoardParticipant, Board
+from goals.pagination import ListPagination
+from goals.readers import ValuesListMixin
 from goals.permissions import BoardPermissions
 from goals.serializers import GoalCreateSerializer, GoalCategoryCreateSerializer, GoalCategoryListSerializer, \
     GoalSerializer, GoalCommentCreateSerializer, GoalCommentSerializer, BoardSerializer, \
-    BoardCreateSerializer, BoardListSerializer
+    BoardCreateSerializer, BoardListSerializer, GoalBatchSerializer, BoardExportSerializer
 from rest_framework.filters import OrderingFilter
 
 
@@ -19,12 +28,12 @@ class GoalCategoryCreateView(generics.CreateAPIView):
     serializer_class = GoalCategoryCreateSerializer
 
 
-class GoalCategoryListView(generics.ListAPIView):
+class GoalCategoryListView(CachedListMixin, ValuesListMixin, generics.ListAPIView):
     """Показ всех категорий"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalCategoryListSerializer
-    pagination_class = LimitOffsetPagination
-    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = ListPagination
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter, TrigramSearchFilter]
     ordering_fields = ['title', 'created']
     ordering = ['title']
     search_fields = ['title']
@@ -46,10 +55,9 @@ class GoalCategoryView(generics.RetrieveUpdateDestroyAPIView):
         )
 
     def perform_destroy(self, instance: GoalCategory) -> None:
-        with transaction.atomic():
-            instance.is_deleted = True
-            instance.save(update_fields=('is_deleted',))
-            instance.goals.update(status=Goal.Status.archived)
+        # Цели скрыты вместе с категорией сразу, архивируются пачками в задаче (goals.tasks)
+        cascade.delete_category(instance)
+        tasks.archive_category.enqueue(category_id=instance.id)
 
 
 class GoalCreateView(generics.CreateAPIView):
@@ -58,15 +66,26 @@ class GoalCreateView(generics.CreateAPIView):
     serializer_class = GoalCreateSerializer
 
 
-class GoalListView(generics.ListAPIView):
+class GoalBatchView(generics.GenericAPIView):
+    """Пакетное создание, изменение и архивирование целей"""
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = GoalBatchSerializer
+
+    def post(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.save())
+
+
+class GoalListView(ConditionalListMixin, CachedListMixin, ValuesListMixin, generics.ListAPIView):
     """Отображение целей"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = ListPagination
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
         filters.OrderingFilter,
+        GoalSearchFilter,
     ]
     filterset_class = GoalDateFilter
     ordering_fields = ['title', 'created']
@@ -81,7 +100,7 @@ class GoalListView(generics.ListAPIView):
         )
 
 
-class GoalView(generics.RetrieveUpdateDestroyAPIView):
+class GoalView(LastModifiedMixin, generics.RetrieveUpdateDestroyAPIView):
     """Работа с целью"""
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = GoalSerializer
@@ -104,10 +123,11 @@ class GoalCommentCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 
-class GoalCommentListView(generics.ListAPIView):
+class GoalCommentListView(ConditionalListMixin, CachedListMixin, ValuesListMixin, generics.ListAPIView):
     """Отображение всех комментариев"""
     serializer_class = GoalCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ListPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['goal']
     ordering_fields = ['created', 'updated']
@@ -116,12 +136,12 @@ class GoalCommentListView(generics.ListAPIView):
     def get_queryset(self) -> QuerySet:
         return (
             GoalComment.objects.select_related('user')
-            .filter(user=self.request.user)
+            .filter(user=self.request.user, goal__category__is_deleted=False)
             .exclude(goal__status=Goal.Status.archived)
         )
 
 
-class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
+class GoalCommentView(LastModifiedMixin, generics.RetrieveUpdateDestroyAPIView):
     """Работа с комментариями"""
     serializer_class = GoalCommentSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -133,7 +153,7 @@ class GoalCommentView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self) -> QuerySet:
         return (
             GoalComment.objects.select_related('user')
-            .filter(user=self.request.user)
+            .filter(user=self.request.user, goal__category__is_deleted=False)
             .exclude(goal__status=Goal.Status.archived)
         )
 
@@ -147,18 +167,18 @@ class BoardCreatedView(generics.CreateAPIView):
         BoardParticipant.objects.create(user=self.request.user, board=serializer.save())
 
 
-class BoardListView(generics.ListAPIView):
+class BoardListView(CachedListMixin, generics.ListAPIView):
     """Отображение всех досок"""
     serializer_class = BoardListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [OrderingFilter]
+    filter_backends = [OrderingFilter, TrigramSearchFilter]
     ordering = ['title']
 
     def get_queryset(self):
         return Board.objects.filter(participants__user_id=self.request.user.id, is_deleted=False)
 
 
-class BoardView(generics.RetrieveUpdateDestroyAPIView):
+class BoardView(ContentETagMixin, CachedRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """Работа с доской"""
     permission_classes = [permissions.IsAuthenticated, BoardPermissions]
     serializer_class = BoardSerializer
@@ -167,7 +187,29 @@ class BoardView(generics.RetrieveUpdateDestroyAPIView):
         return Board.objects.prefetch_related('participants__user').filter(is_deleted=False)
 
     def perform_destroy(self, instance: Board) -> None:
-        with transaction.atomic():
-            Board.objects.filter(id=instance.id).update(is_deleted=True)
-            instance.categories.update(is_deleted=True)
-            Goal.objects.filter(category__board=instance).update(status=Goal.Status.archived)
+        # Категории и цели скрыты вместе с доской сразу, цели архивируются пачками в задаче (goals.tasks)
+        cascade.delete_board(instance.id)
+        tasks.archive_board.enqueue(board_id=instance.id)
+
+
+class BoardExportView(generics.GenericAPIView):
+    """
+    Потоковая выгрузка целей доски (и комментариев при comments=true) в NDJSON или CSV
+    """
+    permission_classes = [permissions.IsAuthenticated, BoardPermissions]
+    serializer_class = BoardExportSerializer
+
+    def get_queryset(self) -> QuerySet:
+        return Board.objects.filter(is_deleted=False)
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        board = self.get_object()
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        export_format = serializer.validated_data['type']
+        content_type, extension = EXPORT_FORMATS[export_format]
+
+        export = BoardExport(board.id, comments=serializer.validated_data['comments'])
+        response = StreamingHttpResponse(export.stream(export_format), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="board-{board.id}.{extension}"'
+        return response
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from jobs.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'attempts', 'run_at', 'failed', 'created')
+    list_filter = ('name', 'failed')
+    readonly_fields = ('created',)
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self) -> None:
+        # задачи объявляются в модулях tasks приложений (goals.tasks, bot.tasks)
+        autodiscover_modules('tasks')
@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from jobs.models import Job
+from jobs.queue import JobQueue
+
+
+class Command(BaseCommand):
+    """Обработчик отложенных задач (jobs.queue); процессов может быть несколько"""
+    help = 'Выполняет задачи из таблицы Job в пуле потоков'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            '--concurrency', type=int, default=settings.JOBS_CONCURRENCY, help='Задач одновременно в этом процессе'
+        )
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Пауза при пустой очереди, секунд')
+        parser.add_argument('--once', action='store_true', help='Выполнить готовые задачи и выйти')
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        queue = JobQueue()
+        concurrency = options['concurrency']
+        running: set[Future] = set()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='runworker') as executor:
+            while True:
+                free = concurrency - len(running)
+                jobs = queue.claim(limit=free) if free else []
+                running.update(executor.submit(self.run_job, queue, job) for job in jobs)
+                if not running:
+                    if options['once']:
+                        return
+                    time.sleep(options['poll_interval'])
+                    continue
+                # свободные места заполняются не реже раза в poll_interval
+                _, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+
+    def run_job(self, queue: JobQueue, job: Job) -> None:
+        try:
+            if queue.run(job):
+                self.stdout.write(f'{job}: done')
+            else:
+                self.stderr.write(f'{job}: failed (attempt {job.attempts})')
+        finally:
+            close_old_connections()
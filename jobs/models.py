@@ -0,0 +1,27 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """Отложенная задача (jobs.queue), выполняемая manage.py runworker"""
+    name = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True, default=None)
+    # попытки исчерпаны: задача остаётся в таблице для разбора
+    failed = models.BooleanField(default=False)
+    last_error = models.TextField(blank=True, default='')
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+        indexes = [
+            # JobQueue.claim: готовые задачи по run_at
+            models.Index(fields=['run_at', 'id'], name='job_ready_idx', condition=Q(failed=False)),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.name} #{self.id}'
@@ -0,0 +1,136 @@
+import logging
+import random
+import traceback
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+
+class Retry(Exception):
+    """Повторить задачу через delay секунд (None — по обычной задержке с backoff)"""
+
+    def __init__(self, delay: float | None = None) -> None:
+        super().__init__(delay)
+        self.delay = delay
+
+
+class Task:
+    """
+    Функция, которую можно отложить: task.enqueue(**payload).
+
+    Payload сохраняется в JSON, поэтому аргументы — простые значения (id, строки).
+    Задача может выполниться повторно (ретрай, истёкшая аренда упавшего
+    обработчика), поэтому должна быть идемпотентной.
+    """
+
+    def __init__(self, func: Callable[..., Any], name: str, max_attempts: int | None = None) -> None:
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts or settings.JOBS_MAX_ATTEMPTS
+
+    def __call__(self, **payload: Any) -> Any:
+        return self.func(**payload)
+
+    def enqueue(self, delay: float = 0, **payload: Any) -> Job | None:
+        """
+        Поставить задачу в очередь. Строка задачи пишется в текущей транзакции
+        и видна обработчикам только после её фиксации.
+
+        При JOBS_ENABLED=False задача выполняется в этом же процессе после
+        фиксации транзакции (разработка, тесты, установки без runworker).
+        """
+        if not settings.JOBS_ENABLED:
+            transaction.on_commit(lambda: self(**payload))
+            return None
+        return Job.objects.create(
+            name=self.name, payload=payload, run_at=timezone.now() + timedelta(seconds=delay)
+        )
+
+
+TASKS: dict[str, Task] = {}
+
+
+def task(name: str, max_attempts: int | None = None) -> Callable[[Callable[..., Any]], Task]:
+    """Регистрация задачи под именем name"""
+
+    def register(func: Callable[..., Any]) -> Task:
+        if name in TASKS:
+            raise ValueError(f'Task {name} is already registered')
+        TASKS[name] = Task(func, name, max_attempts)
+        return TASKS[name]
+
+    return register
+
+
+def backoff(attempts: int) -> float:
+    """Задержка перед повтором: экспонента от JOBS_RETRY_BACKOFF с разбросом ±10%"""
+    delay = min(settings.JOBS_RETRY_BACKOFF * 2 ** (attempts - 1), settings.JOBS_RETRY_BACKOFF_MAX)
+    return delay * random.uniform(0.9, 1.1)
+
+
+class JobQueue:
+    """
+    Очередь задач в таблице Job.
+
+    Обработчики забирают готовые задачи через SELECT ... FOR UPDATE SKIP LOCKED
+    и арендуют их на lease секунд, поэтому процессов runworker может быть
+    сколько угодно, а задачи упавшего процесса по истечении аренды заберёт
+    другой. На SQLite select_for_update игнорируется, и от двойной выдачи
+    защищает только аренда — там рассчитано на один обработчик.
+    """
+
+    def __init__(self, lease: int | None = None) -> None:
+        self.lease = lease or settings.JOBS_LEASE
+
+    def claim(self, limit: int) -> list[Job]:
+        """Забрать до limit готовых задач; попытка засчитывается при выдаче"""
+        now = timezone.now()
+        with transaction.atomic():
+            jobs = list(
+                Job.objects.select_for_update(skip_locked=True)
+                .filter(failed=False, run_at__lte=now)
+                .filter(Q(locked_until__isnull=True) | Q(locked_until__lte=now))
+                .order_by('run_at', 'id')[:limit]
+            )
+            Job.objects.filter(id__in=[job.id for job in jobs]).update(
+                locked_until=now + timedelta(seconds=self.lease), attempts=F('attempts') + 1
+            )
+        for job in jobs:
+            job.attempts += 1
+        return jobs
+
+    def run(self, job: Job) -> bool:
+        """Выполнить задачу: успешная удаляется, упавшая откладывается или помечается failed"""
+        task = TASKS.get(job.name)
+        if task is None:
+            self.fail(job, f'Unknown task {job.name}', retry=False)
+            return False
+        try:
+            task(**job.payload)
+        except Retry as error:
+            self.fail(job, 'Retry requested', delay=error.delay, max_attempts=task.max_attempts)
+            return False
+        except Exception:
+            logger.exception('Job %s failed (attempt %s)', job, job.attempts)
+            self.fail(job, traceback.format_exc(), max_attempts=task.max_attempts)
+            return False
+        Job.objects.filter(id=job.id).delete()
+        return True
+
+    @staticmethod
+    def fail(
+        job: Job, error: str, delay: float | None = None, max_attempts: int = 0, retry: bool = True
+    ) -> None:
+        if not retry or job.attempts >= max_attempts:
+            Job.objects.filter(id=job.id).update(failed=True, locked_until=None, last_error=error)
+            return
+        run_at = timezone.now() + timedelta(seconds=backoff(job.attempts) if delay is None else delay)
+        Job.objects.filter(id=job.id).update(run_at=run_at, locked_until=None, last_error=error)
@@ -0,0 +1,27 @@
+import pytest
+from pytest_factoryboy import register
+
+from tests import factories
+from tests.query_budget import query_budget as query_budget_context
+
+# фикстуры user, board, board_participant, goal_category, goal, goal_comment и *_factory
+for factory_class in (
+    factories.UserFactory,
+    factories.BoardFactory,
+    factories.BoardParticipantFactory,
+    factories.GoalCategoryFactory,
+    factories.GoalFactory,
+    factories.GoalCommentFactory,
+):
+    register(factory_class)
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Фикстура для тестов-функций pytest: with query_budget(3): ...
+
+    В классах APITestCase используется tests.query_budget.query_budget напрямую
+    (как контекстный менеджер или декоратор).
+    """
+    return query_budget_context
@@ -0,0 +1,71 @@
+import factory
+from django.utils import timezone
+from factory.django import DjangoModelFactory
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+class UserFactory(DjangoModelFactory):
+    class Meta:
+        model = User
+        django_get_or_create = ('username',)
+
+    username = factory.Sequence(lambda number: f'user_{number}')
+    first_name = factory.Faker('first_name')
+    last_name = factory.Faker('last_name')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    password = factory.django.Password('qwerty')
+
+
+class BoardFactory(DjangoModelFactory):
+    class Meta:
+        model = Board
+
+    title = factory.Sequence(lambda number: f'board {number}')
+    # bulk_create не вызывает BaseModel.save
+    created = factory.LazyFunction(lambda: timezone.now().date())
+    updated = factory.SelfAttribute('created')
+
+
+class BoardParticipantFactory(DjangoModelFactory):
+    class Meta:
+        model = BoardParticipant
+
+    board = factory.SubFactory(BoardFactory)
+    user = factory.SubFactory(UserFactory)
+    role = BoardParticipant.Role.owner
+    created = factory.LazyFunction(lambda: timezone.now().date())
+    updated = factory.SelfAttribute('created')
+
+
+class GoalCategoryFactory(DjangoModelFactory):
+    class Meta:
+        model = GoalCategory
+
+    board = factory.SubFactory(BoardFactory)
+    user = factory.SubFactory(UserFactory)
+    title = factory.Sequence(lambda number: f'category {number}')
+    created = factory.LazyFunction(lambda: timezone.now().date())
+    updated = factory.SelfAttribute('created')
+
+
+class GoalFactory(DjangoModelFactory):
+    class Meta:
+        model = Goal
+
+    category = factory.SubFactory(GoalCategoryFactory)
+    user = factory.SelfAttribute('category.user')
+    title = factory.Sequence(lambda number: f'goal {number}')
+    description = factory.Faker('sentence', locale='ru_RU')
+    status = factory.Iterator(Goal.Status.values[:3])
+    priority = factory.Iterator(Goal.Priority.values)
+
+
+class GoalCommentFactory(DjangoModelFactory):
+    class Meta:
+        model = GoalComment
+
+    goal = factory.SubFactory(GoalFactory)
+    user = factory.SelfAttribute('goal.user')
+    text = factory.Faker('sentence', locale='ru_RU')
@@ -0,0 +1,48 @@
+from contextlib import ContextDecorator
+from typing import Callable
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget(ContextDecorator):
+    """
+    Не больше max_queries SQL-запросов в блоке или тесте.
+
+        with query_budget(3):
+            client.get('/goals/goal/list')
+
+        @query_budget(5)
+        def test_something(self): ...
+
+    При превышении тест падает со списком выполненных запросов.
+    """
+
+    def __init__(self, max_queries: int, using: str = DEFAULT_DB_ALIAS) -> None:
+        self.max_queries = max_queries
+        self.using = using
+
+    def __enter__(self) -> CaptureQueriesContext:
+        self.context = CaptureQueriesContext(connections[self.using])
+        return self.context.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.context.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        executed = len(self.context)
+        if executed > self.max_queries:
+            queries = '\n'.join(
+                f'{number}. {query["sql"]}' for number, query in enumerate(self.context.captured_queries, start=1)
+            )
+            raise QueryBudgetExceeded(f'{executed} queries executed, budget is {self.max_queries}:\n{queries}')
+
+
+def count_queries(action: Callable[[], object], using: str = DEFAULT_DB_ALIAS) -> int:
+    with CaptureQueriesContext(connections[using]) as context:
+        action()
+    return len(context)
@@ -1,5 +1,9 @@
-from rest_framework.test import APITestCase
+import json
+
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
 
 from core.models import User
 from goals.models import Board, BoardParticipant
@@ -59,4 +63,63 @@ class BoardsApiTestCase(APITestCase):
         url = f'/goals/board/{board.id}'
         response = self.test_client.get(url)
         assert response.status_code == 200
-        assert response.data.get('id') == board.id
\ No newline at end of file
+        assert response.data.get('id') == board.id
+
+    def test_search_boards(self):
+        """
+        Проверка поиска досок по параметру q
+        """
+        board = self.create_board()
+        Board.objects.filter(id=board.id).update(title='Домашние дела')
+        other = self.create_board()
+        response = self.test_client.get('/goals/board/list', {'q': 'домашние'})
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data] == [board.id]
+
+    def update_participants(self, count):
+        """
+        Обновление доски с count участниками: половина удаляется, остальным меняется роль,
+        и добавляется ещё count новых участников
+        """
+        board = self.create_board()
+        users = User.objects.bulk_create(
+            User(username=f'participant_{count}_{number}', password='!') for number in range(count * 2)
+        )
+        for user in users[:count]:
+            BoardParticipant.objects.create(board=board, user=user, role=BoardParticipant.Role.reader)
+
+        participants = [
+            {'user': user.username, 'role': BoardParticipant.Role.writer} for user in users[count // 2:]
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.test_client.put(
+                f'/goals/board/{board.id}',
+                json.dumps({'title': 'updated', 'participants': participants}),
+                content_type='application/json',
+            )
+        assert response.status_code == 200
+        assert len(response.data['participants']) == len(participants) + 1
+        assert set(
+            BoardParticipant.objects.filter(board=board).exclude(user=self.user).values_list('user_id', 'role')
+        ) == {(user.id, BoardParticipant.Role.writer) for user in users[count // 2:]}
+        return len(queries)
+
+    def test_update_participants_queries(self):
+        """
+        Проверка постоянного числа запросов при обновлении участников доски
+        """
+        assert self.update_participants(4) == self.update_participants(40)
+
+    def test_update_malformed_participants(self):
+        """
+        Проверка ошибки 400 при участнике не в виде username
+        """
+        board = self.create_board()
+        for user in (['x'], {'a': 1}, 1, None):
+            with self.subTest(user=user):
+                response = self.test_client.put(
+                    f'/goals/board/{board.id}',
+                    json.dumps({'title': 'updated', 'participants': [{'user': user, 'role': 2}]}),
+                    content_type='application/json',
+                )
+                assert response.status_code == 400
@@ -0,0 +1,398 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from bot.management.commands.runbot import Command
+from bot.models import TgChatState, TgUpdate, TgUser
+from bot.states import DatabaseStateStore, MemoryStateStore
+from bot.tg.client import TgClient, get_tg_client
+from bot.tg.dc import GetUpdatesResponse, Message, SendMessageResponse, UpdateObj
+from bot.tg.dispatcher import AsyncDispatcher, BlockingTgClient
+from bot.tg.sender import RetryAfter, SendQueue, TokenBucket
+from bot.webhook import UpdateQueue
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory
+from jobs.models import Job
+
+
+class FakeAsyncTgClient:
+    """Клиент Telegram, отдающий заранее заданные пачки обновлений"""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.sent = []
+
+    async def get_updates(self, offset=0, timeout=60):
+        batch = self.batches.pop(0) if self.batches else []
+        return GetUpdatesResponse(ok=True, result=batch)
+
+    async def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+        return SendMessageResponse(ok=True, result={'chat': {'id': chat_id}, 'text': text})
+
+
+def make_update(update_id, chat_id, text):
+    return {'update_id': update_id, 'message': {'chat': {'id': chat_id}, 'text': text}}
+
+
+class AsyncDispatcherTestCase(SimpleTestCase):
+
+    def test_per_chat_order_and_concurrency(self):
+        """
+        Проверка порядка сообщений внутри чата и параллельной обработки разных чатов
+        """
+        updates = [make_update(number, number % 4, str(number)) for number in range(12)]
+        client = FakeAsyncTgClient([updates[:6], updates[6:]])
+        handled = []
+
+        def handler(message: Message):
+            time.sleep(0.05)
+            handled.append((message.chat.id, int(message.text)))
+
+        dispatcher = AsyncDispatcher(client, handler, workers=4)
+        started = time.monotonic()
+        offset = asyncio.run(dispatcher.run(max_updates=len(updates)))
+        elapsed = time.monotonic() - started
+
+        assert offset == 12
+        assert len(handled) == 12
+        for chat_id in range(4):
+            numbers = [number for chat, number in handled if chat == chat_id]
+            assert numbers == sorted(numbers)
+        assert elapsed < 12 * 0.05 / 2
+
+    def test_handler_error_does_not_stop_worker(self):
+        """
+        Проверка продолжения обработки после ошибки в обработчике
+        """
+        client = FakeAsyncTgClient([[make_update(1, 7, 'fail'), make_update(2, 7, 'ok')]])
+        handled = []
+
+        def handler(message: Message):
+            if message.text == 'fail':
+                raise ValueError
+            handled.append(message.text)
+
+        asyncio.run(AsyncDispatcher(client, handler, workers=1).run(max_updates=2))
+        assert handled == ['ok']
+
+    def test_connections_closed_after_message(self):
+        """
+        Проверка закрытия устаревших соединений с БД после каждого сообщения, в том числе с ошибкой
+        """
+        client = FakeAsyncTgClient([[make_update(1, 7, 'fail'), make_update(2, 7, 'ok')]])
+
+        def handler(message: Message):
+            if message.text == 'fail':
+                raise ValueError
+
+        with mock.patch('bot.tg.dispatcher.close_old_connections') as close_old_connections:
+            asyncio.run(AsyncDispatcher(client, handler, workers=1).run(max_updates=2))
+        assert close_old_connections.call_count == 2
+
+    def test_blocking_client_from_handler_thread(self):
+        """
+        Проверка отправки сообщений из потока обработчика через цикл событий
+        """
+        client = FakeAsyncTgClient([[make_update(1, 5, 'hi')]])
+
+        async def run():
+            blocking = BlockingTgClient(client, asyncio.get_running_loop())
+            dispatcher = AsyncDispatcher(
+                client, lambda message: blocking.send_message(message.chat.id, message.text), workers=2
+            )
+            await dispatcher.run(max_updates=1)
+
+        asyncio.run(run())
+        assert client.sent == [(5, 'hi')]
+
+
+class FakeTgClient:
+    """Синхронный клиент Telegram, запоминающий отправленные сообщения"""
+
+    def __init__(self, latency=0, errors=()):
+        self.latency = latency
+        self.errors = list(errors)
+        self.sent = []
+
+    def send_message(self, chat_id, text):
+        time.sleep(self.latency)
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append((chat_id, text))
+
+
+class StateStoreTestCase(TestCase):
+
+    def test_memory_store_ttl(self):
+        """
+        Проверка истечения состояния в памяти
+        """
+        store = MemoryStateStore(ttl=60)
+        store.set(1, {'state': 'creating'})
+        state = store.get(1)
+        state['state'] = 'changed'
+        assert store.get(1) == {'state': 'creating'}
+        assert store.get(2) == {}
+
+        with mock.patch('bot.states.time.monotonic', return_value=time.monotonic() + 61):
+            assert store.get(1) == {}
+
+    def test_database_store(self):
+        """
+        Проверка хранения состояния в БД и удаления брошенных диалогов
+        """
+        store = DatabaseStateStore(ttl=60)
+        store.set(1, {'state': 'creating', 'categories_id': ['1']})
+        store.set(2, {'state': 'creating'})
+        assert store.get(1) == {'state': 'creating', 'categories_id': ['1']}
+
+        store.set(1, {})
+        assert not TgChatState.objects.filter(chat_id=1).exists()
+
+        TgChatState.objects.filter(chat_id=2).update(updated=timezone.now() - timedelta(seconds=61))
+        assert store.get(2) == {}
+        assert store.purge() == 1
+
+
+class RunbotStateTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.categories = []
+        for chat_id in (1, 2):
+            user = User.objects.create_user(username=f'user_{chat_id}', password='qwerty')
+            TgUser.objects.create(chat_id=chat_id, user=user)
+            board = Board.objects.create(title=f'board_{chat_id}')
+            BoardParticipant.objects.create(board=board, user=user)
+            cls.categories.append(GoalCategory.objects.create(title='category', user=user, board=board))
+
+    def send(self, command, chat_id, text):
+        command.handle_message(Message(chat={'id': chat_id}, text=text))
+
+    def check_interleaved_dialogs(self, store):
+        command = Command()
+        command.tg_client = FakeTgClient()
+        command.state_store = store
+
+        self.send(command, 1, '/create')
+        self.send(command, 2, '/create')
+        self.send(command, 1, str(self.categories[0].id))
+        self.send(command, 2, str(self.categories[0].id))
+        self.send(command, 2, str(self.categories[1].id))
+        self.send(command, 1, 'first goal')
+        self.send(command, 2, 'second goal')
+
+        assert (2, 'Wrong category!') in command.tg_client.sent
+        assert Goal.objects.get(title='first goal').category_id == self.categories[0].id
+        assert Goal.objects.get(title='second goal').category_id == self.categories[1].id
+        assert store.get(1) == store.get(2) == {}
+
+    def test_interleaved_dialogs_memory(self):
+        """
+        Проверка независимых диалогов двух чатов (состояние в памяти)
+        """
+        self.check_interleaved_dialogs(MemoryStateStore(ttl=60))
+
+    def test_interleaved_dialogs_database(self):
+        """
+        Проверка независимых диалогов двух чатов (состояние в БД)
+        """
+        self.check_interleaved_dialogs(DatabaseStateStore(ttl=60))
+
+
+class SendQueueTestCase(SimpleTestCase):
+
+    def test_token_bucket(self):
+        """
+        Проверка выдачи токенов с заданной частотой
+        """
+        bucket = TokenBucket(rate=10, capacity=2)
+        now = bucket.updated
+        bucket.consume(now)
+        bucket.consume(now)
+        assert round(bucket.wait_time(now), 6) == 0.1
+        assert bucket.wait_time(now + 0.11) == 0
+
+    def test_coalesce_per_chat(self):
+        """
+        Проверка склейки сообщений чата, ожидающих отправки, с сохранением порядка
+        """
+        client = FakeTgClient(latency=0.05)
+        queue = SendQueue(client, chat_rate=20, chat_burst=1)
+        queue.send_message(1, 'a')
+        time.sleep(0.02)
+        queue.send_message(1, 'b')
+        queue.send_message(1, 'c')
+        queue.send_message(2, 'd')
+        queue.close(timeout=5)
+
+        assert [text for chat_id, text in client.sent if chat_id == 1] == ['a', 'b\nc']
+        assert (2, 'd') in client.sent
+
+    def test_global_rate(self):
+        """
+        Проверка общего ограничения частоты отправки
+        """
+        client = FakeTgClient()
+        queue = SendQueue(client, global_rate=50)
+        started = time.monotonic()
+        for chat_id in range(60):
+            queue.send_message(chat_id, 'text')
+        queue.close(timeout=5)
+
+        assert len(client.sent) == 60
+        assert time.monotonic() - started >= 10 / 50 * 0.9
+
+    def test_retry_after(self):
+        """
+        Проверка повторной отправки после ответа 429
+        """
+        client = FakeTgClient(errors=[RetryAfter(0.1)])
+        queue = SendQueue(client)
+        started = time.monotonic()
+        queue.send_message(1, 'text')
+        queue.close(timeout=5)
+
+        assert client.sent == [(1, 'text')]
+        assert time.monotonic() - started >= 0.1
+
+    def test_pooled_session(self):
+        """
+        Проверка пула keep-alive соединений TgClient
+        """
+        client = TgClient(token='token', pool_size=7)
+        adapter = client.session.get_adapter('https://api.telegram.org')
+        assert adapter._pool_maxsize == 7
+        assert client.send_queue is client.send_queue
+        assert get_tg_client() is get_tg_client()
+
+
+class VerifyUserTestCase(APITestCase):
+
+    def test_verify_uses_shared_client(self):
+        """
+        Проверка отправки подтверждения через общую очередь TgClient
+        """
+        user = User.objects.create_user(username='new_user', password='qwerty')
+        TgUser.objects.create(chat_id=10, verification_code='code')
+        self.client.force_authenticate(user)
+
+        with mock.patch('bot.views.get_tg_client') as get_client:
+            response = self.client.patch('/bot/verify', {'verification_code': 'code'})
+
+        assert response.status_code == 200
+        get_client.return_value.send_queue.send_message.assert_called_once_with(chat_id=10, text='Bot verificated')
+        assert TgUser.objects.get(chat_id=10).user == user
+
+    @override_settings(JOBS_ENABLED=True)
+    def test_verify_enqueues_message(self):
+        """
+        Проверка отправки подтверждения отложенной задачей
+        """
+        user = User.objects.create_user(username='new_user', password='qwerty')
+        TgUser.objects.create(chat_id=10, verification_code='code')
+        self.client.force_authenticate(user)
+
+        with mock.patch('bot.views.get_tg_client') as get_client:
+            assert self.client.patch('/bot/verify', {'verification_code': 'code'}).status_code == 200
+
+        get_client.assert_not_called()
+        job = Job.objects.get()
+        assert (job.name, job.payload) == ('bot.send_message', {'chat_id': 10, 'text': 'Bot verificated'})
+
+
+@override_settings(TG_WEBHOOK_SECRET='secret')
+class WebhookTestCase(APITestCase):
+    url = '/bot/webhook'
+
+    def post_update(self, update, secret='secret'):
+        return self.client.post(self.url, update, format='json', HTTP_X_TELEGRAM_BOT_API_SECRET_TOKEN=secret)
+
+    def test_secret_token(self):
+        """
+        Проверка секретного токена вебхука
+        """
+        assert self.post_update(make_update(1, 1, 'hi'), secret='wrong').status_code == 403
+        with override_settings(TG_WEBHOOK_SECRET=''):
+            assert self.post_update(make_update(1, 1, 'hi')).status_code == 404
+        assert not TgUpdate.objects.exists()
+
+    def test_enqueue(self):
+        """
+        Проверка сохранения обновлений в очередь без повторов
+        """
+        assert self.post_update(make_update(1, 5, 'hi')).status_code == 200
+        assert self.post_update(make_update(1, 5, 'hi')).status_code == 200
+        assert self.post_update({'update_id': 2, 'edited_message': {}}).status_code == 200
+
+        update = TgUpdate.objects.get()
+        assert (update.update_id, update.chat_id, update.payload) == (1, 5, make_update(1, 5, 'hi'))
+
+    def test_claim_skips_busy_chats(self):
+        """
+        Проверка выдачи обновлений по порядку без чатов, которые уже в работе
+        """
+        for update_id, chat_id in ((3, 1), (1, 1), (2, 2), (4, 3)):
+            UpdateQueue.put(UpdateObj(**make_update(update_id, chat_id, 'hi')), make_update(update_id, chat_id, 'hi'))
+        queue = UpdateQueue(lease=60)
+
+        assert [update.update_id for update in queue.claim(limit=2)] == [1, 2]
+        assert [update.update_id for update in queue.claim(limit=10)] == [4]
+
+
+class WebhookWorkerTestCase(TransactionTestCase):
+
+    def test_process_updates(self):
+        """
+        Проверка обработки очереди обновлений runbot --webhook
+        """
+        for update_id in range(4):
+            update = make_update(update_id, update_id % 2, '/start')
+            UpdateQueue.put(UpdateObj(**update), update)
+        command = Command()
+        command.tg_client = FakeTgClient()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert command.process_updates(UpdateQueue(), executor, batch_size=10) == 4
+
+        assert not TgUpdate.objects.exists()
+        assert sorted(chat_id for chat_id, _ in command.tg_client.sent) == [0, 0, 1, 1]
+
+    @skipUnless(connection.vendor == 'postgresql', 'блокировки строк и параллельные соединения нужны PostgreSQL')
+    def test_concurrent_claim_same_chat(self):
+        """
+        Проверка, что обновления чата не выдаются второму обработчику до фиксации аренды первого
+        """
+        for update_id, chat_id in ((1, 1), (2, 1), (3, 2)):
+            update = make_update(update_id, chat_id, 'hi')
+            UpdateQueue.put(UpdateObj(**update), update)
+        queue = UpdateQueue(lease=60)
+        claimed = threading.Event()
+        first = []
+
+        def claim_and_hold():
+            try:
+                with transaction.atomic():
+                    first.extend(queue.claim(limit=1))
+                    claimed.set()
+                    time.sleep(0.3)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=claim_and_hold)
+        thread.start()
+        claimed.wait(5)
+        second = queue.claim(limit=10)
+        thread.join()
+
+        assert [update.update_id for update in first] == [1]
+        assert [update.update_id for update in second] == [3]
@@ -0,0 +1,91 @@
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory
+
+
+@override_settings(RESPONSE_CACHE_TIMEOUT=60)
+class ResponseCacheTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cache_user', password='qwerty')
+        cls.board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=cls.board, user=cls.user)
+        cls.category = GoalCategory.objects.create(title='category', user=cls.user, board=cls.board)
+        Goal.objects.create(title='goal', category=cls.category, user=cls.user)
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.client.force_authenticate(self.user)
+
+    def test_cached_list(self):
+        """
+        Проверка ответа из кэша без запросов к БД
+        """
+        url = '/goals/goal/list'
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert response['ETag']
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        assert cached.content == response.content
+        assert cached['ETag'] == response['ETag']
+        assert cached['Content-Type'] == 'application/json'
+        assert 'private' in cached['Cache-Control']
+
+        assert self.client.get(url, {'limit': 1}).json()['count'] == 1
+
+    def test_if_none_match(self):
+        """
+        Проверка ответа 304 на совпавший ETag
+        """
+        url = '/goals/goal_category/list'
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304
+        assert response['ETag'] == etag
+        assert self.client.get(url, HTTP_IF_NONE_MATCH='"other"').status_code == 200
+
+    def test_invalidated_on_save(self):
+        """
+        Проверка сброса кэша при создании цели
+        """
+        url = '/goals/goal/list'
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Goal.objects.create(title='new goal', category=self.category, user=self.user)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert {goal['title'] for goal in response.json()} == {'goal', 'new goal'}
+
+    def test_invalidated_on_board_delete(self):
+        """
+        Проверка сброса кэша при удалении доски (каскад через update())
+        """
+        url = '/goals/goal_category/list'
+        assert len(self.client.get(url).json()) == 1
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assert self.client.delete(f'/goals/board/{self.board.id}').status_code == 204
+
+        assert self.client.get(url).json() == []
+        assert self.client.get('/goals/goal/list').json() == []
+
+    def test_per_user(self):
+        """
+        Проверка раздельного кэша пользователей
+        """
+        url = '/goals/board/list'
+        assert len(self.client.get(url).json()) == 1
+
+        other = User.objects.create_user(username='other_user', password='qwerty')
+        self.client.force_authenticate(other)
+        assert self.client.get(url).json() == []
@@ -0,0 +1,127 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals import cascade
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from jobs.models import Job
+from jobs.queue import JobQueue
+
+
+@override_settings(CASCADE_BATCH_SIZE=2)
+class CascadeArchiveTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cascade_user', password='qwerty')
+        cls.board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=cls.board, user=cls.user)
+        cls.categories = [
+            GoalCategory.objects.create(title=f'category {number}', user=cls.user, board=cls.board)
+            for number in range(2)
+        ]
+        for category in cls.categories:
+            Goal.objects.bulk_create(
+                Goal(title=f'goal {number}', category=category, user=cls.user) for number in range(3)
+            )
+        Goal.objects.filter(id=Goal.objects.order_by('id')[0].id).update(status=Goal.Status.archived)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def active_goals(self) -> int:
+        return Goal.objects.exclude(status=Goal.Status.archived).count()
+
+    def test_board_delete(self):
+        """
+        Проверка архивирования целей и категорий доски пачками
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            assert self.client.delete(f'/goals/board/{self.board.id}').status_code == 204
+
+        assert self.active_goals() == 0
+        assert not GoalCategory.objects.filter(is_deleted=False).exists()
+        assert self.client.get('/goals/goal/list').json() == []
+
+    def test_category_delete(self):
+        """
+        Проверка архивирования целей удалённой категории
+        """
+        category, other = self.categories
+        with self.captureOnCommitCallbacks(execute=True):
+            assert self.client.delete(f'/goals/goal_category/{category.id}').status_code == 204
+
+        assert not Goal.objects.filter(category=category).exclude(status=Goal.Status.archived).exists()
+        assert Goal.objects.filter(category=other).exclude(status=Goal.Status.archived).count() == 3
+
+    def test_batches(self):
+        """
+        Проверка размера пачек и числа обновлённых строк нарастающим итогом
+        """
+        cascade.delete_board(self.board.id)
+        assert not GoalCategory.objects.filter(is_deleted=False).exists()
+        # 5 активных целей пачками по 2
+        assert list(cascade.archive_board(self.board.id)) == [2, 4, 5]
+        assert list(cascade.archive_board(self.board.id)) == []
+
+    @override_settings(JOBS_ENABLED=True)
+    def test_deferred(self):
+        """
+        Проверка архивирования в отложенной задаче
+        """
+        assert self.client.delete(f'/goals/board/{self.board.id}').status_code == 204
+        assert self.active_goals() == 5
+        assert self.client.get('/goals/goal/list').json() == []
+        assert list(Job.objects.values_list('name', 'payload')) == [('goals.archive_board', {'board_id': self.board.id})]
+
+        queue = JobQueue()
+        assert queue.run(queue.claim(limit=1)[0])
+        assert self.active_goals() == 0
+        assert not Job.objects.exists()
+
+    @override_settings(JOBS_ENABLED=True)
+    def test_deferred_comments(self):
+        """
+        Проверка, что комментарии к целям удалённой доски скрыты до архивирования
+        """
+        goal = Goal.objects.exclude(status=Goal.Status.archived).first()
+        comment = GoalComment.objects.create(text='text', goal=goal, user=self.user)
+        assert self.client.delete(f'/goals/board/{self.board.id}').status_code == 204
+        assert self.active_goals() == 5
+
+        assert self.client.get('/goals/goal_comment/list').json() == []
+        assert self.client.get(f'/goals/goal_comment/{comment.id}').status_code == 404
+        response = self.client.post('/goals/goal_comment/create', {'text': 'text', 'goal': goal.id})
+        assert response.status_code == 400
+
+    def test_archive_deleted(self):
+        """
+        Проверка завершения незаконченных каскадов командой archive_deleted
+        """
+        cascade.delete_board(self.board.id)
+        stdout = StringIO()
+        call_command('archive_deleted', stdout=stdout)
+        assert f'category {self.categories[1].id}: 3 rows archived' in stdout.getvalue()
+        assert self.active_goals() == 0
+
+        stdout = StringIO()
+        call_command('archive_deleted', stdout=stdout)
+        assert stdout.getvalue().strip() == 'Done: 0 rows archived'
+
+    def test_resume(self):
+        """
+        Проверка продолжения прерванного каскада категории
+        """
+        category = self.categories[1]
+        cascade.delete_category(category)
+        progress = cascade.archive_category(category)
+        assert next(progress) == 2
+        progress.close()
+        assert Goal.objects.filter(category=category).exclude(status=Goal.Status.archived).count() == 1
+
+        assert [label for label, _ in cascade.pending()] == [f'category {category.id}']
+        call_command('archive_deleted', stdout=StringIO())
+        assert not Goal.objects.filter(category=category).exclude(status=Goal.Status.archived).exists()
@@ -2,6 +2,7 @@ from rest_framework.test import APITestCase
 from django.test import Client
 
 from core.models import User
+from goals.filters import trigram_available
 from goals.models import Board, BoardParticipant, GoalCategory
 
 
@@ -63,4 +64,28 @@ class GoalCategoryApiTestCase(APITestCase):
         url = f'/goals/goal_category/{category.id}'
         response = self.test_client.delete(url)
         assert response.status_code == 204
-        assert GoalCategory.objects.get(id=category.id).is_deleted
\ No newline at end of file
+        assert GoalCategory.objects.get(id=category.id).is_deleted
+
+    def test_goal_category_similarity_search(self):
+        """
+        Проверка поиска категорий по параметру q
+        """
+        board = self.create_board()
+        shopping = GoalCategory.objects.create(title='Покупки', board=board, user=self.user)
+        GoalCategory.objects.create(title='Работа', board=board, user=self.user)
+        response = self.test_client.get('/goals/goal_category/list', {'q': 'покупки'})
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data] == [shopping.id]
+
+    def test_goal_category_typo_search(self):
+        """
+        Проверка нечёткого поиска категорий с опечаткой (pg_trgm)
+        """
+        if not trigram_available('default'):
+            self.skipTest('pg_trgm не установлен')
+        board = self.create_board()
+        shopping = GoalCategory.objects.create(title='Покупки', board=board, user=self.user)
+        shop = GoalCategory.objects.create(title='Покупки на неделю', board=board, user=self.user)
+        GoalCategory.objects.create(title='Работа', board=board, user=self.user)
+        response = self.test_client.get('/goals/goal_category/list', {'q': 'покупкы'})
+        assert [item['id'] for item in response.data] == [shopping.id, shop.id]
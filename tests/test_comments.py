@@ -35,7 +35,7 @@ class GoalApiTestCase(APITestCase):
         data = {'text': 'text', 'goal': goal.id, 'user': self.user}
         response = self.test_client.post(url, data)
         assert response.status_code == 201
-        assert response.data.get('id') == goal.id
+        assert response.data.get('goal') == goal.id
 
     def test_delete_comment(self):
         """
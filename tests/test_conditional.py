@@ -0,0 +1,141 @@
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+class ConditionalGetTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='conditional_user', password='qwerty')
+        cls.board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=cls.board, user=cls.user)
+        cls.category = GoalCategory.objects.create(title='category', user=cls.user, board=cls.board)
+        cls.goal = Goal.objects.create(title='goal', category=cls.category, user=cls.user)
+        cls.comment = GoalComment.objects.create(text='text', goal=cls.goal, user=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_created_updated(self):
+        """
+        Проверка дат создания и изменения цели
+        """
+        goal = Goal.objects.get(id=self.goal.id)
+        goal.title = 'changed'
+        goal.save()
+        goal.refresh_from_db()
+        assert goal.created == self.goal.created
+        assert goal.updated > goal.created
+
+    def test_goal_not_modified(self):
+        """
+        Проверка ответа 304 для неизменённой цели одним запросом к БД
+        """
+        url = f'/goals/goal/{self.goal.id}'
+        response = self.client.get(url)
+        assert response.status_code == 200
+        assert response['Last-Modified']
+
+        with self.assertNumQueries(1):
+            assert self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 304
+        with self.assertNumQueries(1):
+            assert self.client.get(url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code == 304
+
+        Goal.objects.get(id=self.goal.id).save()
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == 200
+
+    def test_comment_not_modified(self):
+        """
+        Проверка ответа 304 для неизменённого комментария
+        """
+        url = f'/goals/goal_comment/{self.comment.id}'
+        etag = self.client.get(url)['ETag']
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        self.client.patch(url, {'text': 'changed'})
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_list_not_modified(self):
+        """
+        Проверка ответа 304 для неизменённого списка по MAX(updated)
+        """
+        url = '/goals/goal/list'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        Goal.objects.create(title='second', category=self.category, user=self.user)
+        etag = self.client.get(url)['ETag']
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        assert self.client.delete(f'/goals/goal_category/{self.category.id}').status_code == 204
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_comment_list_deleted(self):
+        """
+        Проверка изменения ETag списка комментариев после удаления комментария
+        """
+        url = '/goals/goal_comment/list'
+        GoalComment.objects.create(text='second', goal=self.goal, user=self.user)
+        etag = self.client.get(url)['ETag']
+
+        assert self.client.delete(f'/goals/goal_comment/{self.comment.id}').status_code == 204
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_profile_changed(self):
+        """
+        Проверка смены ETag и Last-Modified целей после изменения профиля
+        """
+        list_etag = self.client.get('/goals/goal/list')['ETag']
+        detail = self.client.get(f'/goals/goal/{self.goal.id}')
+
+        assert self.client.patch('/core/profile', {'first_name': 'changed'}).status_code == 200
+        response = self.client.get('/goals/goal/list', HTTP_IF_NONE_MATCH=list_etag)
+        assert response.status_code == 200
+        assert response.json()[0]['user']['first_name'] == 'changed'
+        url = f'/goals/goal/{self.goal.id}'
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=detail['ETag']).status_code == 200
+        self.user.refresh_from_db()
+        if self.user.updated.replace(microsecond=0) > self.goal.updated.replace(microsecond=0):
+            assert self.client.get(url, HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']).status_code == 200
+
+    def test_list_page_single_count(self):
+        """
+        Проверка, что страница limit/offset использует COUNT агрегата ETag
+        """
+        with self.assertNumQueries(2):
+            response = self.client.get('/goals/goal/list', {'limit': 20, 'offset': 0})
+        assert response.json()['count'] == 1
+        assert response['ETag']
+
+    def test_board_content_etag(self):
+        """
+        Проверка ETag доски по содержимому без кэша ответов
+        """
+        url = f'/goals/board/{self.board.id}'
+        etag = self.client.get(url)['ETag']
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        assert self.client.patch('/core/profile', {'username': 'renamed_user'}).status_code == 200
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    @override_settings(RESPONSE_CACHE_TIMEOUT=60)
+    def test_board_not_modified(self):
+        """
+        Проверка ответа 304 для доски из кэша ответов
+        """
+        caches['responses'].clear()
+        url = f'/goals/board/{self.board.id}'
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(url, {'title': 'changed', 'participants': []}, format='json')
+        assert self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
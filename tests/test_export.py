@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+
+
+class BoardExportTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='export_user', password='qwerty')
+        cls.board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=cls.board, user=cls.user)
+        cls.category = GoalCategory.objects.create(title='категория', user=cls.user, board=cls.board)
+        cls.goals = [
+            Goal.objects.create(title=f'goal {number}', category=cls.category, user=cls.user, priority=2)
+            for number in range(5)
+        ]
+        cls.comment = GoalComment.objects.create(goal=cls.goals[0], user=cls.user, text='текст, "в кавычках"\nи строка')
+
+        deleted = GoalCategory.objects.create(title='deleted', user=cls.user, board=cls.board, is_deleted=True)
+        Goal.objects.create(title='hidden', category=deleted, user=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.url = f'/goals/board/{self.board.id}/export'
+
+    @staticmethod
+    def content(response) -> str:
+        assert response.streaming
+        return b''.join(response.streaming_content).decode()
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_ndjson(self):
+        """
+        Проверка выгрузки целей и комментариев в NDJSON
+        """
+        response = self.client.get(self.url, {'comments': 'true'})
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == f'attachment; filename="board-{self.board.id}.ndjson"'
+
+        records = [json.loads(line) for line in self.content(response).splitlines()]
+        assert [record['type'] for record in records] == ['goal'] * 5 + ['comment']
+        assert [record['id'] for record in records[:5]] == [goal.id for goal in self.goals]
+        assert records[0]['category_title'] == 'категория'
+        assert records[0]['priority'] == 2
+        assert records[0]['user'] == 'export_user'
+        assert records[0]['created'].endswith('Z')
+        assert records[-1]['goal'] == self.goals[0].id
+        assert records[-1]['text'] == self.comment.text
+
+    def test_csv(self):
+        """
+        Проверка выгрузки целей в CSV
+        """
+        response = self.client.get(self.url, {'type': 'csv'})
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        assert [row['title'] for row in rows] == [goal.title for goal in self.goals]
+        assert rows[0]['description'] == ''
+
+        response = self.client.get(self.url, {'type': 'csv', 'comments': 'true'})
+        rows = list(csv.DictReader(io.StringIO(self.content(response))))
+        assert rows[-1]['type'] == 'comment'
+        assert rows[-1]['text'] == self.comment.text
+
+    def test_access(self):
+        """
+        Проверка выгрузки только участнику доски и неверного формата
+        """
+        assert self.client.get(self.url, {'type': 'xml'}).status_code == 400
+
+        other = User.objects.create_user(username='other_user', password='qwerty')
+        self.client.force_authenticate(other)
+        assert self.client.get(self.url).status_code == 403
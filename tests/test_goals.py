@@ -1,4 +1,8 @@
+import json
+
+from django.db import connection
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 
 from core.models import User
@@ -66,3 +70,126 @@ class GoalApiTestCase(APITestCase):
         response = self.test_client.get(url)
         assert response.status_code == 200
         assert response.data.get('id') == goal.id
+
+    def test_goal_search(self):
+        """
+        Проверка полнотекстового поиска целей на русском и английском
+        """
+        category = self.create_category()
+        milk = Goal.objects.create(title='Купить молоко', category=category, user=self.user)
+        bread = Goal.objects.create(title='Buy bread', category=category, user=self.user)
+
+        response = self.test_client.get('/goals/goal/list', {'search': 'молока'})
+        assert response.status_code == 200
+        assert [item['id'] for item in response.data] == [milk.id]
+
+        response = self.test_client.get('/goals/goal/list', {'search': 'breads'})
+        assert [item['id'] for item in response.data] == [bread.id]
+
+    def test_goal_search_rank(self):
+        """
+        Проверка сортировки результатов поиска по релевантности
+        """
+        category = self.create_category()
+        in_description = Goal.objects.create(
+            title='Список', description='Купить молоко', category=category, user=self.user
+        )
+        in_title = Goal.objects.create(title='Молоко', category=category, user=self.user)
+
+        response = self.test_client.get('/goals/goal/list', {'search': 'молоко'})
+        assert [item['id'] for item in response.data] == [in_title.id, in_description.id]
+        assert 'search_vector' not in response.data[0]
+
+        response = self.test_client.get(
+            '/goals/goal/list', {'search': 'молоко', 'pagination': 'keyset', 'limit': 1}
+        )
+        second = self.test_client.get(response.data['next'])
+        assert [response.data['results'][0]['id'], second.data['results'][0]['id']] == [
+            in_title.id, in_description.id
+        ]
+
+    def post_batch(self, data):
+        return self.test_client.post('/goals/goal/batch', json.dumps(data), content_type='application/json')
+
+    def test_goal_batch(self):
+        """
+        Проверка пакетного создания, изменения и архивирования целей
+        """
+        category = self.create_category()
+        other_category = GoalCategory.objects.create(
+            title='other', board=category.board, user=User.objects.create_user(username='other', password='test')
+        )
+        goal, archived = self.create_goal(), self.create_goal()
+
+        response = self.post_batch({
+            'create': [
+                {'title': 'new', 'category': category.id, 'priority': 3},
+                {'title': 'no category'},
+                {'title': 'other', 'category': other_category.id},
+                {'title': 'past', 'category': category.id, 'due_date': '2000-01-01'},
+            ],
+            'update': [{'id': goal.id, 'title': 'renamed', 'status': 2}, {'id': 0, 'title': 'missing'}],
+            'archive': [archived.id, 0],
+        })
+        assert response.status_code == 200
+        results = response.json()
+
+        assert [result['status'] for result in results['create']] == [201, 400, 403, 400]
+        assert 'category' in results['create'][1]['errors']
+        new_goal = Goal.objects.get(id=results['create'][0]['id'])
+        assert (new_goal.title, new_goal.priority, new_goal.user_id) == ('new', 3, self.user.id)
+
+        assert results['update'] == [{'id': goal.id, 'status': 200}, {'id': 0, 'status': 404}]
+        goal.refresh_from_db()
+        assert (goal.title, goal.status) == ('renamed', Goal.Status.in_progress)
+
+        assert results['archive'] == [{'id': archived.id, 'status': 204}, {'id': 0, 'status': 404}]
+        assert Goal.objects.get(id=archived.id).status == Goal.Status.archived
+
+    def test_goal_batch_queries(self):
+        """
+        Проверка числа запросов пакета, не зависящего от числа целей
+        """
+        category = self.create_category()
+        goals = [self.create_goal() for _ in range(20)]
+        data = {
+            'create': [{'title': f'goal {number}', 'category': category.id} for number in range(50)],
+            'update': [{'id': goal.id, 'description': 'text'} for goal in goals[:10]],
+            'archive': [goal.id for goal in goals[10:]],
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_batch(data)
+        assert response.status_code == 200
+        assert Goal.objects.filter(title__startswith='goal ').count() == 50
+        assert len(queries) <= 10
+
+    def test_goal_batch_limit(self):
+        """
+        Проверка ограничения размера пакета
+        """
+        response = self.post_batch({'archive': list(range(1001))})
+        assert response.status_code == 400
+
+    def test_goal_batch_malformed_items(self):
+        """
+        Проверка ответа 400/404 на элементы пакета с id и категорией не числом
+        """
+        category = self.create_category()
+        goal = self.create_goal()
+
+        response = self.post_batch({
+            'create': [
+                {'title': 'list', 'category': [category.id]},
+                {'title': 'dict', 'category': {'a': 1}},
+                {'title': 'string', 'category': str(category.id)},
+            ],
+            'update': [{'id': [goal.id], 'title': 'list'}, {'id': {'a': 1}}, {'id': str(goal.id), 'title': 'string'}],
+        })
+        assert response.status_code == 200
+        results = response.json()
+        assert [result['status'] for result in results['create']] == [400, 400, 201]
+        assert Goal.objects.get(id=results['create'][2]['id']).category_id == category.id
+        assert [result['status'] for result in results['update']] == [404, 404, 200]
+        goal.refresh_from_db()
+        assert goal.title == 'string'
@@ -0,0 +1,106 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalImport
+
+
+class ImportGoalsTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='import_user', password='qwerty')
+        cls.board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=cls.board, user=cls.user)
+        cls.category = GoalCategory.objects.create(title='work', user=cls.user, board=cls.board)
+        GoalCategory.objects.create(title='old', user=cls.user, board=cls.board, is_deleted=True)
+
+        other = User.objects.create_user(username='other_user', password='qwerty')
+        BoardParticipant.objects.create(board=cls.board, user=other, role=BoardParticipant.Role.writer)
+        GoalCategory.objects.create(title='foreign', user=other, board=cls.board)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name: str, content: str) -> str:
+        path = self.directory / name
+        path.write_text(content, encoding='utf-8')
+        return str(path)
+
+    def import_goals(self, path: str, *args: str) -> tuple[str, str]:
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_goals', path, '--user', 'import_user', *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_csv(self):
+        """
+        Проверка импорта CSV с поиском категории по названию доски и категории
+        """
+        path = self.write('goals.csv', (
+            'title,category,board,priority,due_date,description\n'
+            'first,work,board,3,,\n'
+            'second,work,,,2100-01-01,text\n'
+        ))
+        stdout, stderr = self.import_goals(path)
+
+        assert stderr == ''
+        assert 'Done: 2 goals created, 0 failed' in stdout
+        first, second = Goal.objects.order_by('id')
+        assert (first.title, first.category, first.priority, first.user) == ('first', self.category, 3, self.user)
+        assert (second.due_date.year, second.description, second.priority) == (2100, 'text', 2)
+
+    def test_validation(self):
+        """
+        Проверка правил GoalCreateSerializer для импортируемых записей
+        """
+        records = [
+            {'title': 'ok', 'category': 'work'},
+            {'title': 'past', 'category': 'work', 'due_date': '2000-01-01'},
+            {'title': 'deleted', 'category': 'old'},
+            {'title': 'foreign', 'category': 'foreign'},
+            {'title': 'unknown', 'category': 'missing'},
+            {'type': 'comment', 'text': 'skipped'},
+            {'category': 'work'},
+        ]
+        path = self.write('goals.ndjson', '\n'.join(json.dumps(record) for record in records))
+
+        with self.assertNumQueries(5):
+            stdout, stderr = self.import_goals(path, '--batch-size', '100')
+
+        assert list(Goal.objects.values_list('title', flat=True)) == ['ok']
+        assert 'Done: 1 goals created, 5 failed' in stdout
+        errors = stderr.splitlines()
+        assert [line.split(':')[0] for line in errors] == [f'record {number}' for number in (2, 3, 4, 5, 7)]
+        assert 'Date in the past' in errors[0]
+        assert 'Category not found' in errors[1]
+
+    def test_resume(self):
+        """
+        Проверка продолжения импорта с сохранённой позиции
+        """
+        lines = [json.dumps({'title': f'goal {number}', 'category': 'work'}) for number in range(5)]
+        path = self.write('goals.ndjson', '\n'.join(lines[:4] + ['{broken'] + lines[4:]))
+
+        with self.assertRaises(CommandError):
+            self.import_goals(path, '--batch-size', '2', '--name', 'backlog')
+        assert Goal.objects.count() == 4
+        assert GoalImport.objects.get(name='backlog').position == 4
+
+        self.write('goals.ndjson', '\n'.join(lines))
+        stdout, _ = self.import_goals(path, '--batch-size', '2', '--name', 'backlog')
+        assert 'Done: 1 goals created' in stdout
+        assert sorted(Goal.objects.values_list('title', flat=True)) == [f'goal {number}' for number in range(5)]
+
+    def test_unknown_user(self):
+        """
+        Проверка ошибки для неизвестного пользователя
+        """
+        with self.assertRaises(CommandError):
+            call_command('import_goals', self.write('goals.ndjson', ''), '--user', 'nobody')
@@ -0,0 +1,123 @@
+import os
+import re
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, GoalCategory, Goal
+
+GOALS_COUNT = int(os.environ.get('EXPLAIN_GOALS_COUNT', 1_000_000))
+USERS_COUNT = 1000
+
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN проверяется только на PostgreSQL')
+class ListIndexesTestCase(APITestCase):
+    """Проверка планов запросов списков на большом наборе данных"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='explain_test', password='test')
+        users = User.objects.bulk_create(
+            User(username=f'explain_{number}', password='!') for number in range(USERS_COUNT - 1)
+        )
+        board = Board.objects.create(title='explain')
+        GoalCategory.objects.bulk_create(
+            GoalCategory(title=f'category {number}', board=board, user=user, is_deleted=number % 10 == 9)
+            for number, user in enumerate([cls.user, *users])
+        )
+        cls.goal = Goal.objects.create(
+            title='goal', category=GoalCategory.objects.get(user=cls.user), user=cls.user
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH categories AS (
+                    SELECT row_number() OVER (ORDER BY id) - 1 AS number, id, user_id
+                    FROM goals_goalcategory
+                )
+                INSERT INTO goals_goal (title, category_id, user_id, status, priority, created, updated)
+                SELECT 'goal ' || series, categories.id, categories.user_id, 1 + series %% 4, 2,
+                       now() - series * interval '1 second', now()
+                FROM generate_series(1, %s) AS series
+                JOIN categories ON categories.number = series %% %s
+                """,
+                [GOALS_COUNT, USERS_COUNT],
+            )
+            cursor.execute(
+                """
+                INSERT INTO goals_goalcomment (text, goal_id, user_id, created, updated)
+                SELECT 'comment', id, user_id, created, updated
+                FROM (
+                    SELECT *, row_number() OVER (PARTITION BY user_id ORDER BY id) AS number
+                    FROM goals_goal
+                ) AS goals
+                WHERE number %% 10 = 0
+                """,
+                [],
+            )
+            cursor.execute('ANALYZE goals_goal, goals_goalcategory, goals_goalcomment')
+
+        cls.test_client = Client()
+        cls.response = cls.test_client.login(username='explain_test', password='test')
+
+    def get_plans(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.test_client.get(url)
+        assert response.status_code == 200
+
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                if 'goals_goal' not in query['sql']:
+                    continue
+                cursor.execute(f"EXPLAIN {query['sql']}")
+                plans.append('\n'.join(row[0] for row in cursor.fetchall()))
+        assert plans
+        return plans
+
+    def assert_index_scan(self, url, table, index=None):
+        plans = self.get_plans(url)
+        for plan in plans:
+            assert not re.search(rf'Seq Scan on {table}\b', plan), plan
+            assert 'Index' in plan, plan
+        if index:
+            assert any(index in plan for plan in plans), plans
+
+    def test_goal_list_by_title(self):
+        """
+        Проверка использования индекса списком целей с сортировкой по названию
+        """
+        self.assert_index_scan('/goals/goal/list?limit=20', 'goals_goal', 'goal_user_title_active_idx')
+
+    def test_goal_list_by_created(self):
+        """
+        Проверка использования индекса списком целей с сортировкой по дате создания
+        """
+        self.assert_index_scan(
+            '/goals/goal/list?limit=20&ordering=-created', 'goals_goal', 'goal_user_created_active_idx'
+        )
+
+    def test_goal_list_keyset(self):
+        """
+        Проверка использования индекса keyset-пагинацией целей
+        """
+        first = self.test_client.get('/goals/goal/list?pagination=keyset&limit=20')
+        self.assert_index_scan(first.data['next'], 'goals_goal', 'goal_user_title_active_idx')
+
+    def test_comment_list(self):
+        """
+        Проверка использования индекса списком комментариев
+        """
+        self.assert_index_scan('/goals/goal_comment/list?limit=20', 'goals_goalcomment', 'comment_user_created_idx')
+        self.assert_index_scan(f'/goals/goal_comment/list?limit=20&goal={self.goal.id}', 'goals_goalcomment')
+
+    def test_category_list(self):
+        """
+        Проверка использования индекса списком категорий
+        """
+        self.assert_index_scan('/goals/goal_category/list?limit=20', 'goals_goalcategory', 'category_user_title_idx')
@@ -0,0 +1,132 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from bot.tg.sender import RetryAfter
+from jobs.models import Job
+from jobs.queue import TASKS, JobQueue, Retry, Task, task
+
+calls = []
+
+
+@task('tests.record')
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task('tests.flaky', max_attempts=2)
+def flaky() -> None:
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS_ENABLED=True, JOBS_RETRY_BACKOFF=10)
+class JobQueueTestCase(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    @override_settings(JOBS_ENABLED=False)
+    def test_eager(self):
+        """
+        Проверка выполнения задачи после фиксации транзакции без очереди
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            assert record.enqueue(value=2) is None
+            assert calls == []
+        assert calls == [2]
+        assert not Job.objects.exists()
+
+    def test_claim(self):
+        """
+        Проверка выдачи только готовых и неарендованных задач
+        """
+        ready = record.enqueue(value=1)
+        record.enqueue(delay=60, value=2)
+        queue = JobQueue(lease=30)
+
+        jobs = queue.claim(limit=10)
+        assert [job.id for job in jobs] == [ready.id]
+        assert jobs[0].attempts == 1
+        assert queue.claim(limit=10) == []
+
+        Job.objects.filter(id=ready.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+        assert [job.id for job in queue.claim(limit=10)] == [ready.id]
+
+    def test_retry_backoff(self):
+        """
+        Проверка повтора с задержкой и пометки failed после исчерпания попыток
+        """
+        job = flaky.enqueue()
+        queue = JobQueue()
+
+        started = timezone.now()
+        assert not queue.run(queue.claim(limit=1)[0])
+        job.refresh_from_db()
+        assert not job.failed
+        assert job.locked_until is None
+        assert started + timedelta(seconds=8) < job.run_at < started + timedelta(seconds=12)
+        assert 'RuntimeError: boom' in job.last_error
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        assert not queue.run(queue.claim(limit=1)[0])
+        job.refresh_from_db()
+        assert job.failed
+        assert queue.claim(limit=1) == []
+
+    def test_retry_after(self):
+        """
+        Проверка задержки повтора из ответа 429 Telegram
+        """
+        job = TASKS['bot.send_message'].enqueue(chat_id=10, text='text')
+        queue = JobQueue()
+
+        with mock.patch('bot.tasks.get_tg_client') as get_client:
+            get_client.return_value.send_message.side_effect = RetryAfter(30)
+            started = timezone.now()
+            assert not queue.run(queue.claim(limit=1)[0])
+        get_client.return_value.send_message.assert_called_once_with(chat_id=10, text='text')
+
+        job.refresh_from_db()
+        assert started + timedelta(seconds=29) < job.run_at < started + timedelta(seconds=31)
+
+    def test_retry_exception(self):
+        """
+        Проверка Retry без задержки: обычный backoff
+        """
+        assert Retry().delay is None
+        assert Retry(5).delay == 5
+
+
+@override_settings(JOBS_ENABLED=True)
+class RunWorkerTestCase(TransactionTestCase):
+    """Обработчики runworker работают в своих потоках и соединениях, поэтому без транзакции теста"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_run(self):
+        """
+        Проверка выполнения и удаления задач обработчиком
+        """
+        for value in range(5):
+            record.enqueue(value=value)
+
+        call_command('runworker', '--once', '--concurrency', '2', stdout=StringIO())
+        assert sorted(calls) == [0, 1, 2, 3, 4]
+        assert not Job.objects.exists()
+
+    def test_unknown_task(self):
+        """
+        Проверка задачи без зарегистрированной функции
+        """
+        Task(record.func, 'tests.missing').enqueue(value=1)
+        stderr = StringIO()
+        call_command('runworker', '--once', stdout=StringIO(), stderr=stderr)
+        job = Job.objects.get()
+        assert job.failed
+        assert job.last_error == 'Unknown task tests.missing'
+        assert 'failed' in stderr.getvalue()
@@ -0,0 +1,130 @@
+import io
+import logging
+import os
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.log_handlers import QueuedHandler
+from core.middleware import password_fields
+from core.models import User
+
+
+@override_settings(REQUEST_LOG_SAMPLE_RATE=0, REQUEST_LOG_ROUTE_RATES={}, REQUEST_LOG_MAX_BODY=2000)
+class RequestLoggingTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='log_user', password='qwerty')
+
+    def test_error_redacted(self):
+        """
+        Проверка лога ошибки со скрытыми паролями
+        """
+        data = {'username': 'log_user', 'password': 'secret "value"', 'password_repeat': 'other'}
+        with self.assertLogs('core.middleware', level='WARNING') as logs:
+            response = self.client.post('/core/signup', data, format='json')
+        assert response.status_code == 400
+
+        [message] = logs.output
+        assert message.startswith('WARNING:core.middleware:POST /core/signup 400')
+        assert '"password":"***"' in message.replace(' ', '')
+        assert '"password_repeat":"***"' in message.replace(' ', '')
+        assert 'secret' not in message and 'other' not in message
+        assert '"username"' in message
+
+    def test_form_redacted(self):
+        """
+        Проверка скрытия пароля в теле формы
+        """
+        with self.assertLogs('core.middleware') as logs:
+            self.client.generic(
+                'POST', '/core/login', 'username=log_user&password=wrong',
+                content_type='application/x-www-form-urlencoded',
+            )
+        assert 'password=***' in logs.output[0]
+        assert 'wrong' not in logs.output[0]
+
+    def test_not_sampled(self):
+        """
+        Проверка отсутствия записи об успешном запросе вне выборки
+        """
+        self.client.force_authenticate(self.user)
+        with self.assertNoLogs('core.middleware'):
+            assert self.client.get('/core/profile').status_code == 200
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATE=1, REQUEST_LOG_MAX_BODY=20)
+    def test_sampled_truncated(self):
+        """
+        Проверка записи сэмплированного запроса с обрезанным телом ответа
+        """
+        self.client.force_authenticate(self.user)
+        with self.assertLogs('core.middleware', level='INFO') as logs:
+            response = self.client.get('/core/profile')
+
+        [message] = logs.output
+        assert message.startswith('INFO:core.middleware:GET /core/profile 200')
+        assert f'user={self.user.id}' in message
+        assert f'response={response.content[:20].decode()}... <{len(response.content)} bytes>' in message
+
+    @override_settings(REQUEST_LOG_SAMPLE_RATE=1, REQUEST_LOG_ROUTE_RATES={'/core/': 1, '/core/profile': 0})
+    def test_route_rates(self):
+        """
+        Проверка ставки выборки по самому длинному префиксу пути
+        """
+        self.client.force_authenticate(self.user)
+        with self.assertNoLogs('core.middleware'):
+            self.client.get('/core/profile')
+
+
+class QueuedHandlerTestCase(SimpleTestCase):
+
+    def test_password_fields(self):
+        """
+        Проверка сбора полей PasswordField из core.serializers
+        """
+        assert password_fields() == {'password', 'password_repeat', 'old_password', 'new_password'}
+
+    def test_background_write(self):
+        """
+        Проверка записи в фоновом потоке и отбрасывания при переполнении очереди
+        """
+        stream = io.StringIO()
+        handler = QueuedHandler(stream=stream)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        logger = logging.getLogger('tests.queued')
+        logger.addHandler(handler)
+        self.addCleanup(logger.removeHandler, handler)
+        try:
+            logger.warning('hello %s', 'world')
+            handler.flush()
+            assert stream.getvalue() == 'WARNING hello world\n'
+        finally:
+            handler.close()
+
+        handler = QueuedHandler(stream=stream, maxsize=1)
+        handler.listener.stop()
+        try:
+            record = logging.LogRecord('tests', logging.INFO, __file__, 1, 'message', None, None)
+            handler.handle(record)
+            handler.handle(record)
+            assert handler.dropped == 1
+        finally:
+            handler.close()
+
+    def test_after_fork(self):
+        """
+        Проверка записи из дочернего процесса после fork (gunicorn с preload_app)
+        """
+        with tempfile.NamedTemporaryFile('r') as file:
+            handler = QueuedHandler('logging.FileHandler', filename=file.name)
+            self.addCleanup(handler.close)
+            pid = os.fork()
+            if pid == 0:
+                record = logging.LogRecord('tests', logging.INFO, __file__, 1, 'from child', None, None)
+                handler.handle(record)
+                handler.flush()
+                os._exit(0)
+            os.waitpid(pid, 0)
+            assert file.read() == 'from child\n'
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.metrics import metrics
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory
+
+
+@override_settings(METRICS_SERVER_TIMING=True)
+class QueryMetricsTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='metrics_user', password='qwerty')
+        board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=board, user=cls.user)
+        category = GoalCategory.objects.create(title='category', user=cls.user, board=board)
+        Goal.objects.create(title='goal', category=category, user=cls.user)
+
+    def setUp(self):
+        metrics.reset()
+        self.client.force_authenticate(self.user)
+
+    def test_server_timing(self):
+        """
+        Проверка заголовка Server-Timing с числом SQL-запросов
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/goals/goal/list')
+
+        timing = dict(part.strip().split(';', 1) for part in response['Server-Timing'].split(','))
+        assert set(timing) == {'db', 'serialize', 'render', 'total'}
+        assert f'desc="{len(queries)} queries"' in timing['db']
+
+    def test_metrics_endpoint(self):
+        """
+        Проверка метрик представления в формате Prometheus
+        """
+        self.client.get('/goals/goal/list')
+        self.client.get('/goals/goal/list')
+        self.client.get('/goals/goal/0')
+
+        response = self.client.get('/metrics')
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        lines = response.content.decode().splitlines()
+        assert 'todolist_requests_total{view="goals:goal-list",method="GET",status="2xx"} 2' in lines
+        assert 'todolist_requests_total{view="goals:goal",method="GET",status="4xx"} 1' in lines
+        assert 'todolist_request_duration_seconds_count{view="goals:goal-list"} 2' in lines
+        assert any(line.startswith('todolist_db_queries_total{view="goals:goal-list"}') for line in lines)
+        assert any(line.startswith('todolist_response_bytes_total{view="goals:goal-list"}') for line in lines)
+
+        assert self.client.get('/metrics', REMOTE_ADDR='10.0.0.1').status_code == 404
+
+    @override_settings(METRICS_SLOW_QUERY_MS=0, METRICS_QUERY_COUNT_WARNING=0)
+    def test_slow_queries(self):
+        """
+        Проверка лога медленных запросов и превышения числа запросов с именем представления
+        """
+        with self.assertLogs('core.metrics', level='WARNING') as logs:
+            self.client.get('/goals/goal/list')
+
+        assert any(message.startswith('WARNING:core.metrics:Slow query') and 'goals:goal-list' in message
+                   for message in logs.output)
+        assert any('queries in GET /goals/goal/list (goals:goal-list)' in message for message in logs.output)
@@ -0,0 +1,116 @@
+import json
+from base64 import urlsafe_b64encode
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, GoalCategory, Goal, GoalComment
+
+
+class KeysetPaginationApiTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='keyset_test', password='test', is_superuser=True)
+        cls.test_client = Client()
+        cls.response = cls.test_client.login(username='keyset_test', password='test')
+
+        board = Board.objects.create(title='test')
+        BoardParticipant.objects.create(board=board, user=cls.user)
+        cls.category = GoalCategory.objects.create(title='category', board=board, user=cls.user)
+        cls.goals = [
+            Goal.objects.create(title=title, category=cls.category, user=cls.user)
+            for title in ('b', 'a', 'c', 'a', 'd')
+        ]
+
+    def collect_pages(self, url):
+        ids, pages = [], 0
+        while url:
+            response = self.test_client.get(url)
+            assert response.status_code == 200
+            ids += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+            pages += 1
+        return ids, pages
+
+    def test_goals_keyset_pages(self):
+        """
+        Проверка обхода целей по курсору с сортировкой по названию и id
+        """
+        ids, pages = self.collect_pages('/goals/goal/list?pagination=keyset&limit=2')
+        expected = [goal.id for goal in sorted(self.goals, key=lambda goal: (goal.title, goal.id))]
+        assert ids == expected
+        assert pages == 3
+
+    def test_goals_keyset_desc_ordering(self):
+        """
+        Проверка обхода целей по курсору при обратной сортировке по дате создания
+        """
+        ids, _ = self.collect_pages('/goals/goal/list?pagination=keyset&limit=2&ordering=-created')
+        expected = [goal.id for goal in sorted(self.goals, key=lambda goal: (goal.created, goal.id), reverse=True)]
+        assert ids == expected
+
+    def test_goals_keyset_previous_page(self):
+        """
+        Проверка возврата на предыдущую страницу по курсору
+        """
+        first = self.test_client.get('/goals/goal/list?pagination=keyset&limit=2')
+        second = self.test_client.get(first.data['next'])
+        previous = self.test_client.get(second.data['previous'])
+        assert previous.status_code == 200
+        assert previous.data['results'] == first.data['results']
+        assert previous.data['previous'] is None
+
+    def test_keyset_skips_count_and_offset(self):
+        """
+        Проверка отсутствия COUNT(*) и OFFSET в запросах keyset-пагинации
+        """
+        first = self.test_client.get('/goals/goal/list?pagination=keyset&limit=2')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.test_client.get(first.data['next'])
+        assert response.status_code == 200
+        sql = ' '.join(query['sql'] for query in queries.captured_queries).upper()
+        assert 'COUNT(' not in sql
+        assert 'OFFSET' not in sql
+
+    def test_invalid_cursor(self):
+        """
+        Проверка ответа на некорректный курсор
+        """
+        response = self.test_client.get('/goals/goal/list?cursor=broken')
+        assert response.status_code == 404
+
+    def test_malformed_cursor_position(self):
+        """
+        Проверка ответа 404 на курсор с верной сортировкой и некорректной позицией
+        """
+        for ordering, position in (
+            (['title', 'id'], 1),
+            (['title', 'id'], ['x', 'notanint']),
+            (['title', 'id'], [{'a': 1}, 1]),
+            (['-created', '-id'], ['garbage', 1]),
+        ):
+            cursor = urlsafe_b64encode(json.dumps({'p': position, 'r': 0, 'o': ordering}).encode()).decode()
+            query = 'ordering=-created&' if ordering[0] == '-created' else ''
+            with self.subTest(position=position):
+                response = self.test_client.get(f'/goals/goal/list?{query}cursor={cursor}')
+                assert response.status_code == 404
+
+    def test_comments_keyset_pages(self):
+        """
+        Проверка обхода комментариев по курсору
+        """
+        comments = [GoalComment.objects.create(text=str(i), goal=self.goals[0], user=self.user) for i in range(3)]
+        ids, _ = self.collect_pages('/goals/goal_comment/list?pagination=keyset&limit=2')
+        assert ids == [comment.id for comment in sorted(comments, key=lambda c: (c.created, c.id), reverse=True)]
+
+    def test_limit_offset_by_default(self):
+        """
+        Проверка сохранения limit/offset пагинации по умолчанию
+        """
+        response = self.test_client.get('/goals/goal_category/list?limit=1')
+        assert response.status_code == 200
+        assert response.data['count'] == 1
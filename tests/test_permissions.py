@@ -0,0 +1,79 @@
+from django.test import Client
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant
+from goals.permissions import BoardRolesCache, board_roles_cache
+
+
+class BoardPermissionsTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='perm_test', password='test')
+        cls.test_client = Client()
+        cls.response = cls.test_client.login(username='perm_test', password='test')
+
+    def create_board(self, role=BoardParticipant.Role.owner):
+        board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=board, user=self.user, role=role)
+        return board
+
+    def test_reader_cannot_update_board(self):
+        """
+        Проверка запрета изменения доски читателем
+        """
+        board = self.create_board(role=BoardParticipant.Role.reader)
+        url = f'/goals/board/{board.id}'
+        assert self.test_client.get(url).status_code == 200
+        response = self.test_client.delete(url)
+        assert response.status_code == 403
+
+    def test_not_participant(self):
+        """
+        Проверка отсутствия доступа к чужой доске
+        """
+        board = Board.objects.create(title='board')
+        response = self.test_client.get(f'/goals/board/{board.id}')
+        assert response.status_code == 403
+
+    def test_roles_cache(self):
+        """
+        Проверка LRU-кэша ролей и его сброса при изменении участника
+        """
+        board = self.create_board(role=BoardParticipant.Role.reader)
+        cache = BoardRolesCache(maxsize=10)
+
+        with self.assertNumQueries(1):
+            assert cache.get(self.user.id) == {board.id: BoardParticipant.Role.reader}
+            assert cache.get(self.user.id) == {board.id: BoardParticipant.Role.reader}
+
+        BoardParticipant.objects.filter(board=board).update(role=BoardParticipant.Role.writer)
+        cache.invalidate(self.user.id)
+        assert cache.get(self.user.id) == {board.id: BoardParticipant.Role.writer}
+
+    def test_roles_cache_eviction(self):
+        """
+        Проверка вытеснения давно использованных записей из кэша ролей
+        """
+        other = User.objects.create_user(username='perm_other', password='test')
+        cache = BoardRolesCache(maxsize=1)
+        cache.get(self.user.id)
+        cache.get(other.id)
+        with self.assertNumQueries(1):
+            cache.get(self.user.id)
+
+    def test_roles_cache_signal_invalidation(self):
+        """
+        Проверка сброса общего кэша ролей сигналом сохранения участника
+        """
+        board = self.create_board(role=BoardParticipant.Role.reader)
+        board_roles_cache.maxsize = 10
+        try:
+            assert self.test_client.delete(f'/goals/board/{board.id}').status_code == 403
+            BoardParticipant.objects.filter(board=board).get().delete()
+            BoardParticipant.objects.create(board=board, user=self.user, role=BoardParticipant.Role.owner)
+            assert self.test_client.delete(f'/goals/board/{board.id}').status_code == 204
+        finally:
+            board_roles_cache.maxsize = 0
+            board_roles_cache.clear()
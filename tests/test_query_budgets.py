@@ -0,0 +1,121 @@
+import pytest
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.urls import urlpatterns
+from tests.query_budget import QueryBudgetExceeded, count_queries, query_budget
+
+# Размеры наборов данных: число запросов не должно зависеть от N
+SMALL, LARGE = 1, 15
+
+# Бюджет SQL-запросов на эндпоинт списка или объекта из goals/urls.py
+BUDGETS = {
+    'board-list': 1,
+    'board': 4,
+    'board-export': 4,
+    'category-list': 1,
+    'goal-category': 1,
+    'goal-list': 2,
+    'goal': 2,
+    'comment-list': 2,
+    'comment': 2,
+}
+# Эндпоинты без GET
+WRITE_ONLY = {'create-board', 'create-category', 'create-goal', 'goal-batch', 'comment-create'}
+
+
+def make_dataset(username: str, size: int) -> dict[str, str]:
+    """N досок, участников, категорий, целей и комментариев; URL эндпоинтов для этого набора"""
+    user = User.objects.create_user(username=username, password='qwerty')
+    boards = Board.objects.bulk_create(Board(title=f'{username} {number}') for number in range(size))
+    BoardParticipant.objects.bulk_create(BoardParticipant(board=board, user=user) for board in boards)
+    others = User.objects.bulk_create(User(username=f'{username}_{number}') for number in range(size))
+    BoardParticipant.objects.bulk_create(
+        BoardParticipant(board=boards[0], user=other, role=BoardParticipant.Role.reader) for other in others
+    )
+    categories = GoalCategory.objects.bulk_create(
+        GoalCategory(title=f'category {number}', board=board, user=user) for number, board in enumerate(boards)
+    )
+    goals = Goal.objects.bulk_create(
+        Goal(title=f'goal {number}', category=categories[0], user=user) for number in range(size)
+    )
+    comments = GoalComment.objects.bulk_create(
+        GoalComment(text=f'comment {number}', goal=goals[0], user=user) for number in range(size)
+    )
+    return {
+        'board-list': '/goals/board/list',
+        'board': f'/goals/board/{boards[0].id}',
+        'board-export': f'/goals/board/{boards[0].id}/export?comments=true',
+        'category-list': '/goals/goal_category/list',
+        'goal-category': f'/goals/goal_category/{categories[0].id}',
+        'goal-list': '/goals/goal/list',
+        'goal': f'/goals/goal/{goals[0].id}',
+        'comment-list': '/goals/goal_comment/list',
+        'comment': f'/goals/goal_comment/{comments[0].id}',
+    }
+
+
+class QueryBudgetTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.datasets = {size: make_dataset(f'budget_{size}', size) for size in (SMALL, LARGE)}
+        cls.users = {size: User.objects.get(username=f'budget_{size}') for size in (SMALL, LARGE)}
+
+    def fetch(self, url: str) -> None:
+        response = self.client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+        # выгрузка читает БД, пока отдаётся тело
+        if response.streaming:
+            b''.join(response.streaming_content)
+
+    def test_all_endpoints_budgeted(self):
+        """
+        Проверка, что у каждого эндпоинта чтения из goals/urls.py есть бюджет
+        """
+        names = {pattern.name for pattern in urlpatterns} - WRITE_ONLY
+        assert names == set(BUDGETS)
+
+    def test_budgets(self):
+        """
+        Проверка бюджета запросов и его независимости от размера данных
+        """
+        for name, budget in BUDGETS.items():
+            counts = {}
+            for size, urls in self.datasets.items():
+                self.client.force_authenticate(self.users[size])
+                counts[size] = count_queries(lambda: self.fetch(urls[name]))
+            with self.subTest(endpoint=name):
+                assert counts[SMALL] == counts[LARGE], f'{name}: queries grow with data size {counts}'
+                assert counts[LARGE] <= budget, f'{name}: {counts[LARGE]} queries, budget is {budget}'
+
+    def test_budget_exceeded(self):
+        """
+        Проверка ошибки с перечнем запросов при превышении бюджета
+        """
+        with self.assertRaises(QueryBudgetExceeded) as error:
+            with query_budget(1):
+                list(User.objects.all())
+                list(Board.objects.all())
+        assert '2 queries executed, budget is 1' in str(error.exception)
+        assert 'goals_board' in str(error.exception)
+
+    @query_budget(1)
+    def test_decorator(self):
+        """
+        Проверка бюджета, заданного декоратором теста
+        """
+        assert User.objects.filter(username=f'budget_{SMALL}').exists()
+
+
+@pytest.mark.django_db
+def test_query_budget_fixture(query_budget, client, goal_comment):
+    """
+    Проверка фикстуры query_budget на данных фабрик (tests.factories)
+    """
+    goal = goal_comment.goal
+    BoardParticipant.objects.create(board=goal.category.board, user=goal.user)
+    client.force_login(goal.user)
+    with query_budget(BUDGETS['goal'] + 2):  # + сессия и пользователь
+        assert client.get(f'/goals/goal/{goal.id}').status_code == 200
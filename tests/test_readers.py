@@ -0,0 +1,71 @@
+from datetime import date
+
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import User
+from goals.models import Board, BoardParticipant, Goal, GoalCategory, GoalComment
+from goals.readers import get_reader
+from goals.serializers import BoardSerializer, GoalSerializer
+
+
+class ValuesReaderTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='reader_user', password='qwerty', first_name='Имя', email='reader@example.com'
+        )
+        board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=board, user=cls.user)
+        for number in range(3):
+            category = GoalCategory.objects.create(title=f'category {number}', user=cls.user, board=board)
+            for goal_number in range(4):
+                goal = Goal.objects.create(
+                    title=f'goal {number}-{goal_number}',
+                    description='описание' if goal_number % 2 else None,
+                    due_date=date(2030, 1, goal_number + 1) if goal_number else None,
+                    priority=goal_number % 4 + 1,
+                    category=category,
+                    user=cls.user,
+                )
+                GoalComment.objects.create(text=f'comment {goal_number}', goal=goal, user=cls.user)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def assert_same_content(self, url, params=None):
+        fast = self.client.get(url, params)
+        with override_settings(LIST_VALUES_READER=False):
+            slow = self.client.get(url, params)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+        return fast
+
+    def test_goal_list(self):
+        """
+        Проверка совпадения ответа списка целей с ответом сериализатора
+        """
+        url = '/goals/goal/list'
+        assert len(self.assert_same_content(url).json()) == 12
+        self.assert_same_content(url, {'ordering': '-created', 'limit': 5, 'offset': 2})
+        self.assert_same_content(url, {'search': 'описание'})
+
+        page = self.assert_same_content(url, {'pagination': 'keyset', 'limit': 5, 'ordering': 'created'}).json()
+        self.assert_same_content(page['next'])
+
+    def test_category_and_comment_lists(self):
+        """
+        Проверка совпадения ответов списков категорий и комментариев
+        """
+        self.assert_same_content('/goals/goal_category/list')
+        self.assert_same_content('/goals/goal_category/list', {'ordering': '-created', 'limit': 2})
+        self.assert_same_content('/goals/goal_comment/list')
+        self.assert_same_content('/goals/goal_comment/list', {'goal': Goal.objects.first().id})
+
+    def test_unsupported_serializer(self):
+        """
+        Проверка отказа от быстрого пути для вложенных списков
+        """
+        assert get_reader(GoalSerializer) is not None
+        assert get_reader(BoardSerializer) is None
@@ -0,0 +1,70 @@
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+from core.models import User
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from goals.models import Board, BoardParticipant, Goal, GoalCategory
+from goals.serializers import GoalSerializer
+
+
+class FastJSONTestCase(SimpleTestCase):
+
+    def assert_same(self, data, media_type=None):
+        assert FastJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
+
+    def test_render_types(self):
+        """
+        Проверка совпадения вывода с JSONRenderer для дат, IntegerChoices и прочих типов
+        """
+        self.assert_same({
+            'status': Goal.Status.done,
+            'priority': Goal.Priority.critical,
+            'due_date': date(2030, 1, 2),
+            'created': datetime(2030, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'local': datetime(2030, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=3))),
+            'naive': datetime(2030, 1, 2, 3, 4, 5),
+            'decimal': Decimal('1.50'),
+            'lazy': gettext_lazy('Active'),
+            'text': 'цель строка',
+            1: [None, True, 1.5],
+        })
+        self.assert_same(ReturnDict({'id': 1}, serializer=None))
+        self.assert_same({'id': 1}, 'application/json; indent=4')
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_parse(self):
+        """
+        Проверка разбора JSON и ошибок разбора
+        """
+        body = '{"title": "цель", "status": 1}'.encode()
+        assert FastJSONParser().parse(BytesIO(body)) == JSONParser().parse(BytesIO(body))
+        for invalid in (b'{"title": ', b'{"value": NaN}'):
+            with self.assertRaises(ParseError):
+                FastJSONParser().parse(BytesIO(invalid))
+
+
+class FastJSONApiTestCase(APITestCase):
+
+    def test_goal_list(self):
+        """
+        Проверка совпадения отрендеренного списка целей
+        """
+        user = User.objects.create_user(username='json_user', password='qwerty', first_name='Имя')
+        board = Board.objects.create(title='board')
+        BoardParticipant.objects.create(board=board, user=user)
+        category = GoalCategory.objects.create(title='category', user=user, board=board)
+        for number in range(3):
+            Goal.objects.create(title=f'goal {number}', category=category, user=user, due_date=date(2030, 1, 1))
+
+        data = GoalSerializer(Goal.objects.select_related('user'), many=True).data
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
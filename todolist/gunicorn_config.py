@@ -0,0 +1,78 @@
+"""
+Конфигурация gunicorn: gunicorn --config python:todolist.gunicorn_config
+
+APP_SERVER выбирает режим:
+    wsgi — todolist.wsgi с воркерами GUNICORN_WORKER_CLASS (по умолчанию gthread:
+           2 * CPU + 1 процесс, в каждом GUNICORN_THREADS потоков);
+    asgi — todolist.asgi с uvicorn.workers.UvicornWorker (пакет uvicorn).
+Для GUNICORN_WORKER_CLASS=gevent нужны пакеты gevent и psycogreen
+(psycopg2 иначе блокирует весь процесс на запросах к БД).
+
+Приложение загружается в мастере до fork (preload_app, кроме gevent), воркеры
+делят импортированный код через copy-on-write и перезапускаются после
+GUNICORN_MAX_REQUESTS запросов (± jitter), чтобы не копить память.
+"""
+import multiprocessing
+import os
+
+import environ
+
+env = environ.Env()
+environ.Env.read_env(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env'))
+
+APP_SERVER = env.str('APP_SERVER', default='wsgi')
+if APP_SERVER not in ('wsgi', 'asgi'):
+    raise ValueError(f'APP_SERVER must be wsgi or asgi, got {APP_SERVER!r}')
+
+cpus = multiprocessing.cpu_count()
+
+bind = env.str('GUNICORN_BIND', default='0.0.0.0:8000')
+if APP_SERVER == 'asgi':
+    wsgi_app = 'todolist.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'todolist.wsgi:application'
+    worker_class = env.str('GUNICORN_WORKER_CLASS', default='gthread')
+
+# sync, gthread и uvicorn: 2 * CPU + 1 процесс (ожидание БД перекрывается другими процессами).
+# Потоки gthread добавляют конкурентность без копий памяти. Представления синхронные,
+# и под ASGI Django 4.0 выполняет их в одном потоке на процесс (sync_to_async с
+# thread_sensitive=True): воркер uvicorn обслуживает один запрос за раз, как sync.
+# gevent конкурентен внутри процесса: процесс на CPU
+if worker_class == 'gevent':
+    workers = env.int('GUNICORN_WORKERS', default=cpus)
+else:
+    workers = env.int('GUNICORN_WORKERS', default=2 * cpus + 1)
+threads = env.int('GUNICORN_THREADS', default=2 if worker_class == 'gthread' else 1)
+# Одновременных соединений на воркер gevent
+worker_connections = env.int('GUNICORN_WORKER_CONNECTIONS', default=1000)
+
+# Соединение с прокси держится между запросами столько секунд
+keepalive = env.int('GUNICORN_KEEPALIVE', default=5)
+timeout = env.int('GUNICORN_TIMEOUT', default=30)
+graceful_timeout = env.int('GUNICORN_GRACEFUL_TIMEOUT', default=30)
+max_requests = env.int('GUNICORN_MAX_REQUESTS', default=1000)
+max_requests_jitter = env.int('GUNICORN_MAX_REQUESTS_JITTER', default=100)
+# gevent патчит стандартную библиотеку при запуске воркера: загруженные до этого Django,
+# requests, psycopg2 и поток QueuedHandler остались бы непропатченными
+preload_app = worker_class != 'gevent' and env.bool('GUNICORN_PRELOAD', default=True)
+
+accesslog = env.str('GUNICORN_ACCESS_LOG', default=None)
+errorlog = '-'
+# Временные файлы контроля воркеров в памяти, а не на диске контейнера
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def pre_fork(server, worker) -> None:
+    # соединения с БД, открытые при загрузке приложения, не должны достаться воркерам
+    if preload_app:
+        from django.db import connections
+
+        connections.close_all()
+
+
+def post_fork(server, worker) -> None:
+    if worker_class == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
@@ -46,24 +46,26 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'django_filters',
     'social_django',
     'bot',
     'core',
     'goals',
-
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.metrics.QueryMetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'request_logging.middleware.LoggingMiddleware',
+    'core.middleware.RequestLoggingMiddleware',
 ]
 
 ROOT_URLCONF = 'todolist.urls'
@@ -86,6 +88,57 @@ TEMPLATES = [
 ]
 
 
+# Лог запросов (core.middleware): ошибки всегда, успешные запросы — выборкой
+REQUEST_LOG_SAMPLE_RATE = env.float('REQUEST_LOG_SAMPLE_RATE', default=0.01)
+# Доля логируемых успешных запросов по префиксу пути (самый длинный совпавший префикс)
+REQUEST_LOG_ROUTE_RATES = {
+    '/goals/goal/list': 0.001,
+    '/goals/goal_comment/list': 0.001,
+    '/goals/board/': 0.001,
+    '/bot/webhook': 0,
+}
+# Тела запроса и ответа в логе обрезаются до стольких байт
+REQUEST_LOG_MAX_BODY = env.int('REQUEST_LOG_MAX_BODY', default=2000)
+# Скрываемые поля тел в дополнение к PasswordField из core.serializers
+REQUEST_LOG_REDACT_FIELDS = ['verification_code', 'token', 'secret']
+
+# Метрики запросов (core.metrics): число и время SQL, время сериализации и рендеринга по представлениям
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+# Заголовок Server-Timing в ответах (включать на стенде: раскрывает время работы с БД)
+METRICS_SERVER_TIMING = env.bool('METRICS_SERVER_TIMING', default=False)
+# SQL-запросы дольше стольких миллисекунд пишутся в лог с именем представления
+METRICS_SLOW_QUERY_MS = env.float('METRICS_SLOW_QUERY_MS', default=100)
+# Предупреждение в лог, если запрос выполнил больше стольких SQL (N+1)
+METRICS_QUERY_COUNT_WARNING = env.int('METRICS_QUERY_COUNT_WARNING', default=50)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'request': {'format': '%(asctime)s %(levelname)s %(message)s'},
+    },
+    'handlers': {
+        # запись в stderr в фоновом потоке: запрос не ждёт ввода-вывода
+        'requests': {
+            'class': 'core.log_handlers.QueuedHandler',
+            'formatter': 'request',
+            'maxsize': env.int('REQUEST_LOG_QUEUE_SIZE', default=10000),
+        },
+    },
+    'loggers': {
+        'core.metrics': {
+            'handlers': ['requests'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+        'core.middleware': {
+            'handlers': ['requests'],
+            'level': env.str('REQUEST_LOG_LEVEL', default='INFO'),
+            'propagate': False,
+        },
+    },
+}
+
 WSGI_APPLICATION = 'todolist.wsgi.application'
 
 DATABASES = {
@@ -99,6 +152,22 @@ DATABASES = {
     }
 }
 
+# Кэш ответов списков (goals.cache). LocMemCache — LRU в памяти процесса,
+# при нескольких процессах нужен общий бэкенд: FileBasedCache или DatabaseCache
+# (python manage.py createcachetable)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': {
+        'BACKEND': env.str('RESPONSE_CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': env.str('RESPONSE_CACHE_LOCATION', default='responses'),
+        'OPTIONS': {'MAX_ENTRIES': env.int('RESPONSE_CACHE_MAX_ENTRIES', default=10000)},
+    },
+}
+# Время жизни закэшированного ответа, секунды (0 — кэш выключен)
+RESPONSE_CACHE_TIMEOUT = env.int('RESPONSE_CACHE_TIMEOUT', default=0)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -150,6 +219,66 @@ AUTHENTICATION_BACKENDS = (
     'django.contrib.auth.backends.ModelBackend',
 )
 
-REST_FRAMEWORK = {'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination'}
+# JSON API: stdlib (json) или orjson (core.renderers, без установленного orjson — тот же json)
+API_JSON_BACKEND = env.str('API_JSON_BACKEND', default='stdlib')
+API_JSON_CLASSES = {
+    'stdlib': ('rest_framework.renderers.JSONRenderer', 'rest_framework.parsers.JSONParser'),
+    'orjson': ('core.renderers.FastJSONRenderer', 'core.parsers.FastJSONParser'),
+}
+JSON_RENDERER_CLASS, JSON_PARSER_CLASS = API_JSON_CLASSES[API_JSON_BACKEND]
+
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        JSON_RENDERER_CLASS,
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        JSON_PARSER_CLASS,
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Режим пагинации списков целей, категорий и комментариев: limit_offset или keyset
+LIST_PAGINATION_MODE = env.str('LIST_PAGINATION_MODE', default='limit_offset')
+# Списки целей, категорий и комментариев читаются через values() без ModelSerializer (goals.readers)
+LIST_VALUES_READER = env.bool('LIST_VALUES_READER', default=True)
+
+# Строк за одну выборку серверного курсора при выгрузке доски (goals.export)
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=2000)
+
+# Каскадное архивирование при удалении доски или категории (goals.cascade): строк в одной транзакции
+CASCADE_BATCH_SIZE = env.int('CASCADE_BATCH_SIZE', default=1000)
+
+# Очередь отложенных задач (jobs.queue, manage.py runworker).
+# False — задачи выполняются сразу после фиксации транзакции в процессе запроса
+JOBS_ENABLED = env.bool('JOBS_ENABLED', default=False)
+# Задач одновременно в одном процессе runworker
+JOBS_CONCURRENCY = env.int('JOBS_CONCURRENCY', default=4)
+# Попыток на задачу и задержка перед повтором: JOBS_RETRY_BACKOFF * 2^(попытка-1), не больше _MAX (секунды)
+JOBS_MAX_ATTEMPTS = env.int('JOBS_MAX_ATTEMPTS', default=5)
+JOBS_RETRY_BACKOFF = env.int('JOBS_RETRY_BACKOFF', default=10)
+JOBS_RETRY_BACKOFF_MAX = env.int('JOBS_RETRY_BACKOFF_MAX', default=3600)
+# Аренда задачи обработчиком, секунды: по истечении задачу упавшего процесса заберёт другой
+JOBS_LEASE = env.int('JOBS_LEASE', default=600)
+
+# Размер процессного LRU-кэша ролей на досках (0 — роли читаются один раз за запрос)
+BOARD_ROLES_CACHE_SIZE = env.int('BOARD_ROLES_CACHE_SIZE', default=0)
 
 BOT_TOKEN = env.str('BOT_TOKEN')
+TG_API_URL = env.str('TG_API_URL', default='https://api.telegram.org')
+# Пул keep-alive соединений TgClient и таймауты запросов к Telegram, секунды
+TG_POOL_SIZE = env.int('TG_POOL_SIZE', default=4)
+TG_CONNECT_TIMEOUT = env.float('TG_CONNECT_TIMEOUT', default=5)
+TG_READ_TIMEOUT = env.float('TG_READ_TIMEOUT', default=30)
+# Лимиты очереди отправки: сообщений в секунду всего и в один чат (chat_burst подряд)
+TG_GLOBAL_RATE = env.float('TG_GLOBAL_RATE', default=30)
+TG_CHAT_RATE = env.float('TG_CHAT_RATE', default=1)
+TG_CHAT_BURST = env.int('TG_CHAT_BURST', default=3)
+# Вебхук /bot/webhook: секрет из setWebhook (пусто — вебхук выключен), аренда обновления обработчиком, секунды
+TG_WEBHOOK_SECRET = env.str('TG_WEBHOOK_SECRET', default='')
+TG_WEBHOOK_LEASE = env.int('TG_WEBHOOK_LEASE', default=60)
+# Хранилище состояния диалогов бота: memory (в процессе) или database (TgChatState)
+BOT_STATE_STORE = env.str('BOT_STATE_STORE', default='memory')
+BOT_STATE_TTL = env.int('BOT_STATE_TTL', default=3600)
@@ -2,12 +2,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 
+from core.metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('core/', include(('core.urls', 'core'))),
     path('goals/', include(('goals.urls', 'goals'))),
     path("oauth/", include("social_django.urls", namespace="social")),
     path('bot/', include(('bot.urls', 'bot'))),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG: